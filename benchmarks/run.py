@@ -0,0 +1,341 @@
+# ===== Benchmark-uri pentru evaluator, împărțire și statistici =====
+#   python benchmarks/run.py                 # compară cu benchmarks/baseline.json
+#   python benchmarks/run.py --update        # rescrie baseline-ul cu măsurătorile curente
+#   python benchmarks/run.py --threshold 0.5 --floor-ms 0.5 --repeat 3 --only mc_counts
+#
+# Fiecare caz rulează pe intrări fixe (seed-uri fixe) și raportează mâini/s și
+# latența p50 / p99 pe apel. Măsurarea se repetă de --repeat ori (runde separate), iar
+# p50 al cazului e mediana celor p50 pe runde: o rundă prinsă de zgomotul mașinii nu mută
+# rezultatul. Un caz e regresie când p50 depășește baseline-ul cu mai mult de --threshold
+# (implicit 50%) și cu mai mult de --floor-ms în valoare absolută (cazurile sub o
+# milisecundă variază cu ±50% doar din planificarea sistemului); atunci scriptul iese cu
+# cod 1. Raportul față de baseline e corectat cu un etalon (_reference) măsurat lângă
+# fiecare rundă, deci o mașină partajată care merge mai încet în ansamblu nu dă regresii.
+# Baseline-ul se regenerează (--update) în orice schimbare a unui caz măsurat.
+# Înainte de cronometrare se verifică echivalența: evaluatorul pe tabele și cel
+# vectorizat trebuie să dea aceeași ordine ca evaluate_5 (evaluatorul de referință),
+# numărarea cuplajelor (exact.py) trebuie să coincidă cu enumerarea directă și cu
+# Monte Carlo, iar textura board-ului cu evaluarea tuturor perechilor.
+
+import argparse
+import json
+import pathlib
+import platform
+import random
+import sys
+import time
+
+import numpy as np
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from pkr_engine import (  # noqa: E402
+    CARD_STRS, cards_to_ints, rank_cards, score_tuple, rank_batch,
+    make_deck, riffle_shuffle, deal_hand, showdown, board_texture, river_stats, street_equity,
+    count_matchings, exact_multiway, clear_exact_cache, legend_id,
+)
+from pkr_engine.reference import evaluate_5, best_of_seven  # noqa: E402
+from pkr_engine.stats import river_outcomes, outcome_matrix  # noqa: E402
+from pkr_engine.exact import EXACT_STATES  # noqa: E402
+from pkr_engine.montecarlo import BEAT, mc_counts  # noqa: E402
+
+BASELINE = pathlib.Path(__file__).resolve().parent / "baseline.json"
+PLAYERS = (2, 6, 10)
+TRIALS = (1_000, 10_000, 100_000)
+
+
+# ===== Verificare de echivalență =====
+def check_equivalence(n=20_000, seed=11):
+    """rank_cards / rank_batch trebuie să ordoneze mâinile exact ca evaluate_5."""
+    rng = random.Random(seed)
+    errors = []
+    hands5 = [rng.sample(CARD_STRS, 5) for _ in range(n)]
+    ints5 = [cards_to_ints(h) for h in hands5]
+    batch5 = rank_batch(np.array(ints5)).tolist()
+    for h, ci, b in zip(hands5, ints5, batch5):
+        ref = evaluate_5(h)
+        if score_tuple(rank_cards(ci)) != ref or b != rank_cards(ci):
+            errors.append(("5", h))
+    hands7 = [rng.sample(CARD_STRS, 7) for _ in range(n // 10)]
+    ints7 = [cards_to_ints(h) for h in hands7]
+    batch7 = rank_batch(np.array(ints7)).tolist()
+    for h, ci, b in zip(hands7, ints7, batch7):
+        if score_tuple(rank_cards(ci)) != best_of_seven(h) or b != rank_cards(ci):
+            errors.append(("7", h))
+    # ordinea: comparația între scoruri întregi = comparația între tuple
+    for i in range(0, n - 1, 2):
+        a, b = ints5[i], ints5[i + 1]
+        if (rank_cards(a) > rank_cards(b)) != (evaluate_5(hands5[i]) > evaluate_5(hands5[i + 1])):
+            errors.append(("order", hands5[i], hands5[i + 1]))
+    return errors
+
+
+def _brute_matchings(adj, k, nodes=None):
+    """m_k(adj) prin enumerare: primul nod e fie necuplat, fie cuplat cu un vecin."""
+    if nodes is None:
+        nodes = tuple(range(len(adj)))
+    if k == 0:
+        return 1
+    if len(nodes) < 2 * k:
+        return 0
+    v, rest = nodes[0], nodes[1:]
+    total = _brute_matchings(adj, k, rest)
+    for u in rest:
+        if adj[v][u]:
+            total += _brute_matchings(adj, k - 1, tuple(x for x in rest if x != u))
+    return total
+
+
+def check_matchings(n=150, seed=12):
+    """count_matchings (clase de gemeni și numărarea pe ranguri) vs. enumerare directă,
+    pe grafuri mici construite ca pe River: muchia depinde de rang, cu excepția
+    perechilor în care ambele cărți sunt „speciale” (culoarea de flush)."""
+    rng = random.Random(seed)
+    errors = []
+    for _ in range(n):
+        size = rng.randint(4, 11)
+        labels = [rng.randrange(4) for _ in range(size)]
+        special = [rng.random() < 0.4 for _ in range(size)]
+        rel = {(a, b): rng.random() < 0.6 for a in range(4) for b in range(a, 4)}
+        adj = [[False] * size for _ in range(size)]
+        for x in range(size):
+            for y in range(x + 1, size):
+                e = rel[min(labels[x], labels[y]), max(labels[x], labels[y])]
+                if special[x] and special[y]:
+                    e = rng.random() < 0.5
+                adj[x][y] = adj[y][x] = e
+        for k in range(size // 2 + 1):
+            ref = _brute_matchings(adj, k)
+            if (count_matchings(adj, k) != ref
+                    or count_matchings(adj, k, labels, special) != ref):
+                errors.append(("matchings", size, k))
+    return errors
+
+
+def check_exact_multiway(seed=13, trials=200_000):
+    """exact_multiway pe spoturi reale de River: cu 2 adversari vs. formula închisă
+    m_2 = C(e, 2) − Σ C(grad, 2); cu 4 adversari vs. Monte Carlo (±4 erori standard).
+    Cu bugetul EXACT_STATES rezultatul e fie același, fie None (river_stats trece pe MC)."""
+    errors = []
+    for i, s in enumerate(_spots(6, seed)):
+        _, remaining, _, outcome = river_outcomes(s[:2], s[2:])
+        n = len(remaining)
+        mat = outcome_matrix(outcome, n)
+        clear_exact_cache()
+        limited = exact_multiway(mat, 4, max_states=EXACT_STATES)
+        beat = mat == BEAT
+        np.fill_diagonal(beat, False)
+        deg = (~beat).sum(axis=1) - 1           # vecinii în graful „nu bate”
+        e = int(deg.sum()) // 2
+        m2 = e * (e - 1) // 2 - int((deg * (deg - 1) // 2).sum())
+        total = n * (n - 1) * (n - 2) * (n - 3) // 8
+        p2, _ = exact_multiway(mat, 2)
+        if abs(p2 - (total - m2) / total) > 1e-12:
+            errors.append(("exact_multiway/2", s))
+        p4, _ = exact_multiway(mat, 4)
+        if limited is not None and limited[0] != p4:
+            errors.append(("exact_multiway/buget", s))
+        hits, _ = mc_counts(mat, 4, trials, np.random.default_rng(seed + i))
+        p_mc = hits / trials
+        se = max(np.sqrt(p_mc * (1 - p_mc) / trials), 1 / trials)
+        if abs(p4 - p_mc) > 4 * se:
+            errors.append(("exact_multiway/mc", s, p4, p_mc))
+    return errors
+
+
+def check_texture(n=40, seed=14):
+    """board_texture vs. evaluarea tuturor perechilor rămase: aceleași id-uri din legendă
+    și aceleași modele (rang, e_în_culoarea_de_flush) pentru fiecare id."""
+    rng = random.Random(seed)
+    errors = []
+    for _ in range(n):
+        board = cards_to_ints(rng.sample(CARD_STRS, 5))
+        found, flush = board_texture([CARD_STRS[c] for c in board])
+        rest = [c for c in range(52) if c not in board]
+        seen = {}
+        for i, a in enumerate(rest):
+            for b in rest[i + 1:]:
+                x, y = (a, b) if a >> 2 >= b >> 2 else (b, a)
+                xf, yf = flush is not None and x & 3 == flush, flush is not None and y & 3 == flush
+                if x >> 2 == y >> 2 and yf:
+                    xf, yf = yf, xf
+                lid = legend_id(rank_cards(board + [a, b]))
+                seen.setdefault(lid, set()).add((x >> 2, xf, y >> 2, yf))
+        if {i: set(p) for i, p in found.items()} != seen:
+            errors.append(("texture", [CARD_STRS[c] for c in board]))
+    return errors
+
+
+# ===== Cazuri =====
+# case(name) -> (fn, units): fn() e un apel cronometrat, units = mâini / runde per apel
+def _spots(n, seed):
+    rng = random.Random(seed)
+    return [rng.sample(CARD_STRS, 7) for _ in range(n)]
+
+
+def build_cases():
+    cases = {}
+    rng = random.Random(1)
+
+    hands5 = [rng.sample(CARD_STRS, 5) for _ in range(1000)]
+    cases["evaluate_5"] = (lambda: [evaluate_5(h) for h in hands5], 1000)
+
+    hands7 = [rng.sample(CARD_STRS, 7) for _ in range(100)]
+    cases["best_of_seven_ref"] = (lambda: [best_of_seven(h) for h in hands7], 100)
+
+    ints7 = [cards_to_ints(h) for h in _spots(1000, 2)]
+    cases["rank_cards"] = (lambda: [rank_cards(h) for h in ints7], 1000)
+
+    arr = np.array([cards_to_ints(h) for h in _spots(100_000, 3)])
+    cases["rank_batch"] = (lambda: rank_batch(arr), len(arr))
+
+    def shuffle100():
+        r = random.Random(4)
+        for _ in range(100):
+            riffle_shuffle(make_deck(), r)
+    cases["riffle_shuffle"] = (shuffle100, 100)
+
+    boards = [h[:5] for h in _spots(100, 5)]
+    cases["board_texture"] = (lambda: [board_texture(b) for b in boards], 100)
+
+    for n in PLAYERS:
+        r = random.Random(6)
+        deals = [deal_hand(r, n, i % n) for i in range(100)]
+        cases[f"showdown/{n}p"] = (
+            lambda deals=deals: [showdown(h, f + [t, rv]) for h, f, t, rv in deals], 100)
+
+    spot = _spots(1, 7)[0]
+    _, remaining, _, outcome = river_outcomes(spot[:2], spot[2:])
+    mat = outcome_matrix(outcome, len(remaining))
+    for n in PLAYERS:
+        for trials in TRIALS:
+            cases[f"mc_counts/{n}p/{trials}"] = (
+                lambda n=n, trials=trials: mc_counts(mat, n - 1, trials, np.random.default_rng(8)),
+                trials)
+
+    spots = _spots(10, 9)
+
+    def river(n):
+        clear_exact_cache()  # fiecare apel numără din nou, ca la un board nou
+        return [river_stats(s[:2], s[2:], n, 0, False) for s in spots]
+    for n in PLAYERS:
+        cases[f"river_stats/{n}p"] = (lambda n=n: river(n), len(spots))
+
+    flops = _spots(5, 10)
+    cases["flop_equity/2p"] = (
+        lambda: [street_equity(s[:2], s[2:5], 2) for s in flops], len(flops))
+    return cases
+
+
+_REF_DATA = np.random.default_rng(0).random(20_000)
+
+
+def _reference():
+    """Lucru fix, independent de pkr_engine (bucle Python + numpy), ca etalon al vitezei
+    mașinii în momentul măsurării."""
+    total = 0
+    for i in range(20_000):
+        total += i * i % 7
+    np.sort(_REF_DATA)
+    return total
+
+
+def _reference_ms(reps=15):
+    times = []
+    for _ in range(reps):
+        t = time.perf_counter()
+        _reference()
+        times.append(time.perf_counter() - t)
+    return sorted(times)[reps // 2] * 1e3
+
+
+def measure(fn, units, min_time=0.5, min_reps=5, max_reps=200, repeat=3):
+    """repeat runde de câte min_time secunde; p50 = mediana p50-urilor pe runde.
+    ref_ms = etalonul (_reference) măsurat lângă fiecare rundă, tot ca mediană."""
+    fn()  # încălzire
+    rounds, refs, times = [], [], []
+    for _ in range(repeat):
+        refs.append(_reference_ms())
+        run = []
+        start = time.perf_counter()
+        while len(run) < max_reps and (len(run) < min_reps or time.perf_counter() - start < min_time):
+            t = time.perf_counter()
+            fn()
+            run.append(time.perf_counter() - t)
+        run.sort()
+        rounds.append(run[len(run) // 2])
+        times += run
+    times.sort()
+    rounds.sort()
+    refs.sort()
+    p50 = rounds[len(rounds) // 2]
+    p99 = times[min(len(times) - 1, int(len(times) * 0.99))]
+    return {"min_ms": times[0] * 1e3, "p50_ms": p50 * 1e3, "p99_ms": p99 * 1e3,
+            "per_s": units / p50, "reps": len(times), "ref_ms": refs[len(refs) // 2]}
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Benchmark-uri pkr_engine")
+    ap.add_argument("--update", action="store_true", help="scrie rezultatele ca baseline")
+    ap.add_argument("--threshold", type=float, default=0.5,
+                    help="regresie permisă față de baseline (0.5 = +50%%)")
+    ap.add_argument("--only", default=None, help="doar cazurile care încep cu acest prefix")
+    ap.add_argument("--floor-ms", type=float, default=0.5,
+                    help="diferența absolută minimă (ms) ca să fie regresie")
+    ap.add_argument("--repeat", type=int, default=3, help="runde de măsurare / caz")
+    ap.add_argument("--min-time", type=float, default=0.5, help="secunde / rundă")
+    args = ap.parse_args(argv)
+
+    errors = check_equivalence()
+    if errors:
+        print(f"ECHIVALENȚĂ EȘUATĂ: {len(errors)} mâini diferă de evaluate_5, ex. {errors[:3]}")
+        return 2
+    print("echivalență cu evaluate_5: OK")
+    for name, check in (("cuplaje vs. enumerare", check_matchings),
+                        ("exact_multiway vs. formulă / Monte Carlo", check_exact_multiway),
+                        ("textură vs. enumerare", check_texture)):
+        errors = check()
+        if errors:
+            print(f"VERIFICARE EȘUATĂ ({name}): {len(errors)} cazuri, ex. {errors[:3]}")
+            return 2
+        print(f"{name}: OK")
+
+    baseline = json.loads(BASELINE.read_text()) if BASELINE.exists() else {}
+    base_cases = baseline.get("cases", {})
+    results, regressions = {}, []
+    for name, (fn, units) in build_cases().items():
+        if args.only and not name.startswith(args.only):
+            continue
+        r = measure(fn, units, args.min_time, repeat=max(1, args.repeat))
+        results[name] = r
+        line = f"{name:<26} {r['per_s']:>14,.0f} /s   p50 {r['p50_ms']:9.3f} ms   p99 {r['p99_ms']:9.3f} ms"
+        ref = base_cases.get(name)
+        if ref and ref.get("p50_ms"):
+            # raportul se corectează cu etalonul: o mașină încărcată încetinește și etalonul
+            speed = r["ref_ms"] / ref["ref_ms"] if ref.get("ref_ms") else 1.0
+            ratio = r["p50_ms"] / (ref["p50_ms"] * speed)
+            line += f"   ×{ratio:.2f} față de baseline"
+            if ratio > 1 + args.threshold and r["p50_ms"] - ref["p50_ms"] * speed > args.floor_ms:
+                regressions.append(name)
+                line += "  <-- REGRESIE"
+        print(line)
+
+    if args.update:
+        merged = dict(base_cases, **results)
+        BASELINE.write_text(json.dumps({
+            "machine": f"{platform.python_implementation()} {platform.python_version()} "
+                       f"{platform.machine()} {platform.system()}",
+            "numpy": np.__version__,
+            "cases": merged,
+        }, indent=2, sort_keys=True) + "\n")
+        print(f"baseline actualizat: {BASELINE}")
+        return 0
+    if regressions:
+        print(f"{len(regressions)} regresii peste {args.threshold:.0%}: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
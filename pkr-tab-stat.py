@@ -13,9 +13,19 @@ st.markdown("""
     </style>
 """, unsafe_allow_html=True)
 
-import random, math, pathlib, textwrap
-from itertools import combinations
-from collections import defaultdict
+import random, math, pathlib, threading, time, uuid
+from concurrent.futures import ThreadPoolExecutor, CancelledError
+from concurrent.futures.process import BrokenProcessPool
+
+from pkr_engine import (
+    HAND_NAMES, score_tuple, hand_category, street_equity,
+    cached_river_stats, cache_stats, preflop_equity, parse_range, metrics,
+    HandHistory, hand_row, Scheduler, SchedulerBusy, parse_combo, ints_to_cards,
+)
+from pkr_html import card_html, pretty_html, table_html, wins_page_html, WINS_PER_PAGE
+from pkr_hand import rank_ro, dealt, hand_cards, resolved, river_legend, beating, outs
+
+_run_t0 = time.perf_counter()  # durata rulării scriptului, pentru panoul Performance
 
 # ====== CSS loader ======
 FALLBACK_CSS = """
@@ -39,19 +49,36 @@ FALLBACK_CSS = """
 html, body [data-testid="stAppViewContainer"]{background:#0b0f12}
 """
 
-CARD_SCALE_PLAYERS = 2.5
-CARD_SCALE_BOARD   = 2.0
-
-def load_css(rel_path="assets/styles.css"):
+@st.cache_resource
+def read_css(rel_path="assets/styles.css"):
+    """Fișierul CSS se citește o singură dată pe proces, nu la fiecare rerun."""
     base = pathlib.Path(__file__).parent
     css_path = (base / rel_path).resolve()
     try:
-        st.markdown(f"<style>{css_path.read_text(encoding='utf-8')}</style>", unsafe_allow_html=True)
+        return css_path.read_text(encoding="utf-8")
     except FileNotFoundError:
-        st.markdown(f"<style>{FALLBACK_CSS}</style>", unsafe_allow_html=True)
+        return FALLBACK_CSS
+
+def load_css(rel_path="assets/styles.css"):
+    st.markdown(f"<style>{read_css(rel_path)}</style>", unsafe_allow_html=True)
 
 load_css()
 
+# ===== Planificator comun (pkr_engine.scheduler) =====
+@st.cache_resource
+def job_scheduler():
+    """Un pool de procese pe server, comun tuturor sesiunilor: calculele grele nu mai
+    rulează în firul scriptului și nu se mai blochează reciproc pe GIL."""
+    return Scheduler()
+
+def scheduled(sched, session, on_status=None, cancel=None, speculative=False):
+    """compute= pentru cached_river_stats: calculul rulează ca job în planificator, iar
+    progress (Monte Carlo adaptiv) vine înapoi din proces prin on_progress.
+    speculative=True pentru precalcul: prioritate mică, fără loc în limita sesiunii."""
+    return lambda key, fn, *args, progress=None, **kwargs: sched.run(
+        session, key, fn, *args, on_status=on_status, on_progress=progress, cancel=cancel,
+        speculative=speculative, **kwargs)
+
 # ===== Config inițială (dinamic) =====
 if "NUM_PLAYERS" not in st.session_state:
     st.session_state.NUM_PLAYERS = 10
@@ -69,6 +96,13 @@ if "rotate_dealer" not in st.session_state:
 # cache pentru statistici river (inclusiv mâini câștigătoare)
 if "river_stats" not in st.session_state:
     st.session_state.river_stats = None
+if "session_id" not in st.session_state:
+    st.session_state.session_id = uuid.uuid4().hex  # pentru limita de job-uri / sesiune
+if "street_stats" not in st.session_state:
+    st.session_state.street_stats = None  # (stage, rezultat street_equity)
+# precalculul în fundal al mâinii curente: {"future", "cancel", "hero", "params"}
+if "precompute" not in st.session_state:
+    st.session_state.precompute = None
 
 # ===== Sidebar =====
 with st.sidebar:
@@ -112,8 +146,22 @@ with st.sidebar:
         "Număr total jucători",
         min_value=2, max_value=10, value=num_players, step=1
     )
-    use_mc = st.checkbox("Monte Carlo (deal fără înlocuire)", value=True,
-                        help="Simulează mii de mâini posibile (ca în joc real) pentru a aproxima probabilitățile.")
+    opp_range = st.text_input(
+        "Range adversari (opțional)", value="",
+        help="Mâinile posibile ale adversarilor, ex. „22+, A2s+, KTo+, QJs:0.5, AsKs”. "
+             "„:0.5” dă o pondere combo-urilor. Gol = orice mână. Cu un singur adversar "
+             "rezultatul e exact; cu mai mulți se calculează prin Monte Carlo ponderat."
+    ).strip() or None
+    if opp_range is not None:
+        try:
+            parse_range(opp_range)
+        except ValueError as e:
+            st.warning(f"Range invalid ({e}); se folosește orice mână.")
+            opp_range = None
+    use_mc = st.checkbox("Monte Carlo (deal fără înlocuire)", value=False,
+                        help="Simulează mii de mâini posibile (ca în joc real) în locul numărării exacte. "
+                             "Fără bifă se numără exact, cu excepția board-urilor unde numărarea "
+                             "ar dura mai mult decât simularea (atunci se simulează oricum).")
     mc_trials = st.slider(
     "Runde simulare",
     min_value=1_000,
@@ -126,6 +174,37 @@ with st.sidebar:
         "Recomandat: 20.000 – 50.000."
     )
 )
+    mc_adaptive = st.checkbox(
+        "Precizie țintă (oprire automată)", value=False,
+        help="Monte Carlo rulează în loturi până când intervalul de încredere 95% pentru "
+             "„≥1 adversar te bate” ajunge la precizia aleasă sau expiră timpul. "
+             "Situațiile clare se opresc după câteva sute de runde."
+    )
+    mc_target_pct = st.slider("Precizie (± %, IC 95%)", min_value=0.1, max_value=2.0,
+                              value=0.5, step=0.1, disabled=not mc_adaptive)
+    mc_time = st.slider("Timp maxim (secunde)", min_value=0.5, max_value=10.0,
+                        value=2.0, step=0.5, disabled=not mc_adaptive)
+    mc_stratified = st.checkbox(
+        "Reducere de varianță", value=False,
+        help="Primul adversar se eșantionează pe straturi (bate / egal / pierde, cu "
+             "ponderile exacte din cele 990 de perechi), iar ultimul nu se mai extrage: "
+             "probabilitatea lui se numără exact. Aceeași precizie cu mult mai puține runde; "
+             "fără efect când e setat un range."
+    )
+    js = job_scheduler().stats()
+    st.caption(f"Calcule pe server: {js['running']}/{js['workers']} procese ocupate · "
+               f"{js['queued']} în coadă · {js['speculative']} precalcule")
+    cs = cache_stats()
+    st.caption(f"Cache statistici: {cs['hits'] + cs['disk_hits']} hit · "
+               f"{cs['misses']} miss · {cs['size']} situații în memorie")
+    perf_on = st.checkbox(
+        "⏱️ Performance", key="perf_on",
+        help="Timere pe etape (evaluare, Monte Carlo, legendă, showdown, randare), contoare "
+             "de evaluări și rate de hit pe cache-uri, comune procesului. Colectarea merge cât "
+             "timp panoul e deschis în măcar o sesiune; oprită, costul e neglijabil."
+    )
+    # panoul e al sesiunii; colectarea e comună (metrics.want numără sesiunile care o cer)
+    metrics.want(st.session_state.session_id, perf_on)
 
 
     st.markdown("---")
@@ -134,154 +213,37 @@ with st.sidebar:
 NUM_PLAYERS = st.session_state.NUM_PLAYERS
 HERO = st.session_state.HERO
 
-# ===== Poker logic =====
-RANKS = ["2","3","4","5","6","7","8","9","10","J","Q","K","A"]
-SUITS = "♣♦♥♠"
-RED_SUITS = {"♦", "♥"}
-RANK_VAL = {r: i for i, r in enumerate(RANKS, start=2)}
-VAL_RANK = {v: r for r, v in RANK_VAL.items()}
-
-def rank_ro(v: int) -> str:
-    return VAL_RANK[v]
-
-def make_deck():
-    return [r + s for r in RANKS for s in SUITS]
-
-def riffle_shuffle(deck, rng, times=5):
-    for _ in range(times):
-        cut = rng.randint(18, 34)
-        left, right = deck[:cut], deck[cut:]
-        inter = []
-        while left or right:
-            tl = rng.randint(1, 3); tr = rng.randint(1, 3)
-            inter.extend(left[:tl]); left = left[tl:]
-            inter.extend(right[:tr]); right = right[tr:]
-        deck[:] = inter
-        k = rng.randint(5, 15)
-        deck[:] = deck[-k:] + deck[:-k]
-
-def burn(deck):
-    if deck:
-        deck.pop(0)
-
-def seat_order(dealer_pos):
-    return [(dealer_pos + 1 + i) % NUM_PLAYERS for i in range(NUM_PLAYERS)]
-
-def deal_hole_cards(deck, num_players, dealer_pos):
-    hands = [[] for _ in range(num_players)]
-    order = seat_order(dealer_pos)
-    for p in order:
-        hands[p].append(deck.pop(0))
-    for p in order:
-        hands[p].append(deck.pop(0))
-    return hands
-
-def deal_board(deck):
-    burn(deck); flop = [deck.pop(0) for _ in range(3)]
-    burn(deck); turn = deck.pop(0)
-    burn(deck); river = deck.pop(0)
-    return flop, turn, river
-
-# ===== Evaluare =====
-def card_vals(cards):
-    return sorted([RANK_VAL[c[:-1]] for c in cards], reverse=True)
-
-def is_flush(cards):
-    suits = [c[-1] for c in cards]
-    for s in SUITS:
-        if suits.count(s) == 5:
-            return True, s
-    return False, None
-
-def is_straight(vals):
-    u = sorted(set(vals), reverse=True)
-    if 14 in u:
-        u.append(1)  # wheel
-    for i in range(len(u) - 4):
-        seq = u[i:i+5]
-        if seq[0] - seq[4] == 4:
-            return True, seq[0]
-    return False, 0
-
-# 8=SF,7=Four,6=Full,5=Flush,4=Straight,3=Trips,2=TwoPair,1=Pair,0=High
-def evaluate_5(cards):
-    vals = card_vals(cards)
-    freq = {}
-    for v in vals:
-        freq[v] = freq.get(v, 0) + 1
-    groups = sorted(freq.items(), key=lambda x: (x[1], x[0]), reverse=True)
-    counts = [g[1] for g in groups]
-
-    flush, flush_suit = is_flush(cards)
-    straight, top_st = is_straight(vals)
-
-    if flush:
-        flush_vals = card_vals([c for c in cards if c[-1] == flush_suit])
-        sf, sf_top = is_straight(flush_vals)
-        if sf:
-            return (8, sf_top)
-
-    if 4 in counts:
-        four = groups[0][0]
-        kicker = max([v for v in vals if v != four]) if any(v != four for v in vals) else 0
-        return (7, four, kicker)
-
-    if 3 in counts and 2 in counts:
-        trips = [v for v, c in groups if c == 3][0]
-        pair  = [v for v, c in groups if c == 2][0]
-        return (6, trips, pair)
-
-    if flush:
-        return (5, sorted(vals, reverse=True))
-    if straight:
-        return (4, top_st)
-
-    if 3 in counts:
-        trips = [v for v, c in groups if c == 3][0]
-        kickers = [v for v in vals if v != trips][:2]
-        return (3, trips, kickers)
-
-    pairs = [v for v, c in groups if c == 2]
-    if len(pairs) >= 2:
-        top2 = pairs[:2]
-        kicker = [v for v in vals if v not in top2][0]
-        return (2, top2, kicker)
-
-    if 2 in counts:
-        pair = [v for v, c in groups if c == 2][0]
-        kickers = [v for v in vals if v != pair][:3]
-        return (1, pair, kickers)
-
-    return (0, vals)
-
-def best_of_seven(cards7):
-    best = None
-    for combo in combinations(cards7, 5):
-        score = evaluate_5(combo)
-        if (best is None) or (score > best):
-            best = score
-    return best
-
-def best_of_seven_with_combo(cards7):
-    best_score, best_combo = None, None
-    for combo in combinations(cards7, 5):
-        score = evaluate_5(combo)
-        if (best_score is None) or (score > best_score):
-            best_score, best_combo = score, combo
-    return best_score, list(best_combo)
-
-HAND_NAMES = {
-    8: "Chintă de culoare (Straight Flush)",
-    7: "Careu (Four of a Kind)",
-    6: "Full (Full House)",
-    5: "Culoare (Flush)",
-    4: "Chintă (Straight)",
-    3: "Trei de un fel / Trips (Three of a Kind)",
-    2: "Două perechi (Two Pair)",
-    1: "O pereche (One Pair)",
-    0: "Carte mare (High Card)",
-}
+# ===== Grafice =====
+PIE_SLICES = (("Pierd", "#ef4444"), ("Egal", "#f59e0b"), ("Câștig", "#10b981"))
+
+
+@st.cache_data(max_entries=256, show_spinner=False)
+def pie_svg(prob_red: float, prob_tie: float = 0.0) -> str:
+    """Pie-ul Pierd / Egal / Câștig ca SVG inline (câteva sute de octeți, fără matplotlib).
+    Un rerun nu desenează nimic nou: același (prob_red, prob_tie) vine din cache."""
+    parts = [prob_red, prob_tie, max(0.0, 1.0 - prob_red - prob_tie)]
+    r, c = 48, 50
+    paths, legend = [], []
+    angle = 0.0  # de la ora 12, în sensul acelor de ceasornic
+    for (label, color), p in zip(PIE_SLICES, parts):
+        legend.append(f'<span style="color:{color}">●</span> {label} {p*100:.1f}%')
+        if p <= 0:
+            continue
+        if p >= 0.9995:
+            paths.append(f'<circle cx="{c}" cy="{c}" r="{r}" fill="{color}"/>')
+            continue
+        a0, a1 = angle, angle + 2 * math.pi * p
+        x0, y0 = c + r * math.sin(a0), c - r * math.cos(a0)
+        x1, y1 = c + r * math.sin(a1), c - r * math.cos(a1)
+        large = 1 if p > 0.5 else 0
+        paths.append(f'<path d="M{c},{c} L{x0:.2f},{y0:.2f} A{r},{r} 0 {large} 1 {x1:.2f},{y1:.2f} Z" '
+                     f'fill="{color}" stroke="white" stroke-width="0.8"/>')
+        angle = a1
+    return ('<div style="display:flex;align-items:center;gap:0.8rem">'
+            f'<svg viewBox="0 0 100 100" width="110" height="110">{"".join(paths)}</svg>'
+            f'<div style="font-size:0.85rem;line-height:1.5">{"<br>".join(legend)}</div></div>')
 
+# ===== Poker logic =====
 # pentru textul în stil poker_helper_v02.py
 RO_LABEL_MAIN = {
     0: "High card",
@@ -295,9 +257,6 @@ RO_LABEL_MAIN = {
     8: "Chintă de culoare",
 }
 
-def straight_str(topv):
-    return "5–A" if topv == 5 else "–".join(rank_ro(topv - i) for i in range(5))
-
 def format_hero_score(score: tuple) -> str:
     """Formatare asemănătoare cu poker_helper_v02.py, dar pe schema acestui evaluator."""
     t = score[0]
@@ -333,75 +292,6 @@ def format_hero_score(score: tuple) -> str:
         return " " + " ".join(rank_ro(v) for v in vals[:5])
     return ""
 
-def describe_score(score):
-    t = score[0]
-    if t == 8:
-        return f"{HAND_NAMES[t]} – {straight_str(score[1])}"
-    if t == 7:
-        return f"{HAND_NAMES[t]} – {rank_ro(score[1])} cu kicker {rank_ro(score[2])}"
-    if t == 6:
-        return f"{HAND_NAMES[t]} – {rank_ro(score[1])} peste {rank_ro(score[2])}"
-    if t == 5:
-        return f"{HAND_NAMES[t]} – " + " ".join(rank_ro(v) for v in score[1][:5])
-    if t == 4:
-        return f"{HAND_NAMES[t]} – {straight_str(score[1])}"
-    if t == 3:
-        return f"{HAND_NAMES[t]} – {rank_ro(score[1])}"
-    if t == 2:
-        p1, p2 = rank_ro(score[1][0]), rank_ro(score[1][1])
-        return f"{HAND_NAMES[t]} – {p1} și {p2}, kicker {rank_ro(score[2])}"
-    if t == 1:
-        return f"{HAND_NAMES[t]} – {rank_ro(score[1])}"
-    return f"{HAND_NAMES[0]} – " + " ".join(rank_ro(v) for v in score[1][:5])
-
-# ===== UI helpers (HTML cards) =====
-def card_html(card, big=False, highlight=False, border=False, scale=1.0):
-    rank, suit = card[:-1], card[-1]
-    color = "#d00" if suit in RED_SUITS else "#111"
-    bg = "#f4f71e" if highlight else "#fff"
-    # mărimi de bază
-    base_pad = (8, 10) if big else (4, 8)
-    base_font = 26 if big else 16
-    base_margin = 2
-    # aplică factorul
-    pad = f"{int(base_pad[0]*scale)}px {int(base_pad[1]*scale)}px"
-    font_size = int(base_font * scale)
-    margin = int(base_margin * scale)
-    border_css = "2px solid #2e7d32" if border else "1px solid #bbb"
-    return (
-        f"<span style='display:inline-block;margin:{margin}px;"
-        f"padding:{pad};background:{bg};color:{color};"
-        f"border:{border_css};border-radius:{int(6*scale)}px;"
-        f"font-size:{font_size}px;line-height:1.0;font-weight:700'>{rank}{suit}</span>"
-    )
-
-def hidden_html(big=False, scale=1.0):
-    base_pad = (8, 10) if big else (4, 8)
-    base_font = 26 if big else 16
-    base_margin = 2
-    pad = f"{int(base_pad[0]*scale)}px {int(base_pad[1]*scale)}px"
-    font_size = int(base_font * scale)
-    margin = int(base_margin * scale)
-    return (
-        f"<span style='display:inline-block;margin:{margin}px;"
-        f"padding:{pad};background:#fff;color:#111;"
-        f"border:1px solid #bbb;border-radius:{int(6*scale)}px;"
-        f"font-size:{font_size}px;line-height:1.0;font-weight:700'>🂠</span>"
-    )
-
-def pretty_html(card: str) -> str:
-    """Întoarce rank+simbol cu roșu pentru ♥ și ♦, pentru afișare în markdown HTML."""
-    rank = card[:-1]
-    suit = card[-1]
-
-    # culoare: roșu pentru inimă / romb, altfel culoarea textului principal
-    if suit in ("♥", "♦"):
-        color = "#ff4b5c"  # roșu frumos, poți schimba dacă vrei
-    else:
-        color = "#e0e0e0"  # deschis, potrivit cu tema ta dark
-
-    return f"<span style='color:{color}; font-weight:700'>{rank}{suit}</span>"
-
 # ===== Legendă & posibile (doar la River) =====
 LEGEND_TEXT = {
     1: "Chintă roială (Royal Flush)",
@@ -416,49 +306,119 @@ LEGEND_TEXT = {
     10: "Carte mare (High Card)",
 }
 
-def score_to_legend_ids(score):
-    ids = set()
-    cls = score[0]
-    if cls == 8:
-        top = score[1]
-        ids.add(1 if top == 14 else 2)
-    elif cls == 7:
-        ids.add(3)
-    elif cls == 6:
-        ids.add(4)
-    elif cls == 5:
-        ids.add(5)
-    elif cls == 4:
-        ids.add(6)
-    elif cls == 3:
-        ids.add(7)
-    elif cls == 2:
-        ids.add(8)
-    elif cls == 1:
-        ids.add(9)
-    elif cls == 0:
-        ids.add(10)
-    return ids
-
-def legend_possibles_on_river(board5):
-    deck = make_deck()
-    remaining = [c for c in deck if c not in board5]
-    found = set()
-    n = len(remaining)  # 47
-    for a in range(n):
-        for b in range(a+1, n):
-            hole = [remaining[a], remaining[b]]
-            sc = best_of_seven(board5 + hole)
-            found |= score_to_legend_ids(sc)
-            if len(found) == 10:
-                return sorted(found)
-    return sorted(found)
-
 def legend_lines(ids):
     if not ids:
         return "—"
     return "\n".join(f"{i}) {LEGEND_TEXT[i]}" for i in range(1, 11) if i in ids)
 
+# ===== Precalcul speculativ (în fundal) =====
+# La împărțire se cunosc deja board-ul complet și cărțile tale, așa că statisticile de
+# River, legenda și câștigătorii pornesc imediat într-un fir de fundal. Rezultatele nu se
+# țin în sesiune: ajung în cache-urile comune (river_legend / resolved din pkr_hand,
+# cached_river_stats), deci pașii următori și butonul de pe River le găsesc gata. O mână
+# nouă anulează lucrul rămas pentru cea veche.
+class PrecomputeCancelled(Exception):
+    pass
+
+@st.cache_resource
+def precompute_pool():
+    """Firele doar așteaptă job-uri speculative în planificator (prioritate mică, peste
+    max_speculative se sar), deci pot fi câte job-uri speculative încap în coadă."""
+    return ThreadPoolExecutor(max_workers=job_scheduler().max_speculative,
+                              thread_name_prefix="pkr-precompute")
+
+def river_params():
+    """Setările din sidebar care intră în cheia statisticilor de River."""
+    return {
+        "total_players": int(total_players),
+        "mc_trials": int(mc_trials),
+        "use_mc": bool(use_mc),
+        "seed": st.session_state.seed,
+        "mc_target": mc_target_pct / 100 if mc_adaptive else None,
+        "mc_time": float(mc_time),
+        "opp_range": opp_range,
+        "mc_method": "stratified" if mc_stratified else "plain",
+    }
+
+def precompute_hand(hand, hero_idx, params, cancel, sched, session):
+    """Rulează în firul de fundal; nu atinge st.* (doar umple cache-urile comune).
+    Statisticile trec prin planificator; firul doar așteaptă job-ul."""
+    def check(*_):
+        if cancel.is_set():
+            metrics.count("precompute_cancelled")
+            raise PrecomputeCancelled
+    check()
+    hands, flop, turn, river = dealt(*hand)
+    river_legend(flop + (turn, river))
+    resolved(*hand)
+    check()
+    try:
+        # cancel: o mână nouă scoate job-ul din coadă dacă nu a pornit încă
+        with metrics.timer("precompute_stats"):
+            cached_river_stats(list(hands[hero_idx]), list(flop) + [turn, river],
+                               compute=scheduled(sched, session, cancel=cancel, speculative=True), **params)
+    except (ValueError, SchedulerBusy, BrokenProcessPool):
+        pass  # range inutilizabil / server ocupat / proces oprit: butonul calculează din nou
+    except CancelledError:
+        metrics.count("precompute_cancelled")
+        raise PrecomputeCancelled
+
+def start_precompute(s):
+    old = st.session_state.precompute
+    if old is not None:
+        old["cancel"].set()
+        old["future"].cancel()
+    cancel = threading.Event()
+    params = river_params()
+    st.session_state.precompute = {
+        "future": precompute_pool().submit(precompute_hand, (s["seed"], s["n"], s["dealer"]),
+                                           HERO - 1, params, cancel, job_scheduler(),
+                                           st.session_state.session_id),
+        "cancel": cancel,
+    }
+
+def drop_idle_precompute():
+    """Butonul nu așteaptă precalculul. Dacă acesta n-a pornit încă (stă după mâinile altor
+    sesiuni) se anulează; dacă rulează, job-ul lui din planificator are aceeași cheie ca al
+    butonului, deci Scheduler.run se alătură lui (cu poziția în coadă afișată) și îl mută
+    din coada speculativă în cea normală."""
+    pre = st.session_state.precompute
+    if pre is not None and pre["future"].cancel():
+        st.session_state.precompute = None
+
+# ===== Istoric mâini =====
+@st.cache_resource
+def hand_history():
+    """Istoricul comun procesului (pkr_engine.history); None dacă fișierul nu se poate deschide."""
+    try:
+        return HandHistory()
+    except Exception:
+        return None
+
+def record_hand(s):
+    """Scrie mâna curentă în istoric (o singură dată / mână): cărți, dealer, eroul mâinii,
+    câștigători și p_red. p_red intră doar dacă statisticile sunt ale aceluiași erou, pentru
+    numărul de jucători de la masă și fără range (altfel calibrarea ar amesteca situații
+    care nu se compară). record() doar pune rândul în coadă."""
+    hist = hand_history()
+    if hist is None or not s or s.get("recorded"):
+        return
+    hero = s.get("hero", HERO)
+    if s["n"] < hero:
+        return
+    hands, flop, turn, river = hand_cards(s)
+    # showdown-ul vine din cache (rezolvat la „Arată cărțile” sau în precalcul)
+    winners, _, _, scores = resolved(s["seed"], s["n"], s["dealer"])
+    stats = st.session_state.river_stats
+    p_red = None
+    if (stats and stats.get("hero") == hero and stats.get("players") == s["n"]
+            and not stats.get("opp_range")):
+        p_red = stats.get("p_red")
+    hist.record(hand_row([list(h) for h in hands], list(flop) + [turn, river], s["dealer"], hero,
+                         list(winners), hand_category(scores[winners[0]]),
+                         hand_category(scores[hero - 1]), p_red, s["seed"]))
+    s["recorded"] = True
+
 # ===== State & acțiuni =====
 def new_hand():
     """Generează o mână nouă. Dealerul curent este cel din dealer_current;
@@ -469,29 +429,23 @@ def new_hand():
         cur = 1
         st.session_state.dealer_current = 1
 
-    dealer_idx_0 = cur - 1  # 0-based pentru deal_hole_cards
-
-    rng = random.Random(st.session_state.seed)
-    deck = make_deck()
-    riffle_shuffle(deck, rng)
-    hands = deal_hole_cards(deck, NUM_PLAYERS, dealer_idx_0)
-    flop, turn, river = deal_board(deck)
+    # mâna veche intră în istoric înainte să fie înlocuită
+    record_hand(st.session_state.state)
 
+    # seed-ul mâinii: cel din sidebar (aceeași mână de fiecare dată, ca înainte) sau unul nou;
+    # din el se refac pachetul și cărțile (dealt)
+    seed = st.session_state.seed
     st.session_state.state = {
+        "seed": random.getrandbits(63) if seed is None else seed,
+        "n": NUM_PLAYERS,
         "dealer": cur,            # 1-based — dealerul MÂINII CURENTE (folosit în UI)
-        "hands": hands,
-        "flop": flop,
-        "turn": turn,
-        "river": river,
+        "hero": HERO,             # eroul cu care se joacă mâna (intră în istoric)
         "stage": "flop",
-        "show": False,
-        "winners": [],
-        "winner_descriptions": [],
-        "winner_combos": [],
-        "possible_river": None,
     }
     # resetăm statistica river
     st.session_state.river_stats = None
+    st.session_state.street_stats = None
+    start_precompute(st.session_state.state)
 
     # pregătește dealerul pentru mâna următoare
     if st.session_state.rotate_dealer:
@@ -499,160 +453,178 @@ def new_hand():
     else:
         st.session_state.dealer_current = cur  # rămâne
 
-def winner_details_with_combos(hands, board5):
-    scored, combos, best = [], [], None
-    for h in hands:
-        s, combo = best_of_seven_with_combo(h + board5)
-        scored.append(s)
-        combos.append(combo)
-        if best is None or s > best:
-            best = s
-    winners = [i for i, s in enumerate(scored) if s == best]
-    desc = [describe_score(scored[i]) for i in winners]
-    winner_combos = [combos[i] for i in winners]
-    return winners, desc, winner_combos
-
 def progress_step():
+    # doar etapa se schimbă; legenda (River) și câștigătorii (Show) se citesc la afișare
+    # din cache-urile river_legend / resolved, umplute de obicei deja de precalcul
     s = st.session_state.state
-    if s["stage"] == "flop":
-        s["stage"] = "turn"
-    elif s["stage"] == "turn":
-        s["stage"] = "river"
-        # calculează "posibile combinații" pe board-ul complet (abia acum avem riverul în state)
-        board5 = s["flop"] + [s["turn"], s["river"]]
-        s["possible_river"] = legend_possibles_on_river(board5)
-    elif s["stage"] == "river":
-        s["stage"] = "show"
-        s["show"] = True
-        board5 = s["flop"] + [s["turn"], s["river"]]
-        winners, descriptions, winner_combos = winner_details_with_combos(s["hands"], board5)
-        s["winners"] = winners
-        s["winner_descriptions"] = descriptions
-        s["winner_combos"] = winner_combos
+    s["stage"] = {"flop": "turn", "turn": "river", "river": "show"}.get(s["stage"], s["stage"])
 
 # ===== UI =====
 
 # (Re)generează o mână dacă nu există sau s-a schimbat numărul de jucători
-if not st.session_state.state or len(st.session_state.state.get("hands", [])) != NUM_PLAYERS:
+if st.session_state.state.get("n") != NUM_PLAYERS:
     new_hand()
 
 s = st.session_state.state
-stage, show = s["stage"], s["show"]
-winners_set = set(s.get("winners", []))
-
-top_left, top_center, top_right = st.columns([1, 6, 1], gap="small")
-
-# ---------- COLȚ STÂNGA-SUS: buton + STATISTICI RIVER (la cerere) ----------
-with top_left:
-    if st.button("Mână nouă", key="btn_new_board", use_container_width=True):
-        new_hand()
-        st.rerun()
-
-    st.markdown("### 📈 Statistici pe River")
-
-    def render_pie(prob_red: float):
-        import matplotlib.pyplot as plt
+stage = s["stage"]
+show = stage == "show"
+hands, flop, turn, river = hand_cards(s)
+board5 = list(flop) + [turn, river]
+winners, winner_descriptions, winner_combos, _ = (
+    resolved(s["seed"], s["n"], s["dealer"]) if show else ((), (), (), ()))
+possible_river, river_patterns = river_legend(tuple(board5)) if stage in ("river", "show") else ((), {})
+# precalculul terminat nu mai are ce ține în sesiune (rezultatele sunt în cache-uri)
+if st.session_state.precompute is not None and st.session_state.precompute["future"].done():
+    st.session_state.precompute = None
+
+def show_queue(placeholder):
+    """on_status pentru Scheduler.run: poziția în coadă, apoi „se calculează”."""
+    def update(pos):
+        placeholder.markdown(f"⏳ În coadă pe server: poziția {pos}" if pos else "⏳ Se calculează…")
+    return update
+
+# câmpurile din river_stats păstrate în sesiune (restul se reface din seed / cache)
+SESSION_STATS = ("M", "W", "T", "p_exact_beats", "p_exact_tieonly", "p_mc_beats", "p_mc_tieonly",
+                 "p_mc_ci", "mc_n", "mc_se", "mc_var_ratio", "p_red")
+
+def variance_note(stats):
+    """Eroarea standard a estimării MC și câștigul de varianță față de MC simplu."""
+    se, ratio = stats.get("mc_se"), stats.get("mc_var_ratio")
+    if se is None:
+        return ""
+    gain = "" if ratio == 1.0 else (
+        " · varianță 0" if ratio is None else f" · varianță de {ratio:,.1f}× mai mică decât MC simplu")
+    return f"*Eroare standard: {se*100:.3f}%{gain}*"
+
+def cards_line(cards):
+    return " ".join(pretty_html(c) for c in cards)
+
+def pairs_page(codes, page):
+    """Pagina `page` (1-based) din perechile turn + river (coduri a * 52 + b)."""
+    st.markdown(wins_page_html(codes, page - 1), unsafe_allow_html=True)
+    st.caption(f"{(page - 1) * WINS_PER_PAGE + 1}–{min(page * WINS_PER_PAGE, len(codes))} "
+               f"din {len(codes)}")
+
+def outs_section(hole, board):
+    """Tabelul de outs pe flop / turn: se reface singur la fiecare stradă (fără buton)."""
+    st.markdown("#### 🎯 Outs")
+    opp_txt = st.text_input("Mâna unui adversar (opțional)", key="outs_opp",
+                            help="Două cărți exacte, ex. „AsKd” sau „A♠K♦”: se arată și cărțile "
+                                 "după care treci (sau rămâi) înaintea lui.").strip()
+    opp = None
+    if opp_txt:
+        try:
+            opp = tuple(ints_to_cards(parse_combo(opp_txt)))
+        except ValueError as e:
+            st.warning(f"Mâna adversarului nu se poate citi ({e}).")
+        if opp and set(opp) & set(hole + board):
+            st.warning("Mâna adversarului folosește cărți deja văzute (ale tale sau de pe board).")
+            opp = None
+
+    res = outs(hole, board, opp)
+    cat = res["category"]
+    nxt = "turn" if len(board) == 3 else "river"
+    st.markdown(f"Acum: **{RO_LABEL_MAIN[cat]}** · {res['unseen']} cărți nevăzute")
+    if res["outs"]:
+        for c in sorted(res["outs"], reverse=True):
+            cards = res["outs"][c]
+            st.markdown(f"**{RO_LABEL_MAIN[c]}** — {len(cards)} cărți: {cards_line(cards)}",
+                        unsafe_allow_html=True)
+    else:
+        st.markdown(f"*Nicio carte la {nxt} nu îți urcă mâna într-o categorie nouă.*")
+
+    if res["improve"]:
+        # perechile turn + river, pe categorii și pe pagini (ca lista de jos, wins_panel)
+        st.markdown(f"**Turn + river (din {res['pairs']:,} perechi):** " + ", ".join(
+            f"{RO_LABEL_MAIN[c]}: {len(res['improve'][c])}"
+            + (f" ({len(res['runner'][c])} runner-runner)" if c in res["runner"] else "")
+            for c in sorted(res["improve"], reverse=True)))
+        c1, c2, c3 = st.columns([3, 2, 1])
+        only_runner = c2.checkbox("Doar runner-runner", key="outs_runner", disabled=not res["runner"],
+                                  help="Perechile în care nicio carte nu-ți urcă singură mâna.")
+        by_class = res["runner"] if only_runner and res["runner"] else res["improve"]
+        classes = sorted(by_class, reverse=True)
+        cls = c1.selectbox("Perechi pentru", classes, format_func=RO_LABEL_MAIN.get, key="outs_cls")
+        codes = by_class[cls]
+        pages = -(-len(codes) // WINS_PER_PAGE)
+        page = c3.number_input("Pagina", 1, pages, 1, key="outs_page") if pages > 1 else 1
+        pairs_page(codes, page)
+
+    if opp is not None:
+        now = "ești înainte" if res["ahead"] else "ești în urmă"
+        beats = res["beats"]
+        line = (f"**Față de {cards_line(opp)}** ({now}): înainte după {nxt} cu "
+                f"{len(beats)} din {res['unseen']} cărți")
+        st.markdown(line + (f": {cards_line(beats)}" if beats else ""), unsafe_allow_html=True)
+        if res["pair_wins"] is not None:
+            n = res["pairs"]
+            st.markdown(f"Pe river: câștigi în {res['pair_wins']:,} din {n:,} perechi turn + river "
+                        f"({res['pair_wins'] / n * 100:.1f}%), egal în {res['pair_ties']:,}.")
+            codes = res["opp_pairs"]
+            if codes:
+                c1, c2 = st.columns([5, 1])
+                c1.markdown(f"**Perechile după care câștigă {cards_line(opp)}:** {len(codes):,}",
+                            unsafe_allow_html=True)
+                pages = -(-len(codes) // WINS_PER_PAGE)
+                page = c2.number_input("Pagina", 1, pages, 1, key="outs_opp_page") if pages > 1 else 1
+                pairs_page(codes, page)
+
+# ===== Panoul de statistici (fragment) =====
+# Butoanele „Calculează equity / statistici” rulează doar acest fragment; restul paginii
+# (masa, legenda) nu se reconstruiește. La River lista de mâini câștigătoare de jos
+# depinde de rezultat, așa că după un calcul nou se cere un rerun complet.
+@st.fragment
+def stats_panel():
+    street = "River" if stage in ("river", "show") else stage.capitalize()
+    st.markdown(f"### 📈 Statistici pe {street}")
+
+    def render_pie(prob_red: float, prob_tie: float = 0.0):
         prob_red = max(0.0, min(1.0, prob_red))
-        prob_green = 1.0 - prob_red
-        fig, ax = plt.subplots(figsize=(1.2, 1.2))
-        ax.pie(
-            [prob_red, prob_green],
-            labels=[f"Pierd\n ({prob_red*100:.1f}%)", f"Câștig\n ({prob_green*100:.1f}%)"],
-            colors=["#ef4444", "#10b981"],
-            startangle=90,
-            counterclock=False,
-            wedgeprops={"linewidth": 0.8, "edgecolor": "white"},
-            labeldistance=1.25,
-        )
-        for text in ax.texts:
-            text.set_fontsize(6)
-        ax.axis("equal")
-        st.pyplot(fig, use_container_width=False)
+        prob_tie = max(0.0, min(1.0 - prob_red, prob_tie or 0.0))
+        st.markdown(pie_svg(round(prob_red, 3), round(prob_tie, 3)), unsafe_allow_html=True)
 
     if stage in ("river", "show"):
         # buton care PORNEȘTE calculele grele o singură dată
         if st.button("Calculează statistici", key="btn_calc_stat"):
-            hero_hole = s["hands"][HERO-1]
-            board5 = s["flop"] + [s["turn"], s["river"]]
-            hero_score = best_of_seven(hero_hole + board5)
-
-            deck = make_deck()
-            used = set(hero_hole + board5)
-            remaining = [c for c in deck if c not in used]
-
-            all_pairs = list(combinations(remaining, 2))
-            M = len(all_pairs)
-            wins_1 = ties_1 = 0
-            wins_by_class = defaultdict(list)  # cls -> list[(a,b)]
-
-            for a, b in all_pairs:
-                sc = best_of_seven([a, b] + board5)
-                if sc > hero_score:
-                    wins_1 += 1
-                    cls = sc[0]
-                    wins_by_class[cls].append((a, b))
-                elif sc == hero_score:
-                    ties_1 += 1
-
-            W, T = wins_1, ties_1
-            hero_label = RO_LABEL_MAIN[hero_score[0]]
-
-            k_opps = max(0, int(total_players) - 1)
-            if M > 0:
-                p1_win = W / M
-                p1_tie = T / M
-            else:
-                p1_win = p1_tie = 0.0
-
-            if k_opps > 0:
-                p_any_beats_approx = 1 - (1 - p1_win) ** k_opps
-                p_any_tieonly_approx = ((1 - p1_win) ** k_opps -
-                                        (1 - p1_win - p1_tie) ** k_opps)
-            else:
-                p_any_beats_approx = 0.0
-                p_any_tieonly_approx = 0.0
-
-            p_red = p_any_beats_approx
-            p_mc_beats = None
-            p_mc_tieonly = None
-
-            # Monte Carlo e mai lent, dar îl facem doar LA CERERE
-            if use_mc and k_opps > 0 and M > 0:
-                hits = ties_mc = 0
-                rem = remaining[:]
-                for _ in range(int(mc_trials)):
-                    deck_mc = rem[:]
-                    random.shuffle(deck_mc)
-                    someone_beats = False
-                    someone_ties = False
-                    for i in range(k_opps):
-                        a, b = deck_mc[2 * i], deck_mc[2 * i + 1]
-                        sc = best_of_seven([a, b] + board5)
-                        if sc > hero_score:
-                            someone_beats = True
-                            break
-                        elif sc == hero_score:
-                            someone_ties = True
-                    if someone_beats:
-                        hits += 1
-                    elif someone_ties:
-                        ties_mc += 1
-                p_mc_beats = hits / mc_trials if mc_trials else 0.0
-                p_mc_tieonly = ties_mc / mc_trials if mc_trials else 0.0
-                p_red = p_mc_beats
-
-            # salvăm rezultatul ÎN CACHE (inclusiv mâinile câștigătoare pe categorii)
-            st.session_state.river_stats = {
-                "M": M, "W": W, "T": T,
-                "hero_score": hero_score,
-                "hero_label": hero_label,
-                "p_any_beats_approx": p_any_beats_approx,
-                "p_any_tieonly_approx": p_any_tieonly_approx,
-                "p_mc_beats": p_mc_beats,
-                "p_mc_tieonly": p_mc_tieonly,
-                "p_red": p_red,
-                "wins_by_class": wins_by_class,   # <--- NOU
-            }
+            # cele 990 de perechi + Monte Carlo rulează vectorizat în pkr_engine.stats;
+            # situațiile deja calculate (și permutările lor de culori) vin din cache
+            live = st.empty()
+
+            # precalculul de la împărțire: terminat -> hit în cache; în lucru -> același job
+            drop_idle_precompute()
+
+            def show_progress(hits, ties, n, lo, hi):
+                live.markdown(f"⏳ Monte Carlo: {n:,} runde · te bate {hits / n * 100:.2f}% "
+                              f"(IC 95%: {lo*100:.2f}–{hi*100:.2f}%)")
+
+            try:
+                stats = cached_river_stats(
+                    list(hands[HERO-1]), board5, compute=scheduled(
+                        job_scheduler(), st.session_state.session_id, on_status=show_queue(live)),
+                    progress=show_progress, **river_params())
+            except SchedulerBusy as e:
+                st.warning(f"Calculul nu a pornit: {e}.")
+                stats = None
+            except ValueError as e:
+                st.error(f"Range-ul adversarilor nu se poate folosi aici: {e}")
+                stats = None
+            except BrokenProcessPool:
+                st.error("Procesul de calcul s-a oprit neașteptat; apasă din nou butonul.")
+                stats = None
+            live.empty()
+
+            # în sesiune rămân doar numerele afișate (fără None); mâna ta vine din showdown-ul
+            # memorat (resolved), iar mâinile câștigătoare pe categorii se refac la cerere
+            # în panoul de jos (beating)
+            if stats is not None:
+                stats = {k: v for k, v in stats.items() if k in SESSION_STATS and v is not None}
+                stats["hero"] = HERO
+                stats["players"] = int(total_players)
+                if opp_range:
+                    stats["opp_range"] = opp_range
+            st.session_state.river_stats = stats
+            if stats is not None:
+                st.rerun()  # lista de jos (pe categorii) se actualizează doar la un rerun complet
 
         # Afișăm ce avem în cache (indiferent că suntem pe RIVER sau SHOW)
         stats = st.session_state.river_stats
@@ -660,16 +632,17 @@ with top_left:
             st.markdown("Apasă butonul de mai sus pentru a calcula statisticile.")
         else:
             M = stats["M"]; W = stats["W"]; T = stats["T"]
-            hero_score = stats["hero_score"]
-            hero_label = stats["hero_label"]
-            p_any_beats_approx = stats["p_any_beats_approx"]
-            p_any_tieonly_approx = stats["p_any_tieonly_approx"]
-            p_mc_beats = stats["p_mc_beats"]
-            p_mc_tieonly = stats["p_mc_tieonly"]
+            hero_score = score_tuple(resolved(s["seed"], s["n"], s["dealer"])[3][stats["hero"] - 1])
+            hero_label = RO_LABEL_MAIN[hero_score[0]]
+            p_exact_beats = stats.get("p_exact_beats")
+            p_exact_tieonly = stats.get("p_exact_tieonly")
+            p_mc_beats = stats.get("p_mc_beats")
+            p_mc_tieonly = stats.get("p_mc_tieonly")
             p_red = stats["p_red"]
 
+            in_range = " (în range)" if stats.get("opp_range") else ""
             st.markdown(
-                f"**Combinații posibile pentru 1 adversar:** {M:,}  ·  "
+                f"**Combinații posibile pentru 1 adversar{in_range}:** {M:,}  ·  "
                 f"**Te bat:** {W:,}  ·  **Egal:** {T:,}"
             )
             with st.expander("ℹ️ Ce înseamnă 990?"):
@@ -686,132 +659,86 @@ with top_left:
                 """)
             st.success(f"🃏 Mâna ta pe river: **{hero_label}** {format_hero_score(hero_score)}")
 
-            if use_mc and p_mc_beats is not None:
+            if p_mc_beats is not None and (use_mc or p_exact_beats is None):
+                lo, hi = stats["p_mc_ci"]
                 st.markdown(
-                    f"**Prob. ≥1 adversar te bate:** {p_mc_beats*100:.2f}%  \n"
-                    f"**Prob. egal (și nimeni nu te bate):** {p_mc_tieonly*100:.2f}%"
+                    f"**Prob. ≥1 adversar te bate:** {p_mc_beats*100:.2f}% "
+                    f"(IC 95%: {lo*100:.2f}–{hi*100:.2f}%, {stats['mc_n']:,} runde)  \n"
+                    f"**Prob. egal (și nimeni nu te bate):** {p_mc_tieonly*100:.2f}%  \n"
+                    f"{variance_note(stats)}"
                 )
             else:
                 st.markdown(
-                    f"**Prob. ≥1 adversar te bate (aprox.):** {p_any_beats_approx*100:.2f}%  \n"
-                    f"**Prob. egal (și nimeni nu te bate) (aprox.):** {p_any_tieonly_approx*100:.2f}%"
+                    f"**Prob. ≥1 adversar te bate (exact):** {p_exact_beats*100:.2f}%  \n"
+                    f"**Prob. egal (și nimeni nu te bate) (exact):** {p_exact_tieonly*100:.2f}%"
                 )
 
-            render_pie(p_red)
+            render_pie(p_red, p_mc_tieonly if p_mc_beats is not None else p_exact_tieonly)
     else:
-        # înainte de river, nu avem cum calcula
-        st.markdown(
-            "**Combinații posibile:** –  ·  **Te bat:** –  ·  **Egal:** –  \n\n"
-            "**Prob. ≥1 adversar te bate:** –  \n"
-            "**Prob. egal (și nimeni nu te bate):** –"
-        )
+        # flop / turn: equity pe toate completările board-ului (pkr_engine.equity)
+        board = list(flop) + ([turn] if stage == "turn" else [])
+        if st.button("Calculează equity", key="btn_calc_equity"):
+            hole = list(hands[HERO-1])
+            key = ("street_equity", tuple(hole), tuple(board), int(total_players), int(mc_trials),
+                   st.session_state.seed)
+            live = st.empty()
+            try:
+                eq = job_scheduler().run(st.session_state.session_id, key, street_equity, hole, board,
+                                         int(total_players), trials=int(mc_trials),
+                                         seed=st.session_state.seed, on_status=show_queue(live))
+                st.session_state.street_stats = (stage, eq)
+            except SchedulerBusy as e:
+                st.warning(f"Calculul nu a pornit: {e}.")
+            except BrokenProcessPool:
+                st.error("Procesul de calcul s-a oprit neașteptat; apasă din nou butonul.")
+            live.empty()
+
+        cached = st.session_state.street_stats
+        if cached is None or cached[0] != stage:
+            st.markdown(
+                f"**Equity pe {street}:** –  \n"
+                "**Prob. ≥1 adversar te bate:** –  \n"
+                "**Prob. egal (și nimeni nu te bate):** –"
+            )
+        else:
+            eq = cached[1]
+            how = "exact" if eq["exact"] else f"Monte Carlo, {eq['samples']:,} runde"
+            st.markdown(
+                f"**Equity pe {street} ({how}):** {eq['equity']*100:.2f}%  \n"
+                f"**Prob. ≥1 adversar te bate:** {eq['p_beats']*100:.2f}%  \n"
+                f"**Prob. egal (și nimeni nu te bate):** {eq['p_tieonly']*100:.2f}%"
+            )
+            render_pie(eq["p_beats"], eq["p_tieonly"])
 
-# ---------- CENTRU: masa + board + jucători ----------
-with top_center:
-    st.markdown("<h1 style='text-align:center;margin:0.5rem 0'>Texas Hold'em</h1>", unsafe_allow_html=True)
+        outs_section(tuple(hands[HERO-1]), tuple(board))
 
-    # === Board (cu highlight pe cărțile din combo câștigătoare) ===
-    board_highlight_set = set()
-    if show and s["winner_combos"]:
-        all_board = s["flop"] + [s["turn"], s["river"]]
-        for combo in s["winner_combos"]:
-            for c in combo:
-                if c in all_board:
-                    board_highlight_set.add(c)
-
-    parts = []
-    for c in s["flop"]:
-        parts.append(card_html(c, big=True,
-                               highlight=show and c in board_highlight_set,
-                               border=show and c in board_highlight_set, scale=CARD_SCALE_BOARD))
-    parts.append(
-        card_html(s["turn"], big=True,
-                  highlight=show and s["turn"] in board_highlight_set,
-                  border=show and s["turn"] in board_highlight_set, scale=CARD_SCALE_BOARD)
-        if stage in ("turn", "river", "show") else hidden_html(big=True, scale=CARD_SCALE_BOARD)
-    )
-    parts.append(
-        card_html(s["river"], big=True,
-                  highlight=show and s["river"] in board_highlight_set,
-                  border=show and s["river"] in board_highlight_set, scale=CARD_SCALE_BOARD)
-        if stage in ("river", "show") else hidden_html(big=True, scale=CARD_SCALE_BOARD)
-    )
 
-    # === Jucători în jurul mesei ===
-    player_seats = []
-    dealer_chips = []  # chip-urile dealer-ului (plasate pe masă, nu în badge)
-    for i in range(NUM_PLAYERS):
-        # 0° sus, sens orar; offset -90° ca jos să fie ~270°
-        angle = (360 * i / NUM_PLAYERS)
-        radius = 46
-        x = 50 + radius * math.cos(math.radians(angle - 90))
-        y = 50 + radius * math.sin(math.radians(angle - 90))
-
-        is_hero = (i + 1) == HERO
-        is_winner = (stage == "show") and (i in winners_set)
-
-        # set pt highlight cărți câștigătoare
-        combo_set = set()
-        if is_winner and s["winner_combos"]:
-            for w_i, w_idx in enumerate(s["winners"]):
-                if w_idx == i:
-                    combo_set = set(s["winner_combos"][w_i])
-                    break
-
-        label = "TU" if is_hero else f"Jucător {i+1}"
-        if (i + 1) == s["dealer"]:
-            label += " (D)"
-        if is_winner:
-            label += " 🏆"
-        cls = "player-badge hero" if is_hero else "player-badge"
-
-        # cărți vizibile: TU mereu; ceilalți la showdown
-        if is_hero or stage == "show":
-            cards = s["hands"][i]
-            cards_html = " ".join(
-                card_html(c, highlight=(is_winner and (c in combo_set)), scale=CARD_SCALE_PLAYERS)
-                for c in cards
-            )
-        else:
-            cards_html = " ".join(hidden_html(scale=CARD_SCALE_PLAYERS) for _ in range(2))
-
-        # seat container
-        player_seats.append(
-            f"<div class='player-seat' style='left:{x}%;top:{y}%'>"
-            f"<div class='{cls}'>{label}</div>"
-            f"<div class='player-cards'>{cards_html}</div>"
-            f"</div>"
-        )
+top_left, top_center, top_right = st.columns([1, 6, 1], gap="small")
 
-        # === Dealer chip: spre interiorul mesei (interpolare către centru) ===
-        if (i + 1) == s["dealer"]:
-            alpha = 0.70  # 0.78..0.90 — mai mare = mai aproape de scaun; mai mic = mai aproape de centru
-            chip_x = 50 * (1 - alpha) + alpha * x
-            chip_y = 50 * (1 - alpha) + alpha * y
-
-            # (opțional) mic push suplimentar spre centru
-            vec_x = 50 - x
-            vec_y = 50 - y
-            norm = (vec_x**2 + vec_y**2) ** 0.5 or 1.0
-            push_pct = 0.0
-            chip_x += (vec_x / norm) * push_pct
-            chip_y += (vec_y / norm) * push_pct
-
-            dealer_chips.append(
-                f"<div class='dealer-chip' style='left:{chip_x}%;top:{chip_y}%'>D</div>"
-            )
+# ---------- COLȚ STÂNGA-SUS: buton + STATISTICI RIVER (la cerere) ----------
+with top_left:
+    if st.button("Mână nouă", key="btn_new_board", use_container_width=True):
+        new_hand()
+        st.rerun()
+
+    # equity preflop: o simplă citire din tabelul precalculat (assets/preflop_equity.npy)
+    pre = preflop_equity(list(hands[HERO-1]), NUM_PLAYERS - 1)
+    if pre is not None:
+        st.caption(f"Preflop {pre['hand']} vs. {NUM_PLAYERS - 1} adversari: "
+                   f"câștig {pre['p_win']*100:.1f}% · egal {pre['p_tie']*100:.1f}% · "
+                   f"equity {pre['equity']*100:.1f}%")
+
+    stats_panel()
+
+# ---------- CENTRU: masa + board + jucători ----------
+with top_center:
+    st.markdown("<h1 style='text-align:center;margin:0.5rem 0'>Texas Hold'em</h1>", unsafe_allow_html=True)
 
-    html_table = textwrap.dedent(f"""
-    <div class="table-wrap">
-      <div class="poker-table">
-        <div class="table-logo">Texas Hold'em</div>
-        <div class="board-cards">{' '.join(parts)}</div>
-        {''.join(player_seats)}
-        {''.join(dealer_chips)}
-      </div>
-    </div>
-    """).strip()
-    st.markdown(html_table, unsafe_allow_html=True)
+    # HTML-ul mesei depinde doar de starea mâinii: aceeași stare -> același string din cache
+    with metrics.timer("render_table"):
+        st.markdown(table_html(
+            hands, flop, turn, river, stage, s["dealer"], HERO, winners, winner_combos,
+        ), unsafe_allow_html=True)
 
 # ---------- COLȚ DREAPTA-SUS: progres joc ----------
 with top_right:
@@ -826,13 +753,13 @@ st.divider()
 
 # ===== Rezultat la SHOW =====
 if stage == "show":
-    if len(s["winners"]) == 1:
-        w = s["winners"][0]
-        desc = s["winner_descriptions"][0] if s["winner_descriptions"] else ""
+    if len(winners) == 1:
+        w = winners[0]
+        desc = winner_descriptions[0] if winner_descriptions else ""
         st.success(f"🏆 **Câștigător: Jucătorul {w+1}** — {desc}")
     else:
         st.success("🏆 **Câștigători (split):**")
-        for w, desc in zip(s["winners"], s["winner_descriptions"]):
+        for w, desc in zip(winners, winner_descriptions):
             st.write(f"• Jucătorul {w+1} — {desc}")
 
 st.divider()
@@ -856,41 +783,113 @@ with left_col:
     st.text(legend_txt)
 with right_col:
     st.markdown("### Combinații posibile câștigătoare (doar la River)")
-    if s.get("possible_river"):
-        st.text(legend_lines(s["possible_river"]))
+    if possible_river:
+        st.text(legend_lines(possible_river))
+        with st.expander("Ce cărți din mână ajung acolo"):
+            for i in possible_river:
+                pats = river_patterns.get(i, [])
+                more = f" … (+{len(pats) - 12})" if len(pats) > 12 else ""
+                st.markdown(f"**{LEGEND_TEXT[i]}:** " + ", ".join(pats[:12]) + more)
     else:
         st.text("—")
 
 st.divider()
 
 # ===== MÂINI POSIBILE CÂȘTIGĂTOARE – GRUPATE (în stil poker_click_images_full) =====
-stats = st.session_state.river_stats
-if stage in ("river", "show") and stats is not None and stats.get("wins_by_class"):
-    st.subheader("Mâini posibile câștigătoare (1 adversar) – grupate")
-
-    wins_by_class = stats["wins_by_class"]  # dict: cls -> list[(a,b)]
+# wins_by_class ține doar coduri întregi de perechi (pkr_engine.stats); HTML-ul se face
+# pentru o singură pagină, la cerere, iar schimbarea paginii rulează doar fragmentul.
+@st.fragment
+def wins_panel(wins_by_class):
     order_classes = [8, 7, 6, 5, 4, 3, 2, 1, 0]  # de la cea mai puternică la cea mai slabă
+    classes = [c for c in order_classes if len(wins_by_class.get(c, ()))]
+    for cls in classes:
+        st.markdown(f"**{RO_LABEL_MAIN[cls]} — {len(wins_by_class[cls])} combinații**")
+    if not classes:
+        return
+
+    c1, c2 = st.columns([3, 1])
+    cls = c1.selectbox("Vezi exemple", classes, format_func=RO_LABEL_MAIN.get)
+    codes = tuple(wins_by_class[cls].tolist())
+    pages = -(-len(codes) // WINS_PER_PAGE)
+    page = c2.number_input("Pagina", 1, pages, 1) if pages > 1 else 1
+    # pretty_html colorează ♥ și ♦ în roșu; pagina se memorează
+    st.markdown(wins_page_html(codes, page - 1), unsafe_allow_html=True)
+    st.caption(f"{(page - 1) * WINS_PER_PAGE + 1}–{min(page * WINS_PER_PAGE, len(codes))} "
+               f"din {len(codes)}")
 
-    for cls in order_classes:
-        hands = wins_by_class.get(cls, [])
-        if not hands:
-            continue
-        ro = RO_LABEL_MAIN[cls]
-        st.markdown(f"**{ro} — {len(hands)} combinații**")
-        with st.expander("Vezi exemple"):
-            show_n = min(120, len(hands))
-
-            # folosim pretty_html pentru a colora ♥ și ♦ în roșu
-            txt = ", ".join(
-                f"{pretty_html(hands[i][0])} {pretty_html(hands[i][1])}"
-                for i in range(show_n)
-            )
-            if len(hands) > show_n:
-                txt += " ..."
+stats = st.session_state.river_stats
+wins_by_class = (beating(hands[stats["hero"] - 1], tuple(board5), stats.get("opp_range"))
+                 if stage in ("river", "show") and stats is not None else None)
+if wins_by_class:
+    st.subheader("Mâini posibile câștigătoare (1 adversar) – grupate")
 
-            st.markdown(txt, unsafe_allow_html=True)
+    wins_panel(wins_by_class)
 else:
     st.markdown(
         "*(Mâinile posibile câștigătoare pe categorii vor apărea aici "
         "după ce calculezi statisticile pe River.)*"
     )
+
+# ===== Istoric (la cerere) =====
+st.divider()
+if st.toggle("📚 Istoric mâini", key="show_history"):
+    hist = hand_history()
+    if hist is None:
+        st.info("Istoricul nu este disponibil (fișierul SQLite nu se poate deschide).")
+    else:
+        hist.flush(timeout=1.0)
+        total = hist.count()
+        st.markdown(f"**Mâini înregistrate:** {total:,}")
+        if total:
+            names = ["dealer", "small blind", "big blind"] + [f"dealer+{i}" for i in range(3, NUM_PLAYERS)]
+            h1, h2, h3 = st.columns(3)
+            with h1:
+                st.markdown(f"**Câștig pe poziție ({NUM_PLAYERS} jucători)**")
+                st.dataframe(
+                    [{"poziție": names[pos], "mâini": n, "câștig %": round(w / n * 100, 1),
+                      "split %": round(sp / n * 100, 1)}
+                     for _, pos, n, w, sp in hist.win_rate_by_position(NUM_PLAYERS)],
+                    hide_index=True, width="stretch")
+            with h2:
+                st.markdown("**Mâna câștigătoare, pe categorii**")
+                st.dataframe(
+                    [{"categorie": HAND_NAMES[c], "mâini": n, "frecvență %": round(n / total * 100, 2),
+                      "câștigate de tine": w}
+                     for c, n, w in hist.category_frequencies()],
+                    hide_index=True, width="stretch")
+            with h3:
+                st.markdown("**Prezis vs. realizat (≥1 adversar te bate)**")
+                st.dataframe(
+                    [{"p_red": f"{b * 10}–{b * 10 + 10}%", "mâini": n,
+                      "prezis %": round(p * 100, 1), "realizat %": round(r * 100, 1)}
+                     for b, n, p, r in hist.calibration()],
+                    hide_index=True, width="stretch")
+
+# ===== Panoul Performance (sidebar) =====
+if perf_on:
+    metrics.record("script_run", time.perf_counter() - _run_t0)
+    snap = metrics.snapshot({
+        name: {"hits": fn.cache_info().hits, "misses": fn.cache_info().misses}
+        for name, fn in (("table_html", table_html), ("card_html", card_html),
+                         ("wins_page_html", wins_page_html))
+    })
+    with st.sidebar:
+        st.subheader("⏱️ Performance")
+        st.dataframe(
+            [{"etapă": k, "apeluri": v["calls"], "medie ms": round(v["mean_ms"], 2),
+              "max ms": round(v["max_ms"], 2),
+              "unități/s": f"{v['units_per_s']:,.0f}" if v["units_per_s"] else "–"}
+             for k, v in sorted(snap["stages"].items())],
+            hide_index=True, width="stretch",
+        )
+        counters = snap["counters"]
+        st.caption(" · ".join(f"{k}: {v:,}" for k, v in sorted(counters.items())) or "—")
+        st.caption(" · ".join(
+            f"{k}: {c['hit_rate']*100:.0f}% hit" if c["hit_rate"] is not None else f"{k}: –"
+            for k, c in snap["caches"].items()))
+        c1, c2, c3 = st.columns(3)
+        c1.download_button("JSON", metrics.to_json(snap), "pkr-metrics.json", "application/json")
+        c2.download_button("Prometheus", metrics.to_prometheus(snap), "pkr-metrics.prom", "text/plain")
+        if c3.button("Reset", key="btn_metrics_reset"):
+            metrics.reset()
+            st.rerun()
@@ -0,0 +1,24 @@
+"""Motorul de poker (cărți, evaluare) folosit de pkr-tab-stat.py."""
+
+from .cards import (
+    RANKS, SUITS, RED_SUITS, RANK_VAL, VAL_RANK, CARD_STRS,
+    card_to_int, int_to_card, cards_to_ints, ints_to_cards,
+)
+from .evaluator import rank_cards, rank_holes, score_tuple, hand_category, best_five, HAND_NAMES
+from .batch import rank_batch, rank_holes_batch, rank_with_pairs, card_keys, rank_keys
+from .stats import river_stats, beating_pairs, decode_pairs
+from .equity import street_equity, headsup_equity, multiway_equity
+from .outs import outs_table
+from .texture import board_texture, reachable_categories, pattern_str, legend_id
+from .dealing import (
+    Deck, make_deck, riffle_shuffle, riffle_decks, shuffled_decks,
+    seat_order, deal_hole_cards, deal_board, deal_hand, showdown,
+)
+from .exact import exact_multiway, count_matchings, clear_exact_cache
+from .preflop import preflop_equity, hand_class, class_name, load_table
+from .parallel import mc_counts_parallel, default_workers
+from .ranges import parse_range, parse_combo, build_alias, alias_draw, COMBO_MASK
+from . import metrics
+from .history import HandHistory, hand_row
+from .scheduler import Scheduler, SchedulerBusy
+from .cache import cached_river_stats, canonical_spot, cache_stats, clear_cache, set_cache_db
@@ -0,0 +1,94 @@
+# ===== Evaluator vectorizat (NumPy) =====
+# Aceleași tabele ca evaluator.py, aplicate pe un array (N, 5..7) de cărți întregi.
+
+import numpy as np
+
+from . import metrics
+from .evaluator import RANK_TABLE, FLUSH_TABLE, FLUSH_SUIT, RKEY, SKEY
+
+_RKEY = np.array(RKEY, dtype=np.int64)
+_SKEY = np.array(SKEY, dtype=np.int64)
+# bitul (13 * culoare + rang) -> masca de ranguri a unei culori e o simplă deplasare
+_SBIT = np.array([1 << (13 * (c & 3) + (c >> 2)) for c in range(52)], dtype=np.int64)
+
+_keys = sorted(RANK_TABLE)
+_RANK_KEYS = np.array(_keys, dtype=np.int64)
+_RANK_VALS = np.array([RANK_TABLE[k] for k in _keys], dtype=np.int32)
+_FLUSH_SUIT = np.array(FLUSH_SUIT, dtype=np.int8)
+_FLUSH = np.array(FLUSH_TABLE, dtype=np.int32)
+del _keys
+
+
+def card_keys(cards):
+    """Cheile aditive (rk, sk, bits) ale unui grup de cărți, pe ultima axă.
+
+    Cheile se adună: board + runout + perechea adversarului = suma cheilor parțiale,
+    așa că starea unui board parțial se refolosește pentru toate completările lui."""
+    cards = np.asarray(cards, dtype=np.intp)
+    return (_RKEY[cards].sum(axis=-1), _SKEY[cards].sum(axis=-1),
+            _SBIT[cards].sum(axis=-1))
+
+
+def rank_keys(rk, sk, bits) -> np.ndarray:
+    """Scorurile din chei însumate pentru 5–7 cărți (array-uri de aceeași formă)."""
+    rk = np.asarray(rk)
+    out = _RANK_VALS[np.searchsorted(_RANK_KEYS, rk)]
+    fs = _FLUSH_SUIT[sk]
+    f = np.nonzero(fs >= 0)
+    if f[0].size:
+        out[f] = _FLUSH[(bits[f] >> (13 * fs[f].astype(np.int64))) & 0x1FFF]
+    metrics.count("evaluator_calls")
+    metrics.count("hands_evaluated", out.size)
+    return out
+
+
+def rank_batch(cards) -> np.ndarray:
+    """(N, 5..7) cărți întregi -> (N,) scoruri întregi, identice cu rank_cards pe fiecare rând."""
+    cards = np.asarray(cards, dtype=np.intp)
+    rk = _RKEY[cards].sum(axis=1)
+    sk = _SKEY[cards].sum(axis=1)
+    out = _RANK_VALS[np.searchsorted(_RANK_KEYS, rk)]
+    fs = _FLUSH_SUIT[sk]
+    f = np.flatnonzero(fs >= 0)
+    if f.size:
+        bits = _SBIT[cards[f]].sum(axis=1)
+        out[f] = _FLUSH[(bits >> (13 * fs[f].astype(np.int64))) & 0x1FFF]
+    metrics.count("evaluator_calls")
+    metrics.count("hands_evaluated", out.size)
+    return out
+
+
+def rank_holes_batch(board, holes) -> np.ndarray:
+    """Board-uri (H, 5) + cărțile din mână (H, n, 2) -> scoruri (H, n).
+
+    Cheile board-ului se adună o dată pe mână, nu o dată pe loc; măștile de culoare
+    se calculează doar pentru locurile care au culoare."""
+    board = np.asarray(board, dtype=np.intp)
+    holes = np.asarray(holes, dtype=np.intp)
+    rk = _RKEY[board].sum(axis=1)[:, None] + _RKEY[holes].sum(axis=2)
+    sk = _SKEY[board].sum(axis=1)[:, None] + _SKEY[holes].sum(axis=2)
+    out = _RANK_VALS[np.searchsorted(_RANK_KEYS, rk)]
+    fs = _FLUSH_SUIT[sk]
+    h, p = np.nonzero(fs >= 0)
+    if h.size:
+        bits = _SBIT[board[h]].sum(axis=1) + _SBIT[holes[h, p]].sum(axis=1)
+        out[h, p] = _FLUSH[(bits >> (13 * fs[h, p].astype(np.int64))) & 0x1FFF]
+    metrics.count("evaluator_calls")
+    metrics.count("hands_evaluated", out.size)
+    return out
+
+
+def pair_indices(n: int):
+    """Indicii (a, b) ai tuturor perechilor din n cărți, în ordinea lui combinations(range(n), 2)."""
+    return np.triu_indices(n, 1)
+
+
+def rank_with_pairs(board, pool) -> np.ndarray:
+    """Scorurile board + fiecare pereche din pool, în ordinea pair_indices(len(pool))."""
+    pool = np.asarray(pool, dtype=np.intp)
+    ia, ib = pair_indices(len(pool))
+    hands = np.empty((len(ia), len(board) + 2), dtype=np.intp)
+    hands[:, :len(board)] = board
+    hands[:, -2] = pool[ia]
+    hands[:, -1] = pool[ib]
+    return rank_batch(hands)
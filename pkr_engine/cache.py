@@ -0,0 +1,175 @@
+# ===== Cache comun pentru statisticile de River =====
+# Două situații care diferă doar printr-o permutare a culorilor au aceleași
+# probabilități, așa că cheia e forma canonică a (erou, board) sub cele 24 de
+# permutări. Calculul se face mereu pe forma canonică (inclusiv Monte Carlo, deci
+# același seed dă același rezultat pentru toate permutările), iar perechile din
+# wins_by_class se traduc înapoi în culorile reale ale mâinii. Un range de adversar
+# intră în cheie; dacă are combo-uri exacte („AsKs”) nu mai e simetric la culori și
+# situația nu se canonicalizează.
+#   nivel 1: LRU în memorie, comun tuturor sesiunilor din procesul Streamlit
+#   nivel 2: SQLite opțional (PKR_CACHE_DB=<fișier>), supraviețuiește restartului
+
+import os
+import pickle
+import sqlite3
+import threading
+from collections import OrderedDict
+from itertools import permutations
+
+import numpy as np
+
+from .cards import cards_to_ints, ints_to_cards
+from .stats import river_stats
+from .ranges import is_suit_symmetric
+
+CACHE_SIZE = 1024
+# intră în cheie: se schimbă când se schimbă forma rezultatului, ca intrările vechi din
+# SQLite să nu mai fie citite (2: wins_by_class ca coduri întregi de perechi;
+# 3: MC cu range și un adversar ponderat, MC stratificat fără runde raportat ca exact;
+# 4: fără calcul exact cu Monte Carlo cerut sau peste bugetul exact_multiway)
+FORMAT = 4
+
+_lock = threading.Lock()
+_lru = OrderedDict()
+_counters = {"hits": 0, "disk_hits": 0, "misses": 0}
+_db_path = os.environ.get("PKR_CACHE_DB") or None
+
+_PERMS = list(permutations(range(4)))
+
+
+def _apply(perm, cards):
+    return sorted(4 * (c >> 2) + perm[c & 3] for c in cards)
+
+
+def canonical_spot(hero_hole, board5):
+    """(erou_canonic, board_canonic, perm) cu perm[culoare_reală] = culoare_canonică."""
+    hero_i, board_i = cards_to_ints(hero_hole), cards_to_ints(board5)
+    best = None
+    for perm in _PERMS:
+        key = (tuple(_apply(perm, hero_i)), tuple(_apply(perm, board_i)))
+        if best is None or key < best[0]:
+            best = (key, perm)
+    (hero_c, board_c), perm = best
+    return list(hero_c), list(board_c), perm
+
+
+def _unmap(stats, perm):
+    """Copie a rezultatului canonic, cu perechile din wins_by_class în culorile reale."""
+    inv = [0] * 4
+    for real, canon in enumerate(perm):
+        inv[canon] = real
+    to_real = np.array([4 * (c >> 2) + inv[c & 3] for c in range(52)], dtype=np.uint16)
+    wins = {}
+    for cls, codes in stats["wins_by_class"].items():
+        a, b = to_real[codes // 52], to_real[codes % 52]
+        # aceeași ordine ca un calcul direct: perechile în ordinea cărților rămase
+        wins[cls] = np.sort(np.minimum(a, b) * 52 + np.maximum(a, b))
+    out = dict(stats)
+    out["wins_by_class"] = wins
+    return out
+
+
+def set_cache_db(path):
+    """Activează (path) sau dezactivează (None) nivelul SQLite."""
+    global _db_path
+    _db_path = path or None
+
+
+def _db():
+    con = sqlite3.connect(_db_path, timeout=5)
+    con.execute("CREATE TABLE IF NOT EXISTS river_stats (key TEXT PRIMARY KEY, value BLOB)")
+    return con
+
+
+def _db_get(key):
+    if not _db_path:
+        return None
+    try:
+        with _db() as con:
+            row = con.execute("SELECT value FROM river_stats WHERE key = ?", (key,)).fetchone()
+    except sqlite3.Error:
+        return None
+    return pickle.loads(row[0]) if row else None
+
+
+def _db_put(key, value):
+    if not _db_path:
+        return
+    try:
+        with _db() as con:
+            con.execute("INSERT OR REPLACE INTO river_stats VALUES (?, ?)",
+                        (key, pickle.dumps(value)))
+    except sqlite3.Error:
+        pass
+
+
+def _remember(key, value):
+    with _lock:
+        _lru[key] = value
+        _lru.move_to_end(key)
+        while len(_lru) > CACHE_SIZE:
+            _lru.popitem(last=False)
+
+
+def cached_river_stats(hero_hole, board5, total_players, mc_trials, use_mc, seed=None, workers=1,
+                       mc_target=None, mc_time=2.0, progress=None, opp_range=None, compute=None,
+                       mc_method="plain"):
+    """river_stats() prin cache; rezultatul e o copie pe care apelantul o poate modifica.
+    progress se apelează doar când chiar rulează Monte Carlo (nu la un hit).
+    compute(key, river_stats, *args, progress=..., **kwargs) înlocuiește apelul direct la un
+    miss (ex. Scheduler.run, care rulează calculul în pool-ul comun și trimite progresul)."""
+    opp_range = (opp_range or "").strip() or None
+    if opp_range is None or is_suit_symmetric(opp_range):
+        hero_c, board_c, perm = canonical_spot(hero_hole, board5)
+    else:
+        hero_c, board_c, perm = sorted(cards_to_ints(hero_hole)), sorted(cards_to_ints(board5)), _PERMS[0]
+    if not use_mc:
+        # cu range și ≥ 2 adversari, sau peste bugetul calculului exact, river_stats
+        # rulează Monte Carlo oricum
+        mc = (("exact", int(mc_trials or 0), seed, int(workers)) if opp_range is None
+              else ("range", int(mc_trials or 0), seed))
+    elif mc_method == "stratified" and opp_range is None:
+        mc = ("stratified", int(mc_trials or 0), float(mc_target or 0), float(mc_time), seed)
+    elif mc_target:
+        mc = ("adaptive", float(mc_target), float(mc_time), seed)
+    else:
+        mc = (int(mc_trials), seed, int(workers))
+    key = repr((FORMAT, hero_c, board_c, int(total_players), mc, opp_range))
+
+    with _lock:
+        hit = _lru.get(key)
+        if hit is not None:
+            _lru.move_to_end(key)
+            _counters["hits"] += 1
+    if hit is None:
+        hit = _db_get(key)
+        if hit is not None:
+            with _lock:
+                _counters["disk_hits"] += 1
+            _remember(key, hit)
+    if hit is None:
+        with _lock:
+            _counters["misses"] += 1
+        args = (ints_to_cards(hero_c), ints_to_cards(board_c), total_players, mc_trials, use_mc)
+        kwargs = dict(seed=seed, workers=workers, mc_target=mc_target, mc_time=mc_time,
+                      opp_range=opp_range, mc_method=mc_method)
+        if compute is None:
+            hit = river_stats(*args, progress=progress, **kwargs)
+        else:
+            hit = compute(key, river_stats, *args, progress=progress, **kwargs)
+        _remember(key, hit)
+        _db_put(key, hit)
+    return _unmap(hit, perm)
+
+
+def cache_stats():
+    """Contoarele cache-ului: hits (memorie), disk_hits (SQLite), misses, size."""
+    with _lock:
+        return dict(_counters, size=len(_lru))
+
+
+def clear_cache():
+    with _lock:
+        _lru.clear()
+        for k in _counters:
+            _counters[k] = 0
@@ -0,0 +1,37 @@
+# ===== Cărți: reprezentare text + codare întreagă =====
+# Card întreg: c = 4 * r + s, cu r = 0..12 (2..A) și s = indexul din SUITS.
+# Ordinea coincide cu make_deck(): make_deck()[c] == int_to_card(c).
+
+RANKS = ["2","3","4","5","6","7","8","9","10","J","Q","K","A"]
+SUITS = "♣♦♥♠"
+RED_SUITS = {"♦", "♥"}
+RANK_VAL = {r: i for i, r in enumerate(RANKS, start=2)}
+VAL_RANK = {v: r for r, v in RANK_VAL.items()}
+
+CARD_STRS = [r + s for r in RANKS for s in SUITS]
+CARD_INDEX = {c: i for i, c in enumerate(CARD_STRS)}
+
+
+def card_to_int(card: str) -> int:
+    return CARD_INDEX[card]
+
+
+def int_to_card(c: int) -> str:
+    return CARD_STRS[c]
+
+
+def cards_to_ints(cards):
+    return [CARD_INDEX[c] for c in cards]
+
+
+def ints_to_cards(cards):
+    return [CARD_STRS[c] for c in cards]
+
+
+def card_rank(c: int) -> int:
+    """Valoarea rangului (2..14), la fel ca RANK_VAL."""
+    return (c >> 2) + 2
+
+
+def card_suit(c: int) -> int:
+    return c & 3
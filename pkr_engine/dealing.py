@@ -0,0 +1,137 @@
+# ===== Împărțirea cărților și showdown (fără Streamlit) =====
+# Aceleași reguli ca în aplicație: amestecare riffle, cărțile din mână câte una pe
+# rând începând din stânga dealerului, burn înainte de flop / turn / river.
+# Cu același random.Random(seed) se obține exact aceeași mână ca în pkr-tab-stat.py.
+
+import numpy as np
+
+from .cards import RANKS, SUITS, CARD_STRS, cards_to_ints
+from . import metrics
+from .evaluator import rank_holes, best_five
+
+
+def make_deck():
+    return [r + s for r in RANKS for s in SUITS]
+
+
+class Deck:
+    """Pachet compact: listă de cărți întregi (vezi cards.py) + cursor de citire.
+    deal / burn doar avansează cursorul, fără să mute restul pachetului."""
+
+    __slots__ = ("cards", "pos")
+
+    def __init__(self, cards=None):
+        self.cards = list(range(52)) if cards is None else list(cards)
+        self.pos = 0
+
+    def __len__(self):
+        return len(self.cards) - self.pos
+
+    def deal(self) -> int:
+        c = self.cards[self.pos]
+        self.pos += 1
+        return c
+
+    def deal_n(self, n):
+        out = self.cards[self.pos:self.pos + n]
+        self.pos += n
+        return out
+
+    def burn(self):
+        if self.pos < len(self.cards):
+            self.pos += 1
+
+    def remaining(self):
+        return self.cards[self.pos:]
+
+    def riffle(self, rng, times=5):
+        """Amestecă restul pachetului (riffle_shuffle) și resetează cursorul."""
+        self.cards = self.cards[self.pos:]
+        self.pos = 0
+        riffle_shuffle(self.cards, rng, times)
+
+
+def riffle_shuffle(deck, rng, times=5):
+    """Riffle în loc, pe o listă (text sau întregi). Consumă rng exact ca varianta
+    cu slicing repetat (randint(a, b) == a + _randbelow(b - a + 1)), deci același seed
+    dă același pachet; un pas e O(52), cu indici în loc de liste tăiate la fiecare pas."""
+    below = getattr(rng, "_randbelow", None) or (lambda m: rng.randint(0, m - 1))
+    n = len(deck)
+    for _ in range(times):
+        cut = 18 + below(17)
+        inter = []
+        li, ri = 0, cut
+        while li < cut or ri < n:
+            tl = 1 + below(3); tr = 1 + below(3)
+            inter += deck[li:li + tl] if li + tl <= cut else deck[li:cut]
+            inter += deck[ri:ri + tr]
+            li = min(li + tl, cut); ri = min(ri + tr, n)
+        k = 5 + below(11)
+        deck[:] = inter[-k:] + inter[:-k]
+
+
+def riffle_decks(count, rng, times=5):
+    """count pachete amestecate riffle, unul după altul din același rng -> (count, 52)."""
+    decks = np.empty((count, 52), dtype=np.intp)
+    for h in range(count):
+        cards = list(range(52))
+        riffle_shuffle(cards, rng, times)
+        decks[h] = cards
+    return decks
+
+
+def shuffled_decks(count, rng):
+    """count pachete amestecate uniform (np.random.Generator) -> (count, 52), vectorizat."""
+    return rng.permuted(np.broadcast_to(np.arange(52, dtype=np.intp), (count, 52)), axis=1)
+
+
+def burn(deck):
+    deck.burn()
+
+
+def seat_order(dealer_pos, num_players):
+    return [(dealer_pos + 1 + i) % num_players for i in range(num_players)]
+
+
+def deal_hole_cards(deck, num_players, dealer_pos):
+    """Câte o carte pe rând, de două ori, începând din stânga dealerului (text)."""
+    hands = [[] for _ in range(num_players)]
+    order = seat_order(dealer_pos, num_players)
+    for _ in range(2):
+        for p in order:
+            hands[p].append(CARD_STRS[deck.deal()])
+    return hands
+
+
+def deal_board(deck):
+    burn(deck); flop = [CARD_STRS[c] for c in deck.deal_n(3)]
+    burn(deck); turn = CARD_STRS[deck.deal()]
+    burn(deck); river = CARD_STRS[deck.deal()]
+    return flop, turn, river
+
+
+def deal_hand(rng, num_players, dealer_pos):
+    """O mână completă: (hands, flop, turn, river); dealer_pos e 0-based."""
+    deck = Deck()
+    deck.riffle(rng)
+    hands = deal_hole_cards(deck, num_players, dealer_pos)
+    flop, turn, river = deal_board(deck)
+    return hands, flop, turn, river
+
+
+def showdown(hands, board5):
+    """(câștigători, scorurile întregi ale tuturor jucătorilor, combo-urile de 5 cărți ale
+    câștigătorilor). Toate locurile se evaluează într-o trecere (rank_holes); cele 5 cărți
+    se reconstruiesc doar pentru câștigători. score_tuple / hand_category pe scoruri."""
+    metrics.count("evaluator_calls")
+    metrics.count("hands_evaluated", len(hands))
+    board_i = cards_to_ints(board5)
+    scores = rank_holes(board_i, [cards_to_ints(h) for h in hands])
+    best = max(scores)
+    winners = [i for i, s in enumerate(scores) if s == best]
+    combos = []
+    for i in winners:
+        cards7 = hands[i] + board5
+        ints = cards_to_ints(cards7)
+        combos.append([cards7[ints.index(c)] for c in best_five(ints, best)])
+    return winners, scores, combos
@@ -0,0 +1,116 @@
+# ===== Equity pe Flop / Turn =====
+# Pe flop (3 cărți) și turn (4 cărți) eroul nu știe încă restul board-ului, deci
+# mediem peste toate completările (runout-uri): C(47, 2) pe flop, 46 pe turn.
+# Evaluarea e incrementală: cheile aditive ale board-ului se calculează o dată,
+# apoi fiecare runout și fiecare pereche de adversar doar adaugă cheile lor.
+#   1 adversar  -> enumerare completă (runout × pereche), exact
+#   ≥2 adversari -> Monte Carlo: runout + mâinile adversarilor din aceeași extragere
+
+import numpy as np
+
+from . import metrics
+from .cards import cards_to_ints
+from .batch import card_keys, rank_keys, pair_indices
+from .montecarlo import MC_CHUNK, deal_cards
+
+
+def _unseen(known):
+    used = set(known)
+    return np.array([c for c in range(52) if c not in used], dtype=np.intp)
+
+
+def _runouts(n, need):
+    """Toate completările board-ului: indici în cărțile nevăzute, formă (R, need)."""
+    if need == 0:
+        return np.zeros((1, 0), dtype=np.intp)
+    if need == 1:
+        return np.arange(n, dtype=np.intp)[:, None]
+    ia, ib = pair_indices(n)
+    return np.stack([ia, ib], axis=1)
+
+
+def _result(win, tie, lose, share, total, exact):
+    return {
+        "p_win": win / total,
+        "p_tieonly": tie / total,
+        "p_beats": lose / total,
+        "equity": share / total,
+        "samples": int(total),
+        "exact": exact,
+    }
+
+
+def headsup_equity(hero_hole, board):
+    """Erou vs. 1 adversar, enumerare completă a runout-urilor și a perechilor adversarului."""
+    hero_i, board_i = cards_to_ints(hero_hole), cards_to_ints(board)
+    unseen = _unseen(hero_i + board_i)
+    n = len(unseen)
+    runs = _runouts(n, 5 - len(board_i))
+
+    b_rk, b_sk, b_bits = card_keys(board_i)
+    h_rk, h_sk, h_bits = card_keys(hero_i)
+    r_rk, r_sk, r_bits = card_keys(unseen[runs])
+    # board complet pentru fiecare runout (refolosit de erou și de toți adversarii)
+    f_rk, f_sk, f_bits = b_rk + r_rk, b_sk + r_sk, b_bits + r_bits
+    hero = rank_keys(f_rk + h_rk, f_sk + h_sk, f_bits + h_bits)
+
+    ia, ib = pair_indices(n)
+    p_rk, p_sk, p_bits = card_keys(unseen[np.stack([ia, ib], axis=1)])
+    # perechea adversarului nu poate folosi cărțile runout-ului
+    valid = np.ones((len(runs), len(ia)), dtype=bool)
+    for j in range(runs.shape[1]):
+        col = runs[:, j:j + 1]
+        valid &= (ia[None, :] != col) & (ib[None, :] != col)
+    ri, pi = np.nonzero(valid)
+    opp = rank_keys(f_rk[ri] + p_rk[pi], f_sk[ri] + p_sk[pi], f_bits[ri] + p_bits[pi])
+
+    h = hero[ri]
+    win = int(np.count_nonzero(h > opp))
+    tie = int(np.count_nonzero(h == opp))
+    lose = len(opp) - win - tie
+    return _result(win, tie, lose, win + tie / 2, len(opp), True)
+
+
+def multiway_equity(hero_hole, board, k_opps, trials, seed=None):
+    """Erou vs. k_opps adversari: Monte Carlo pe runout + mâinile adversarilor."""
+    hero_i, board_i = cards_to_ints(hero_hole), cards_to_ints(board)
+    unseen = _unseen(hero_i + board_i)
+    need = 5 - len(board_i)
+    rng = np.random.default_rng(seed)
+
+    b_rk, b_sk, b_bits = card_keys(board_i)
+    h_rk, h_sk, h_bits = card_keys(hero_i)
+    win = tie = lose = 0
+    share = 0.0
+    done = 0
+    while done < trials:
+        t = min(MC_CHUNK, trials - done)
+        deal = unseen[deal_cards(rng, t, len(unseen), need + 2 * k_opps)]
+        r_rk, r_sk, r_bits = card_keys(deal[:, :need])
+        f_rk, f_sk, f_bits = b_rk + r_rk, b_sk + r_sk, b_bits + r_bits
+        hero = rank_keys(f_rk + h_rk, f_sk + h_sk, f_bits + h_bits)
+        o_rk, o_sk, o_bits = card_keys(deal[:, need:].reshape(t, k_opps, 2))
+        opp = rank_keys(f_rk[:, None] + o_rk, f_sk[:, None] + o_sk, f_bits[:, None] + o_bits)
+
+        beaten = (opp > hero[:, None]).any(axis=1)
+        n_tie = np.count_nonzero(opp == hero[:, None], axis=1)
+        lose += int(np.count_nonzero(beaten))
+        tie += int(np.count_nonzero(~beaten & (n_tie > 0)))
+        win += int(np.count_nonzero(~beaten & (n_tie == 0)))
+        share += float((1.0 / (1 + n_tie[~beaten])).sum())
+        done += t
+    return _result(win, tie, lose, share, max(done, 1), False)
+
+
+def street_equity(hero_hole, board, total_players, trials=20_000, seed=None):
+    """Equity pe flop / turn / river pentru erou vs. (total_players - 1) adversari."""
+    k_opps = max(0, int(total_players) - 1)
+    if k_opps == 0:
+        return _result(1, 0, 0, 1.0, 1, True)
+    with metrics.timer("street_equity") as t:
+        if k_opps == 1:
+            res = headsup_equity(hero_hole, board)
+        else:
+            res = multiway_equity(hero_hole, board, k_opps, int(trials), seed)
+        t.units = res["samples"]
+    return res
@@ -0,0 +1,229 @@
+# ===== Evaluator pe tabele (5–7 cărți, o singură trecere) =====
+# Scorul este un singur întreg comparabil:
+#   (categorie << 20) | v1 << 16 | v2 << 12 | v3 << 8 | v4 << 4 | v5
+# cu aceeași schemă de categorii ca evaluate_5
+# (8=SF,7=Four,6=Full,5=Flush,4=Straight,3=Trips,2=TwoPair,1=Pair,0=High)
+# și aceleași valori (2..14) în ordinea în care apar în tuple-ul clasic.
+# score_tuple() reface tuple-ul folosit de describe_score / format_hero_score.
+
+from functools import lru_cache
+from itertools import combinations
+
+CAT_SHIFT = 20
+
+HAND_NAMES = {
+    8: "Chintă de culoare (Straight Flush)",
+    7: "Careu (Four of a Kind)",
+    6: "Full (Full House)",
+    5: "Culoare (Flush)",
+    4: "Chintă (Straight)",
+    3: "Trei de un fel / Trips (Three of a Kind)",
+    2: "Două perechi (Two Pair)",
+    1: "O pereche (One Pair)",
+    0: "Carte mare (High Card)",
+}
+
+# cheie aditivă pe ranguri: 3 biți / rang (max 4 cărți de același rang)
+RKEY = [1 << (3 * (c >> 2)) for c in range(52)]
+# cheie aditivă pe culori: 3 biți / culoare (max 7 cărți)
+SKEY = [1 << (3 * (c & 3)) for c in range(52)]
+RBIT = [1 << (c >> 2) for c in range(52)]
+
+
+def _pack(cat, vals):
+    score = cat
+    for i in range(5):
+        score = (score << 4) | (vals[i] if i < len(vals) else 0)
+    return score
+
+
+def _straight_top(mask):
+    """Cea mai mare chintă din masca de 13 biți (bitul r = valoarea r+2); 0 dacă nu există."""
+    for top in range(12, 3, -1):
+        window = 0b11111 << (top - 4)
+        if mask & window == window:
+            return top + 2
+    if mask & 0b1000000001111 == 0b1000000001111:  # 5–A (wheel)
+        return 5
+    return 0
+
+
+def _mask_vals(mask):
+    return [r + 2 for r in range(12, -1, -1) if mask >> r & 1]
+
+
+def _build_flush_table():
+    table = [0] * 8192
+    for mask in range(8192):
+        if bin(mask).count("1") < 5:
+            continue
+        top = _straight_top(mask)
+        if top:
+            table[mask] = _pack(8, [top])
+        else:
+            table[mask] = _pack(5, _mask_vals(mask)[:5])
+    return table
+
+
+def _score_counts(counts):
+    """Cel mai bun scor fără culoare pentru un multiset de ranguri (counts[r], r = 0..12)."""
+    desc = range(12, -1, -1)
+    quads = [r + 2 for r in desc if counts[r] == 4]
+    trips = [r + 2 for r in desc if counts[r] == 3]
+    pairs = [r + 2 for r in desc if counts[r] == 2]
+    present = [r + 2 for r in desc if counts[r] > 0]
+
+    if quads:
+        four = quads[0]
+        kicker = max([v for v in present if v != four], default=0)
+        return _pack(7, [four, kicker])
+
+    if trips and (len(trips) >= 2 or pairs):
+        pair = max(trips[1:] + pairs)
+        return _pack(6, [trips[0], pair])
+
+    mask = 0
+    for r in range(13):
+        if counts[r]:
+            mask |= 1 << r
+    top = _straight_top(mask)
+    if top:
+        return _pack(4, [top])
+
+    if trips:
+        kickers = [v for v in present if v != trips[0]][:2]
+        return _pack(3, [trips[0]] + kickers)
+
+    if len(pairs) >= 2:
+        top2 = pairs[:2]
+        kicker = [v for v in present if v not in top2][0]
+        return _pack(2, top2 + [kicker])
+
+    if pairs:
+        kickers = [v for v in present if v != pairs[0]][:3]
+        return _pack(1, [pairs[0]] + kickers)
+
+    return _pack(0, present[:5])
+
+
+def _build_rank_table():
+    """Toate multiseturile de 5–7 ranguri (max 4 / rang) -> scor fără culoare."""
+    table = {}
+    counts = [0] * 13
+
+    def rec(r, left, key):
+        if r == 13:
+            if 7 - left >= 5:
+                table[key] = _score_counts(counts)
+            return
+        for n in range(min(4, left) + 1):
+            counts[r] = n
+            rec(r + 1, left - n, key + (n << (3 * r)))
+        counts[r] = 0
+
+    rec(0, 7, 0)
+    return table
+
+
+def _build_flush_suit_table():
+    table = [-1] * 4096
+    for key in range(4096):
+        for s in range(4):
+            if (key >> (3 * s)) & 7 >= 5:
+                table[key] = s
+    return table
+
+
+FLUSH_TABLE = _build_flush_table()
+RANK_TABLE = _build_rank_table()
+FLUSH_SUIT = _build_flush_suit_table()
+
+
+def rank_cards(cards) -> int:
+    """Scorul întreg pentru 5–7 cărți codate ca întregi (vezi cards.py)."""
+    rk = sk = 0
+    for c in cards:
+        rk += RKEY[c]
+        sk += SKEY[c]
+    fs = FLUSH_SUIT[sk]
+    if fs < 0:
+        return RANK_TABLE[rk]
+    m = 0
+    for c in cards:
+        if c & 3 == fs:
+            m |= RBIT[c]
+    return FLUSH_TABLE[m]
+
+
+def rank_holes(board, holes) -> list:
+    """Scorurile board + fiecare pereche din `holes` (cărți întregi). Cheile board-ului se
+    adună o singură dată; fiecare loc mai adaugă doar cele 2 cărți ale lui."""
+    brk = bsk = 0
+    for c in board:
+        brk += RKEY[c]
+        bsk += SKEY[c]
+    out = []
+    for a, b in holes:
+        fs = FLUSH_SUIT[bsk + SKEY[a] + SKEY[b]]
+        if fs < 0:
+            out.append(RANK_TABLE[brk + RKEY[a] + RKEY[b]])
+            continue
+        m = 0
+        for c in (*board, a, b):
+            if c & 3 == fs:
+                m |= RBIT[c]
+        out.append(FLUSH_TABLE[m])
+    return out
+
+
+def hand_category(score: int) -> int:
+    return score >> CAT_SHIFT
+
+
+def score_tuple(score: int) -> tuple:
+    """Adaptor: scor întreg -> tuple-ul clasic al lui evaluate_5."""
+    cat = score >> CAT_SHIFT
+    v = [(score >> (16 - 4 * i)) & 15 for i in range(5)]
+    if cat in (8, 4):
+        return (cat, v[0])
+    if cat in (7, 6):
+        return (cat, v[0], v[1])
+    if cat in (5, 0):
+        return (cat, v)
+    if cat == 3:
+        return (cat, v[0], v[1:3])
+    if cat == 2:
+        return (cat, v[0:2], v[2])
+    return (cat, v[0], v[1:4])
+
+
+@lru_cache(maxsize=None)
+def _five_subsets(n):
+    """[(indicii celor 5 cărți, indicii celor lăsate afară, completați cu n)], în ordinea
+    combinations; indicele n arată spre o cheie 0, deci scăderea e mereu a două chei."""
+    out = []
+    for combo in combinations(range(n), 5):
+        left = [i for i in range(n) if i not in combo] + [n, n]
+        out.append((combo, left[0], left[1]))
+    return out
+
+
+def best_five(cards, score=None):
+    """Prima combinație de 5 cărți (în ordinea combinations) care atinge scorul maxim."""
+    cards = list(cards)
+    if score is None:
+        score = rank_cards(cards)
+    if score >> CAT_SHIFT in (5, 8):
+        for combo in combinations(cards, 5):
+            if rank_cards(combo) == score:
+                return list(combo)
+    else:
+        # sub Culoare nicio submulțime nu e culoare: ajunge cheia pe ranguri, din care
+        # se scad cele (cel mult două) cărți lăsate afară
+        keys = [RKEY[c] for c in cards] + [0]
+        rk = sum(keys)
+        get = RANK_TABLE.get
+        for combo, a, b in _five_subsets(len(cards)):
+            if get(rk - keys[a] - keys[b]) == score:
+                return [cards[i] for i in combo]
+    return cards[:5]
@@ -0,0 +1,275 @@
+# ===== Probabilități exacte cu k adversari pe River =====
+# Adversarii primesc k perechi disjuncte, uniform, din cele n cărți rămase.
+#   P(nimeni nu bate) = m_k(A) / m_k(K_n),  A = perechile care NU bat eroul
+#   P(toți pierd)     = m_k(L) / m_k(K_n),  L = perechile care pierd
+# unde m_k(G) = numărul de cuplaje cu k muchii din graful G (cărți = noduri).
+# Cărțile cu aceeași „vecinătate” în G sunt interschimbabile (gemeni), așa că
+# numărăm pe vectori de efective pe clase în loc de măști de 2^45 cărți.
+# Costul crește repede cu numărul de clase și de adversari (board-urile cu flush ajung la
+# sute de ms), deci exact_multiway are un buget de stări: peste el întoarce None, iar
+# river_stats trece pe Monte Carlo, care e atunci mai ieftin.
+
+import threading
+from collections import OrderedDict
+from math import comb, log2, prod
+
+import numpy as np
+
+from .montecarlo import LOSE, BEAT
+
+EXACT_STATES = 1000   # bugetul implicit din river_stats (~15 ms; Monte Carlo cu 20.000 de runde ~30 ms)
+EXACT_SPACE = 26      # log2 Π(efectiv + 1) pe clase: peste, cu ≥ 3 adversari bugetul nu ajunge
+BOARD_CACHE = 64      # board-uri (matrici de rezultate) ținute în _boards
+
+_lock = threading.Lock()
+_boards = OrderedDict()  # matricea (bytes) -> {"polys": (m_A, m_L) sau None, "over": {(k, buget)}}
+
+
+class _OverBudget(Exception):
+    pass
+
+
+def complete_matchings(n, k):
+    """m_k(K_n) = C(n, 2k) · (2k-1)!!"""
+    if k < 0 or 2 * k > n:
+        return 0
+    return comb(n, 2 * k) * prod(range(1, 2 * k, 2))
+
+
+def twin_classes(adj):
+    """Grupează nodurile x, y cu adj[x][z] == adj[y][z] pentru orice z ∉ {x, y}."""
+    n = len(adj)
+    reps, members = [], []
+    for x in range(n):
+        for ci, r in enumerate(reps):
+            if all(adj[x][z] == adj[r][z] for z in range(n) if z != x and z != r):
+                members[ci].append(x)
+                break
+        else:
+            reps.append(x)
+            members.append([x])
+    return members
+
+
+def _low(m):
+    return (m & -m).bit_length() - 1
+
+
+class ClassGraph:
+    """Graf „umflat”: c clase de noduri gemene, cu adiacența între clase (cadj)
+    și în interiorul clasei (within). poly(counts, kmax) numără cuplajele pentru
+    orice vector de efective; memo-ul e comun tuturor apelurilor.
+    limit: numărul maxim de stări din memo; peste el rec() aruncă _OverBudget."""
+
+    def __init__(self, cadj, within, limit=None):
+        c = len(within)
+        self.c = c
+        # bitul a din nbr[a] = muchii în interiorul clasei a
+        self.nbr = [sum(1 << b for b in range(c) if (cadj[a][b] if b != a else within[a]))
+                    for a in range(c)]
+        self.memo = {}
+        self.limit = limit
+
+    # rec(counts, budget) -> (m_0 .. m_budget); bugetul taie tot ce ar depăși kmax muchii.
+    # Pivotul v (o carte din clasa aleasă) e fie necuplat, fie cuplat cu un vecin u:
+    #   Σ_{u ∈ N(v)} m_j(G-v-u) = (|V|-1-2j)·m_j(G-v) − Σ_{u ∉ N(v)} m_j(G-v-u)
+    # așa că ramificăm pe partea mai mică (clase vecine sau ne-vecine).
+    def rec(self, counts, budget):
+        if budget == 0:
+            return (1,)
+        key = counts + (budget,)
+        hit = self.memo.get(key)
+        if hit is not None:
+            return hit
+        if self.limit is not None and len(self.memo) >= self.limit:
+            raise _OverBudget
+        nbr = self.nbr
+        alive = size = 0
+        for a, n in enumerate(counts):
+            if n:
+                alive |= 1 << a
+                size += n
+        # clasele fără niciun vecin rămas nu pot fi cuplate: le scoatem din calcul
+        trimmed = tuple(
+            0 if n and not (nbr[a] & alive & ~(1 << a) or (nbr[a] >> a & 1 and n > 1)) else n
+            for a, n in enumerate(counts))
+        if trimmed != counts:
+            res = self.rec(trimmed, budget)
+            self.memo[key] = res
+            return res
+        if not alive:
+            return (1,)
+
+        best = None
+        for a, n in enumerate(counts):
+            if not n:
+                continue
+            bit = 1 << a
+            self_edge = n > 1 and nbr[a] & bit
+            near = (nbr[a] & alive & ~bit).bit_count() + (1 if self_edge else 0)
+            far = (alive & ~nbr[a] & ~bit).bit_count() + (1 if n > 1 and not self_edge else 0)
+            if best is None or min(near, far) < best[0]:
+                best = (min(near, far), a, near <= far)
+        _, a, use_near = best
+        n = counts[a]
+
+        without_v = counts[:a] + (n - 1,) + counts[a + 1:]
+        base = self.rec(without_v, budget)
+        res = list(base) + [0] * (budget + 1 - len(base))
+        if use_near:
+            mask, sign = alive & nbr[a], 1
+        else:
+            for j in range(min(budget, len(base))):
+                res[j + 1] += (size - 1 - 2 * j) * base[j]
+            mask, sign = alive & ~nbr[a], -1
+        while mask:
+            b = (mask & -mask).bit_length() - 1
+            mask &= mask - 1
+            mult = n - 1 if b == a else counts[b]
+            if not mult:
+                continue
+            sub = self.rec(without_v[:b] + (without_v[b] - 1,) + without_v[b + 1:], budget - 1)
+            for j, v in enumerate(sub):
+                res[j + 1] += sign * mult * v
+        res = tuple(res)
+        self.memo[key] = res
+        return res
+
+    def poly(self, counts, kmax):
+        res = self.rec(tuple(counts), kmax)
+        return (list(res) + [0] * (kmax + 1))[:kmax + 1]
+
+
+def matching_poly(adj, kmax):
+    """[m_0, m_1, ..., m_kmax] pentru graful cu matricea de adiacență adj (bool, n × n)."""
+    classes = twin_classes(adj)
+    cadj = [[adj[a[0]][b[0]] for b in classes] for a in classes]
+    within = [len(m) > 1 and adj[m[0]][m[1]] for m in classes]
+    return ClassGraph(cadj, within).poly([len(m) for m in classes], kmax)
+
+
+def _rank_split_count(adj, k, labels, special):
+    """m_k(adj) când graful depinde doar de rang (labels), cu excepția perechilor în care
+    ambele cărți sunt „speciale” (culoarea de flush). Atunci
+        m_k(G) = Σ_T haf_d(T) · m_{k-|T|/2}(R − T),   T ⊆ speciale,
+    cu R graful pe ranguri și d = G − R pe perechile speciale. None dacă nu se aplică."""
+    n = len(adj)
+    labs = sorted(set(labels))
+    li = [labs.index(l) for l in labels]
+    L = len(labs)
+    R = [[None] * L for _ in range(L)]
+    for x in range(n):
+        for y in range(x + 1, n):
+            if special[x] and special[y]:
+                continue
+            a, b = li[x], li[y]
+            if R[a][b] is None:
+                R[a][b] = R[b][a] = adj[x][y]
+            elif R[a][b] != adj[x][y]:
+                return None
+    R = [[bool(v) for v in row] for row in R]
+    graph = ClassGraph(R, [R[a][a] for a in range(L)])
+    counts = [0] * L
+    for a in li:
+        counts[a] += 1
+
+    F = [x for x in range(n) if special[x]]
+    # haf_d pe submulțimi de cărți speciale (bitul i = F[i])
+    haf = {0: 1}
+    for mask in range(1, 1 << len(F)):
+        size = bin(mask).count("1")
+        if size % 2 or size // 2 > k:
+            continue
+        i = _low(mask)
+        rest = mask & ~(1 << i)
+        total = 0
+        r = rest
+        while r:
+            j = _low(r)
+            r &= r - 1
+            d = int(adj[F[i]][F[j]]) - int(R[li[F[i]]][li[F[j]]])
+            if d:
+                total += d * haf.get(rest & ~(1 << j), 0)
+        if total:
+            haf[mask] = total
+
+    result = 0
+    for mask, w in haf.items():
+        j = bin(mask).count("1") // 2
+        cnt = list(counts)
+        for i, x in enumerate(F):
+            if mask >> i & 1:
+                cnt[li[x]] -= 1
+        result += w * graph.poly(cnt, k - j)[k - j]
+    return result
+
+
+def count_matchings(adj, k, labels=None, special=None):
+    """m_k(adj); cu labels/special încearcă întâi numărarea pe ranguri (_rank_split_count)."""
+    if labels is not None and special is not None and sum(special) <= 16:
+        res = _rank_split_count(adj, k, labels, special)
+        if res is not None:
+            return res
+    return matching_poly(adj, k)[k]
+
+
+def clear_exact_cache():
+    with _lock:
+        _boards.clear()
+
+
+def _river_polys(rows, k, max_states):
+    """([m_0 .. m_k] pentru „nu bate”, la fel pentru „pierde”). Gemenii se caută o singură
+    dată, pe matricea cu trei valori: două cărți gemene acolo sunt gemene în ambele grafuri,
+    deci cele două numărări folosesc aceleași clase și împart bugetul de stări.
+    Cu buget, board-urile cu prea multe clase (EXACT_SPACE) nu se mai încearcă deloc."""
+    classes = twin_classes(rows)
+    sizes = [len(m) for m in classes]
+    if max_states is not None and k > 2 and sum(log2(c + 1) for c in sizes) > EXACT_SPACE:
+        raise _OverBudget
+    left = max_states
+    polys = []
+    for edge in (lambda v: v != BEAT, lambda v: v == LOSE):
+        cadj = [[edge(rows[a[0]][b[0]]) for b in classes] for a in classes]
+        within = [len(m) > 1 and edge(rows[m[0]][m[1]]) for m in classes]
+        graph = ClassGraph(cadj, within, left)
+        polys.append(graph.poly(sizes, k))
+        if left is not None:
+            left -= len(graph.memo)
+    return tuple(polys)
+
+
+def exact_multiway(mat, k_opps, max_states=None):
+    """(P(≥1 adversar bate eroul), P(egal și nimeni nu bate)) exacte, din matricea n × n.
+
+    max_states limitează stările numărării (vezi ClassGraph); peste limită întoarce None.
+    Polinoamele numărate (m_0 .. m_k) se păstrează pe board, deci un apel cu mai puțini
+    adversari pe același board nu mai numără nimic."""
+    n = len(mat)
+    total = complete_matchings(n, k_opps)
+    if k_opps <= 0 or total == 0:
+        return 0.0, 0.0
+    key = np.asarray(mat, dtype=np.int8).tobytes()
+    with _lock:
+        entry = _boards.get(key)
+        if entry is None:
+            entry = _boards[key] = {"polys": None, "over": set()}
+            if len(_boards) > BOARD_CACHE:
+                _boards.popitem(last=False)
+        _boards.move_to_end(key)
+        polys = entry["polys"]
+        if (k_opps, max_states) in entry["over"]:
+            return None
+    if polys is None or len(polys[0]) <= k_opps:
+        rows = mat.tolist() if hasattr(mat, "tolist") else mat
+        try:
+            polys = _river_polys(rows, k_opps, max_states)
+        except _OverBudget:
+            with _lock:
+                entry["over"].add((k_opps, max_states))
+            return None
+        with _lock:
+            if entry["polys"] is None or len(entry["polys"][0]) < len(polys[0]):
+                entry["polys"] = polys
+    m_a, m_l = polys[0][k_opps], polys[1][k_opps]
+    return (total - m_a) / total, (m_a - m_l) / total
@@ -0,0 +1,146 @@
+# ===== Istoricul mâinilor (SQLite, doar adăugare) =====
+# Fiecare mână jucată se scrie ca un rând: cărțile, dealerul, eroul, câștigătorii și
+# probabilitatea calculată (p_red), dacă a existat. record() doar pune rândul într-o
+# coadă; un fir de fundal îl scrie în loturi (o tranzacție / lot), deci un click nu
+# așteaptă după disc. Agregatele folosesc indecși care acoperă interogarea, așa că
+# SQLite citește doar indexul, nu tabelul (sub o secundă la un milion de mâini).
+#   hero_pos   = poziția eroului față de dealer (0 = dealer, 1 = small blind, ...)
+#   hero_won   = 0 pierde, 1 câștigă singur, 2 split
+#   p_bucket   = floor(p_red · 10), pentru calibrare (prezis vs. realizat)
+
+import os
+import pathlib
+import queue
+import sqlite3
+import threading
+import time
+
+DEFAULT_PATH = pathlib.Path(__file__).resolve().parent.parent / "hand_history.sqlite"
+BATCH_SIZE = 256
+FLUSH_SECONDS = 0.5
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS hands (
+    id            INTEGER PRIMARY KEY,
+    ts            REAL    NOT NULL,
+    num_players   INTEGER NOT NULL,
+    dealer        INTEGER NOT NULL,
+    hero          INTEGER NOT NULL,
+    hero_pos      INTEGER NOT NULL,
+    hero_hole     TEXT    NOT NULL,
+    board         TEXT    NOT NULL,
+    hands         TEXT    NOT NULL,
+    winners       TEXT    NOT NULL,
+    hero_won      INTEGER NOT NULL,
+    category      INTEGER NOT NULL,
+    hero_category INTEGER NOT NULL,
+    p_red         REAL,
+    p_bucket      INTEGER,
+    seed          INTEGER
+);
+CREATE INDEX IF NOT EXISTS hands_pos ON hands (num_players, hero_pos, hero_won);
+CREATE INDEX IF NOT EXISTS hands_cat ON hands (category, hero_won);
+CREATE INDEX IF NOT EXISTS hands_calib ON hands (p_bucket, hero_won, p_red);
+"""
+
+_COLUMNS = ("ts", "num_players", "dealer", "hero", "hero_pos", "hero_hole", "board", "hands",
+            "winners", "hero_won", "category", "hero_category", "p_red", "p_bucket", "seed")
+_INSERT = f"INSERT INTO hands ({', '.join(_COLUMNS)}) VALUES ({', '.join('?' * len(_COLUMNS))})"
+
+
+def hand_row(hands, board5, dealer, hero, winners, category, hero_category, p_red=None,
+             seed=None, ts=None):
+    """Rândul pentru o mână; dealer / hero sunt 1-based, winners 0-based (ca în aplicație)."""
+    n = len(hands)
+    hero_won = 0 if hero - 1 not in winners else (1 if len(winners) == 1 else 2)
+    return (
+        time.time() if ts is None else ts, n, dealer, hero, (hero - dealer) % n,
+        " ".join(hands[hero - 1]), " ".join(board5), "|".join(" ".join(h) for h in hands),
+        " ".join(str(w + 1) for w in winners), hero_won, category, hero_category,
+        p_red, None if p_red is None else min(9, int(p_red * 10)), seed,
+    )
+
+
+class HandHistory:
+    """Istoricul într-un fișier SQLite; record() nu blochează, scrierile sunt în loturi."""
+
+    def __init__(self, path=None):
+        self.path = str(path or os.environ.get("PKR_HISTORY_DB") or DEFAULT_PATH)
+        with self._connect() as con:
+            con.executescript(_SCHEMA)
+        self._queue = queue.Queue()
+        # rândurile primite și încă nescrise; flush() așteaptă să ajungă la 0
+        self._pending = 0
+        self._done = threading.Condition()
+        self._writer = threading.Thread(target=self._run, name="pkr-history", daemon=True)
+        self._writer.start()
+
+    def _connect(self):
+        con = sqlite3.connect(self.path, timeout=10, check_same_thread=False)
+        con.execute("PRAGMA journal_mode=WAL")
+        con.execute("PRAGMA synchronous=NORMAL")
+        return con
+
+    # ----- scriere -----
+    def record(self, row):
+        with self._done:
+            self._pending += 1
+        self._queue.put(row)
+
+    def record_many(self, rows):
+        """Import direct (sincron), pentru volume mari: o singură tranzacție."""
+        with self._connect() as con:
+            con.executemany(_INSERT, rows)
+
+    def _run(self):
+        con = self._connect()
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + FLUSH_SECONDS
+            while len(batch) < BATCH_SIZE:
+                try:
+                    batch.append(self._queue.get(timeout=max(0.0, deadline - time.monotonic())))
+                except queue.Empty:
+                    break
+            try:
+                with con:
+                    con.executemany(_INSERT, batch)
+            except sqlite3.Error:
+                pass  # istoricul nu are voie să oprească jocul
+            with self._done:
+                self._pending -= len(batch)
+                self._done.notify_all()
+
+    def flush(self, timeout=5.0):
+        """Așteaptă până se scriu rândurile din coadă."""
+        with self._done:
+            return self._done.wait_for(lambda: self._pending == 0, timeout)
+
+    # ----- interogări -----
+    def _query(self, sql, args=()):
+        with self._connect() as con:
+            return con.execute(sql, args).fetchall()
+
+    def count(self):
+        return self._query("SELECT COUNT(*) FROM hands")[0][0]
+
+    def win_rate_by_position(self, num_players=None):
+        """[(num_players, hero_pos, mâini, câștiguri, split-uri)], în ordinea indexului
+        hands_pos (poziția are sens doar împreună cu numărul de jucători)."""
+        where, args = ("WHERE num_players = ?", (num_players,)) if num_players else ("", ())
+        return self._query(
+            f"SELECT num_players, hero_pos, COUNT(*), SUM(hero_won = 1), SUM(hero_won = 2) "
+            f"FROM hands {where} GROUP BY num_players, hero_pos ORDER BY num_players, hero_pos",
+            args)
+
+    def category_frequencies(self):
+        """[(categoria mâinii câștigătoare, mâini, din care câștigate / split de erou)]."""
+        return self._query(
+            "SELECT category, COUNT(*), SUM(hero_won > 0) FROM hands "
+            "GROUP BY category ORDER BY category DESC")
+
+    def calibration(self):
+        """[(p_bucket, mâini, p_red mediu, frecvența reală „≥1 adversar te bate”)]."""
+        return self._query(
+            "SELECT p_bucket, COUNT(*), AVG(p_red), AVG(hero_won = 0) FROM hands "
+            "WHERE p_bucket IS NOT NULL GROUP BY p_bucket ORDER BY p_bucket")
@@ -0,0 +1,201 @@
+# ===== Instrumentare: timere pe etape, contoare, rate de hit =====
+# Dezactivată implicit. Cât e oprită, timer() întoarce un obiect gol comun și count()
+# iese la prima verificare, deci costul pe un apel instrumentat e un test de flag.
+# Măsurătorile sunt pe proces (comune tuturor sesiunilor, ca și cache-ul):
+#   with metrics.timer("exact_multiway"): ...
+#   with metrics.timer("monte_carlo") as t: ...; t.units = runde
+#   metrics.count("hands_evaluated", n)
+# Export: to_json() pentru dashboard-uri, to_prometheus() în formatul text Prometheus.
+# Procesele din planificator își trimit măsurătorile înapoi (export / merge).
+# Cine pornește colectarea:
+#   - serverul: PKR_METRICS=1 sau enable() (și procesele din planificator, per job);
+#   - sesiunile: want(sesiune, on); colectarea rămâne pornită cât timp o cere măcar una,
+#     deci o sesiune care închide panoul nu o oprește pentru celelalte. O sesiune care
+#     nu mai dă semn (tab închis) contează doar WANT_TTL secunde după ultima cerere.
+
+import json
+import os
+import threading
+import time
+
+WANT_TTL = 900
+
+_forced = os.environ.get("PKR_METRICS") == "1"
+_enabled = _forced
+_wanted = {}    # sesiune -> time.monotonic() la ultima cerere
+_lock = threading.Lock()
+_stages = {}    # etapă -> [apeluri, total_s, max_s, unități]
+_counters = {}  # nume -> valoare
+
+
+def _update():
+    global _enabled
+    _enabled = _forced or bool(_wanted)
+
+
+def enable(on=True):
+    """Pornirea / oprirea la nivel de server (independentă de cererile sesiunilor)."""
+    global _forced
+    with _lock:
+        _forced = bool(on)
+        _update()
+
+
+def want(session, on=True):
+    """Sesiunea cere (on=True, la fiecare rerun) sau nu mai cere colectarea."""
+    now = time.monotonic()
+    with _lock:
+        if on:
+            _wanted[session] = now
+        else:
+            _wanted.pop(session, None)
+        for k in [k for k, t in _wanted.items() if now - t > WANT_TTL]:
+            del _wanted[k]
+        _update()
+
+
+def enabled():
+    return _enabled
+
+
+def record(stage, seconds, units=0):
+    """Adaugă o măsurătoare pentru `stage` (secunde, unități prelucrate: mâini, runde)."""
+    if not _enabled:
+        return
+    with _lock:
+        st = _stages.get(stage)
+        if st is None:
+            st = _stages[stage] = [0, 0.0, 0.0, 0]
+        st[0] += 1
+        st[1] += seconds
+        st[2] = max(st[2], seconds)
+        st[3] += units
+
+
+class _Timer:
+    __slots__ = ("stage", "units", "t0")
+
+    def __init__(self, stage, units):
+        self.stage, self.units = stage, units
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        record(self.stage, time.perf_counter() - self.t0, self.units)
+        return False
+
+
+class _NoTimer:
+    __slots__ = ()
+    units = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def __setattr__(self, name, value):
+        pass
+
+
+_NO_TIMER = _NoTimer()
+
+
+def timer(stage, units=0):
+    return _Timer(stage, units) if _enabled else _NO_TIMER
+
+
+def count(name, n=1):
+    if not _enabled:
+        return
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + n
+
+
+def reset():
+    with _lock:
+        _stages.clear()
+        _counters.clear()
+
+
+def export():
+    """Măsurătorile brute, pentru merge() în alt proces (ex. un job din planificator)."""
+    with _lock:
+        return {"stages": {k: list(v) for k, v in _stages.items()}, "counters": dict(_counters)}
+
+
+def merge(delta):
+    """Adună măsurătorile din export() (alt proces) peste cele locale."""
+    if not _enabled or not delta:
+        return
+    with _lock:
+        for name, (n, tot, mx, units) in delta["stages"].items():
+            st = _stages.get(name)
+            if st is None:
+                st = _stages[name] = [0, 0.0, 0.0, 0]
+            st[0] += n
+            st[1] += tot
+            st[2] = max(st[2], mx)
+            st[3] += units
+        for name, v in delta["counters"].items():
+            _counters[name] = _counters.get(name, 0) + v
+
+
+def snapshot(caches=None):
+    """{"stages", "counters", "caches"}; caches = {nume: {"hits", "misses"}} suplimentare
+    (cache-ul statisticilor de River se adaugă automat)."""
+    from .cache import cache_stats
+
+    with _lock:
+        stages = {
+            name: {
+                "calls": n, "total_ms": tot * 1e3, "mean_ms": tot * 1e3 / n, "max_ms": mx * 1e3,
+                "units": units, "units_per_s": units / tot if units and tot > 0 else None,
+            }
+            for name, (n, tot, mx, units) in _stages.items()
+        }
+        counters = dict(_counters)
+    cs = cache_stats()
+    all_caches = {"river_stats": {"hits": cs["hits"] + cs["disk_hits"], "misses": cs["misses"]}}
+    all_caches.update(caches or {})
+    for c in all_caches.values():
+        total = c["hits"] + c["misses"]
+        c["hit_rate"] = c["hits"] / total if total else None
+    return {"enabled": _enabled, "stages": stages, "counters": counters, "caches": all_caches}
+
+
+def to_json(snap=None):
+    return json.dumps(snap or snapshot(), indent=2, sort_keys=True)
+
+
+def to_prometheus(snap=None, prefix="pkr"):
+    """Formatul text Prometheus (exposition format 0.0.4)."""
+    snap = snap or snapshot()
+    lines = []
+
+    def metric(name, kind, helptext, samples):
+        lines.append(f"# HELP {prefix}_{name} {helptext}")
+        lines.append(f"# TYPE {prefix}_{name} {kind}")
+        for labels, value in samples:
+            lines.append(f"{prefix}_{name}{{{labels}}} {value:g}")
+
+    st = snap["stages"]
+    metric("stage_calls_total", "counter", "Apeluri pe etapă.",
+           [(f'stage="{k}"', v["calls"]) for k, v in sorted(st.items())])
+    metric("stage_seconds_total", "counter", "Timp total pe etapă.",
+           [(f'stage="{k}"', v["total_ms"] / 1e3) for k, v in sorted(st.items())])
+    metric("stage_max_seconds", "gauge", "Cel mai lung apel pe etapă.",
+           [(f'stage="{k}"', v["max_ms"] / 1e3) for k, v in sorted(st.items())])
+    metric("stage_units_total", "counter", "Mâini / runde prelucrate pe etapă.",
+           [(f'stage="{k}"', v["units"]) for k, v in sorted(st.items())])
+    metric("events_total", "counter", "Contoare de evenimente.",
+           [(f'name="{k}"', v) for k, v in sorted(snap["counters"].items())])
+    ca = snap["caches"]
+    metric("cache_hits_total", "counter", "Hit-uri pe cache.",
+           [(f'cache="{k}"', v["hits"]) for k, v in sorted(ca.items())])
+    metric("cache_misses_total", "counter", "Miss-uri pe cache.",
+           [(f'cache="{k}"', v["misses"]) for k, v in sorted(ca.items())])
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,268 @@
+# ===== Monte Carlo pe matricea de rezultate =====
+# Un adversar cu perechea (a, b) nu se mai evaluează: rezultatul lui față de erou
+# se citește din matricea n × n construită o singură dată (stats.outcome_matrix).
+# Cu un range de adversar, perechile se extrag ponderat din tabele alias (ranges.py),
+# iar conflictele de cărți între adversari se verifică pe măști de 52 de biți.
+
+import time
+from math import sqrt
+
+import numpy as np
+
+from .ranges import alias_draw
+
+LOSE, TIE, BEAT = 0, 1, 2
+
+MC_CHUNK = 20_000  # runde / bloc, ca să nu alocăm T × 45 dintr-odată
+Z95 = 1.959964     # cuantila normală pentru un interval de încredere de 95%
+ADAPTIVE_FIRST = 500
+ADAPTIVE_MAX = 5_000_000
+REDRAW_ROUNDS = 200  # reextrageri maxime / adversar înainte să declarăm range-ul prea îngust
+
+
+def deal_opponents(rng, trials, n, k_opps):
+    """trials × (2·k_opps) indici distincți din range(n), în ordine aleatoare (fără înlocuire)."""
+    return deal_cards(rng, trials, n, 2 * k_opps)
+
+
+def deal_cards(rng, trials, n, need):
+    """trials × need indici distincți din range(n), în ordine aleatoare (fără înlocuire)."""
+    keys = rng.random((trials, n))
+    if need < n:
+        idx = np.argpartition(keys, need - 1, axis=1)[:, :need]
+    else:
+        idx = np.broadcast_to(np.arange(n), (trials, n))
+    order = np.argsort(np.take_along_axis(keys, idx, axis=1), axis=1)
+    return np.take_along_axis(idx, order, axis=1)
+
+
+def mc_counts(mat, k_opps, trials, rng):
+    """Numără rundele în care ≥1 adversar bate eroul (hits) și cele doar cu egal (ties)."""
+    n = mat.shape[0]
+    hits = ties = 0
+    done = 0
+    while done < trials:
+        t = min(MC_CHUNK, trials - done)
+        deal = deal_opponents(rng, t, n, k_opps)
+        best = mat[deal[:, 0::2], deal[:, 1::2]].max(axis=1)
+        hits += int(np.count_nonzero(best == BEAT))
+        ties += int(np.count_nonzero(best == TIE))
+        done += t
+    return hits, ties
+
+
+def mc_counts_range(outcome, masks, prob, alias, k_opps, trials, rng):
+    """Ca mc_counts, dar fiecare adversar primește o pereche extrasă ponderat din range
+    (tabelul alias prob/alias peste perechi). O pereche care se suprapune cu cărțile
+    adversarilor de dinainte se reextrage (doar pentru rundele afectate)."""
+    hits = ties = 0
+    done = 0
+    while done < trials:
+        t = min(MC_CHUNK, trials - done)
+        used = np.zeros(t, dtype=np.uint64)
+        best = np.zeros(t, dtype=np.int8)
+        for _ in range(k_opps):
+            idx = alias_draw(rng, prob, alias, t)
+            bad = np.flatnonzero(masks[idx] & used)
+            rounds = 0
+            while len(bad):
+                rounds += 1
+                if rounds > REDRAW_ROUNDS:
+                    raise ValueError("range-ul e prea îngust pentru atâția adversari")
+                idx[bad] = alias_draw(rng, prob, alias, len(bad))
+                bad = bad[(masks[idx[bad]] & used[bad]) != 0]
+            used |= masks[idx]
+            np.maximum(best, outcome[idx], out=best)
+        hits += int(np.count_nonzero(best == BEAT))
+        ties += int(np.count_nonzero(best == TIE))
+        done += t
+    return hits, ties
+
+
+def wilson_ci(k, n, z=Z95):
+    """Intervalul Wilson pentru o proporție k / n; rămâne util și când k = 0 sau k = n."""
+    if n <= 0:
+        return 0.0, 1.0
+    p = k / n
+    den = 1 + z * z / n
+    mid = (p + z * z / (2 * n)) / den
+    half = z * sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / den
+    return max(0.0, mid - half), min(1.0, mid + half)
+
+
+def mc_adaptive(mat, k_opps, rng, target, time_budget, progress=None, max_trials=ADAPTIVE_MAX,
+                counts=None):
+    """Monte Carlo în loturi până când IC 95% pentru P(≥1 bate) are semi-lățimea ≤ target
+    sau până expiră time_budget (secunde). Loturile se dublează, de la ADAPTIVE_FIRST.
+
+    progress(hits, ties, n, lo, hi) se apelează după fiecare lot. Întoarce (hits, ties, n).
+    counts(t, rng) -> (hits, ties) înlocuiește mc_counts (ex. mc_counts_range cu un range)."""
+    if counts is None:
+        counts = lambda t, r: mc_counts(mat, k_opps, t, r)
+    hits = ties = n = 0
+    batch = ADAPTIVE_FIRST
+    start = time.perf_counter()
+    while n < max_trials:
+        t = min(batch, max_trials - n)
+        h, tt = counts(t, rng)
+        hits, ties, n = hits + h, ties + tt, n + t
+        lo, hi = wilson_ci(hits, n)
+        if progress is not None:
+            progress(hits, ties, n, lo, hi)
+        if (hi - lo) / 2 <= target or time.perf_counter() - start >= time_budget:
+            break
+        batch = min(2 * batch, MC_CHUNK)
+    return hits, ties, n
+
+
+# ===== Monte Carlo cu reducere de varianță (adversari uniformi) =====
+# Trei tehnici, toate pe matricea de rezultate:
+#   - stratificare după perechea primului adversar: P(bate / egal / pierde) se știe exact
+#     din cele 990 de perechi; stratul „bate” dă 1 fără nicio rundă, celelalte două se
+#     eșantionează proporțional cu ponderea lor;
+#   - ultimul adversar nu se extrage: probabilitatea lui de a bate / egala, dată fiind
+#     mulțimea cărților deja împărțite, se numără exact (incluziune–excludere pe gradele
+#     din mat), deci fiecare rundă dă o probabilitate, nu 0 / 1;
+#   - adversarii din mijloc se împart cu Fisher–Yates parțial (doar cărțile necesare).
+# Estimatorul rămâne nedeplasat; varianța lui se raportează alături de rezultat, ca raport
+# față de MC simplu cu același număr de runde (var_ratio).
+
+
+def deal_partial(rng, first, n, need):
+    """Fisher–Yates parțial pe rânduri: pozițiile 0, 1 sunt perechea `first` (t × 2, a < b),
+    urmează `need` indici distincți din rest -> t × (2 + need)."""
+    t = len(first)
+    perm = np.tile(np.arange(n, dtype=np.int16), (t, 1))
+    rows = np.arange(t)
+    picks = rng.random((need, t)) * (n - np.arange(2, 2 + need))[:, None]
+
+    def swap(i, j):
+        vi = perm[:, i].copy()
+        perm[:, i] = perm[rows, j]
+        perm[rows, j] = vi
+
+    # identitate: cartea c stă pe poziția c; după primul schimb b (> a ≥ 0) e tot pe b
+    swap(0, first[:, 0])
+    swap(1, first[:, 1])
+    for j in range(2, 2 + need):
+        swap(j, j + picks[j - 2].astype(np.intp))
+    return perm[:, :2 + need].astype(np.intp)
+
+
+_BYTE_BITS = np.array([bin(i).count("1") for i in range(256)], dtype=np.int64)
+
+
+def _popcount(x):
+    """Numărul de biți 1 din fiecare element uint64."""
+    if hasattr(np, "bitwise_count"):  # NumPy ≥ 2.0
+        return np.bitwise_count(x).astype(np.int64)
+    return _BYTE_BITS[x[..., None].view(np.uint8)].sum(axis=-1)
+
+
+def _row_bits(mat, o):
+    """Masca de n ≤ 64 biți a cărților j cu mat[i, j] == o, pentru fiecare i."""
+    return ((mat == o).astype(np.uint64) << np.arange(mat.shape[0], dtype=np.uint64)).sum(
+        axis=1, dtype=np.uint64)
+
+
+def _vr_rounds(mat, deg, totals, bits, k_opps, first, rng):
+    """Rundele pentru perechile primului adversar `first` -> (x_beat, x_tie) pe rundă:
+    P(≥1 bate) și P(niciunul nu bate, ≥1 egal), condiționat de cărțile împărțite."""
+    n = mat.shape[0]
+    used = deal_partial(rng, first, n, 2 * (k_opps - 2))
+    best = mat[used[:, 0::2], used[:, 1::2]].max(axis=1)
+    # perechile ultimului adversar = perechile care nu ating nicio carte folosită:
+    # total - perechile care ating U + perechile cu ambele cărți în U
+    mask = np.bitwise_or.reduce(np.uint64(1) << used.astype(np.uint64), axis=1)
+    m = n - used.shape[1]
+    free = m * (m - 1) / 2
+
+    def avoiding(o):
+        inner = _popcount(bits[o][used] & mask[:, None]).sum(axis=1) // 2
+        return (totals[o] - deg[o][used].sum(axis=1) + inner) / free
+
+    cb, ct = avoiding(BEAT), avoiding(TIE)
+    x_beat = np.where(best == BEAT, 1.0, cb)
+    x_tie = np.where(best == BEAT, 0.0, np.where(best == TIE, 1.0 - cb, ct))
+    return x_beat, x_tie
+
+
+def mc_stratified(mat, k_opps, trials, rng, target=None, time_budget=2.0, progress=None,
+                  max_trials=ADAPTIVE_MAX):
+    """P(≥1 adversar bate) și P(doar egal) cu estimatorul stratificat + condiționat.
+
+    Cu target (semi-lățimea IC 95%) rulează adaptiv, ca mc_adaptive, până la precizie sau
+    time_budget secunde; altfel exact `trials` runde. Întoarce un dicționar cu
+    p_beats, p_tieonly, se (eroarea standard a lui p_beats), ci, n și var_ratio
+    (varianța MC simplu cu n runde / varianța obținută; None când aceasta e 0)."""
+    n = mat.shape[0]
+    ia, ib = np.triu_indices(n, 1)
+    oc = mat[ia, ib]
+    P = len(oc)
+    deg = {o: np.count_nonzero(mat == o, axis=1) for o in (BEAT, TIE)}
+    bits = {o: _row_bits(mat, o) for o in (BEAT, TIE)}
+    totals = {o: int(np.count_nonzero(oc == o)) for o in (BEAT, TIE)}
+    p_first = {o: np.count_nonzero(oc == o) / P for o in (BEAT, TIE, LOSE)}
+
+    if k_opps == 1:  # un singur adversar: straturile sunt chiar rezultatul
+        return {"p_beats": p_first[BEAT], "p_tieonly": p_first[TIE], "se": 0.0,
+                "ci": (p_first[BEAT], p_first[BEAT]), "n": 0, "var_ratio": None}
+
+    strata = [(o, np.column_stack((ia, ib))[oc == o], p_first[o]) for o in (TIE, LOSE)]
+    strata = [s for s in strata if s[2] > 0]
+    rest = sum(w for _, _, w in strata)
+    acc = {o: [0, 0.0, 0.0, 0.0] for o, _, _ in strata}  # runde, Σx_beat, Σx_beat², Σx_tie
+
+    def estimate():
+        p, tie, var, done = p_first[BEAT], 0.0, 0.0, 0
+        for o, _, w in strata:
+            k, s, q, st = acc[o]
+            done += k
+            if k == 0:
+                continue
+            mean = s / k
+            p += w * mean
+            tie += w * st / k
+            if k > 1:
+                var += w * w * max(0.0, (q - k * mean * mean) / (k - 1)) / k
+        return p, tie, var, done
+
+    def run(t):
+        for o, pairs, w in strata:
+            left = max(2, round(t * w / rest))
+            while left > 0:
+                c = min(MC_CHUNK, left)
+                first = pairs[rng.integers(0, len(pairs), c)]
+                xb, xt = _vr_rounds(mat, deg, totals, bits, k_opps, first, rng)
+                a = acc[o]
+                a[0] += c
+                a[1] += float(xb.sum())
+                a[2] += float(xb @ xb)
+                a[3] += float(xt.sum())
+                left -= c
+
+    if not strata:  # toate perechile bat eroul
+        return {"p_beats": 1.0, "p_tieonly": 0.0, "se": 0.0, "ci": (1.0, 1.0), "n": 0,
+                "var_ratio": None}
+
+    if target:
+        batch, start = ADAPTIVE_FIRST, time.perf_counter()
+        while True:
+            run(batch)
+            p, tie, var, done = estimate()
+            se = sqrt(var)
+            if progress is not None:
+                progress(p * done, tie * done, done, max(0.0, p - Z95 * se), min(1.0, p + Z95 * se))
+            if (Z95 * se <= target or done >= max_trials
+                    or time.perf_counter() - start >= time_budget):
+                break
+            batch = min(2 * batch, MC_CHUNK)
+    else:
+        run(int(trials))
+        p, tie, var, done = estimate()
+        se = sqrt(var)
+
+    p = min(1.0, max(0.0, p))
+    return {"p_beats": p, "p_tieonly": min(1.0, max(0.0, tie)), "se": se,
+            "ci": (max(0.0, p - Z95 * se), min(1.0, p + Z95 * se)), "n": done,
+            "var_ratio": p * (1 - p) / done / var if var > 0 else None}
@@ -0,0 +1,124 @@
+# ===== Outs pe Flop / Turn (evaluator incremental) =====
+# Starea unei mâini parțiale (5 sau 6 cărți) e (rk, sk, măști): cheile aditive din
+# evaluator.py plus masca de ranguri a fiecărei culori. O carte în plus doar adaugă
+# RKEY / SKEY și un bit în masca culorii ei, deci scorul cu încă o carte e o singură
+# citire din RANK_TABLE / FLUSH_TABLE, fără să reluăm cele 6–7 cărți (ca rank_cards).
+#   - fiecare carte nevăzută: scorul eroului (și al adversarului dat) cu ea;
+#   - pe flop, fiecare pereche turn + river: starea de 6 cărți a turn-ului se face o dată
+#     și se extinde cu fiecare river.
+
+from . import metrics
+from .cards import CARD_STRS, cards_to_ints
+from .evaluator import RKEY, SKEY, RBIT, RANK_TABLE, FLUSH_TABLE, FLUSH_SUIT, CAT_SHIFT
+
+
+def hand_state(cards):
+    """(rk, sk, măștile celor 4 culori) pentru cărțile date (întregi)."""
+    rk = sk = 0
+    masks = [0, 0, 0, 0]
+    for c in cards:
+        rk += RKEY[c]
+        sk += SKEY[c]
+        masks[c & 3] |= RBIT[c]
+    return rk, sk, tuple(masks)
+
+
+def extend(state, c):
+    """Starea cu încă o carte."""
+    rk, sk, masks = state
+    s = c & 3
+    return rk + RKEY[c], sk + SKEY[c], masks[:s] + (masks[s] | RBIT[c],) + masks[s + 1:]
+
+
+def state_score(state):
+    """Scorul întreg (ca rank_cards) al unei stări de 5–7 cărți."""
+    rk, sk, masks = state
+    fs = FLUSH_SUIT[sk]
+    return RANK_TABLE[rk] if fs < 0 else FLUSH_TABLE[masks[fs]]
+
+
+def score_with(state, c):
+    """Scorul stării plus cartea c, fără să construim starea nouă."""
+    rk, sk, masks = state
+    fs = FLUSH_SUIT[sk + SKEY[c]]
+    if fs < 0:
+        return RANK_TABLE[rk + RKEY[c]]
+    return FLUSH_TABLE[masks[fs] | (RBIT[c] if c & 3 == fs else 0)]
+
+
+def outs_table(hero_hole, board, opp_hole=None):
+    """Outs-urile eroului pe flop (3 cărți) sau turn (4 cărți).
+
+    outs:   categorie -> cărțile care duc eroul în categoria aceea (peste cea actuală);
+    beats:  cărțile după care eroul e înaintea mâinii opp_hole (None fără adversar);
+    improve: doar pe flop, categorie -> perechile turn + river care duc eroul acolo, ca
+            tuple de coduri a * 52 + b (a < b, ca wins_by_class / decode_pairs);
+    runner: submulțimea din improve în care niciuna dintre cele două cărți nu
+            îmbunătățește singură categoria (runner-runner);
+    pair_wins / pair_ties: pe flop, perechile turn + river după care eroul bate /
+            egalează opp_hole pe river;
+    opp_pairs: pe flop, codurile perechilor după care opp_hole bate eroul (ca improve)."""
+    hero_i, board_i = cards_to_ints(hero_hole), cards_to_ints(board)
+    opp_i = cards_to_ints(opp_hole) if opp_hole else []
+    used = set(hero_i + board_i + opp_i)
+    unseen = [c for c in range(52) if c not in used]
+
+    with metrics.timer("outs") as t:
+        hero = hand_state(hero_i + board_i)
+        opp = hand_state(opp_i + board_i) if opp_i else None
+        score = state_score(hero)
+        cat = score >> CAT_SHIFT
+
+        single = [score_with(hero, c) for c in unseen]
+        outs = {}
+        for c, sc in zip(unseen, single):
+            if sc >> CAT_SHIFT > cat:
+                outs.setdefault(sc >> CAT_SHIFT, []).append(CARD_STRS[c])
+        beats = None
+        if opp is not None:
+            beats = [CARD_STRS[c] for c, sc in zip(unseen, single) if sc > score_with(opp, c)]
+        evals = len(unseen) * (2 if opp else 1)
+
+        improve, runner = {}, {}
+        pair_wins = pair_ties = opp_pairs = None
+        if len(board_i) == 3:
+            pair_wins = pair_ties = 0
+            opp_pairs = []
+            improves = [sc >> CAT_SHIFT > cat for sc in single]
+            for i, tc in enumerate(unseen):
+                h_turn = extend(hero, tc)
+                o_turn = extend(opp, tc) if opp is not None else None
+                for j in range(i + 1, len(unseen)):
+                    rc = unseen[j]
+                    sc = score_with(h_turn, rc)
+                    if sc >> CAT_SHIFT > cat:
+                        code = tc * 52 + rc
+                        improve.setdefault(sc >> CAT_SHIFT, []).append(code)
+                        if not (improves[i] or improves[j]):
+                            runner.setdefault(sc >> CAT_SHIFT, []).append(code)
+                    if o_turn is not None:
+                        osc = score_with(o_turn, rc)
+                        pair_wins += sc > osc
+                        pair_ties += sc == osc
+                        if osc > sc:
+                            opp_pairs.append(tc * 52 + rc)
+            n = len(unseen)
+            evals += n * (n - 1) // 2 * (2 if opp else 1)
+            if opp is None:
+                pair_wins = pair_ties = opp_pairs = None
+        t.units = evals
+
+    return {
+        "score": score,
+        "category": cat,
+        "unseen": len(unseen),
+        "outs": outs,
+        "beats": beats,
+        "ahead": None if opp is None else score > state_score(opp),
+        "improve": {c: tuple(v) for c, v in improve.items()},
+        "runner": {c: tuple(v) for c, v in runner.items()},
+        "pairs": len(unseen) * (len(unseen) - 1) // 2 if len(board_i) == 3 else 0,
+        "pair_wins": pair_wins,
+        "pair_ties": pair_ties,
+        "opp_pairs": None if opp_pairs is None else tuple(opp_pairs),
+    }
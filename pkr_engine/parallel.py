@@ -0,0 +1,92 @@
+# ===== Monte Carlo paralel (pool de procese, fluxuri RNG reproductibile) =====
+# mc_trials se împarte în `workers` bucăți; bucata i folosește fluxul
+# SeedSequence(seed).spawn(workers)[i]. Rezultatul depinde doar de (seed, workers),
+# nu de câte procese există efectiv sau de ordinea în care termină.
+
+import atexit
+import multiprocessing as mp
+import os
+import sys
+import threading
+import types
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+
+import numpy as np
+
+from .montecarlo import mc_counts
+
+# sub acest număr de runde / bucată nu merită drumul prin pool
+MIN_POOL_CHUNK = 5_000
+
+_pool = None
+_pool_size = 0
+_main_lock = threading.Lock()
+
+
+def default_workers() -> int:
+    return os.cpu_count() or 1
+
+
+def _get_pool(size):
+    global _pool, _pool_size
+    if _pool is None or _pool_size < size:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+        # "spawn": nu facem fork dintr-un server Streamlit cu fire de execuție active
+        _pool = ProcessPoolExecutor(max_workers=size, mp_context=mp.get_context("spawn"))
+        _pool_size = size
+    return _pool
+
+
+@contextmanager
+def spawn_safe():
+    """Procesele pornite cu "spawn" re-execută __main__ după __file__. Sub Streamlit
+    __main__ e chiar scriptul aplicației, deci fiecare proces nou ar rula toată aplicația
+    (și ar putea porni la rândul lui alte pool-uri). Cât timp pornesc procesele (în
+    submit), __main__ se înlocuiește cu un modul gol."""
+    main = sys.modules.get("__main__")
+    if main is None or getattr(main, "__spec__", None) is not None or not hasattr(main, "__file__"):
+        yield
+        return
+    with _main_lock:
+        sys.modules["__main__"] = types.ModuleType("__main__")
+        try:
+            yield
+        finally:
+            sys.modules["__main__"] = main
+
+
+@atexit.register
+def _shutdown_pool():
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+
+
+def split_trials(trials, workers):
+    base, extra = divmod(int(trials), workers)
+    return [base + (1 if i < extra else 0) for i in range(workers)]
+
+
+def _mc_chunk(mat, k_opps, trials, seed_seq):
+    return mc_counts(mat, k_opps, trials, np.random.default_rng(seed_seq))
+
+
+def mc_counts_parallel(mat, k_opps, trials, seed=None, workers=None):
+    """Ca mc_counts, dar împărțit pe procese; (hits, ties) însumate din toate bucățile."""
+    workers = max(1, int(workers or default_workers()))
+    sizes = split_trials(trials, workers)
+    streams = np.random.SeedSequence(seed).spawn(workers)
+    jobs = [(n, ss) for n, ss in zip(sizes, streams) if n > 0]
+
+    if len(jobs) == 1 or max(n for n, _ in jobs) < MIN_POOL_CHUNK:
+        results = [_mc_chunk(mat, k_opps, n, ss) for n, ss in jobs]
+    else:
+        pool = _get_pool(len(jobs))
+        with spawn_safe():
+            futures = [pool.submit(_mc_chunk, mat, k_opps, n, ss) for n, ss in jobs]
+        results = [f.result() for f in futures]
+
+    hits = sum(h for h, _ in results)
+    ties = sum(t for _, t in results)
+    return hits, ties
@@ -0,0 +1,149 @@
+# ===== Equity preflop precalculată (169 de clase × 1–9 adversari) =====
+# python -m pkr_engine.preflop --trials 200000 --out assets/preflop_equity.npy
+#
+# Tabelul are forma (13, 13, 9, 3) float32 = (win, tie, equity) pentru clasa
+# (i, j) și k = 1..9 adversari aleatori. Clasa unei mâini, pe grila clasică 13×13:
+#   pereche:  (r, r)        suited: (rang_mare, rang_mic)     offsuit: (rang_mic, rang_mare)
+# cu ranguri 0..12 (2..A). Fișierul e un .npy simplu, deschis cu mmap_mode="r":
+# o singură copie în page cache, comună tuturor sesiunilor și proceselor.
+#
+# Generarea: pentru fiecare clasă se împart o dată board-ul și 9 adversari; rezultatul
+# pentru k adversari folosește primii k (adversarii sunt interschimbabili), deci
+# toate cele 9 coloane vin din aceleași runde.
+
+import argparse
+import pathlib
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .cards import RANKS, cards_to_ints
+from .batch import card_keys, rank_keys
+from .montecarlo import MC_CHUNK, deal_cards
+from .parallel import default_workers
+
+MAX_OPPS = 9
+TABLE_PATH = pathlib.Path(__file__).resolve().parent.parent / "assets" / "preflop_equity.npy"
+
+_table = None
+
+
+def hand_class(hole):
+    """Două cărți (text sau întregi) -> (i, j) pe grila 13 × 13."""
+    a, b = cards_to_ints(hole) if isinstance(hole[0], str) else hole
+    hi, lo = max(a >> 2, b >> 2), min(a >> 2, b >> 2)
+    if (a & 3) == (b & 3):
+        return hi, lo
+    return lo, hi
+
+
+# notația scurtă: 10 -> T, ca să rămână două caractere („TT”, „AJs”, „T9o”)
+_SHORT = [r if r != "10" else "T" for r in RANKS]
+
+
+def class_name(i, j):
+    """(i, j) -> „AA”, „AKs”, „72o”."""
+    if i == j:
+        return _SHORT[i] * 2
+    if i > j:
+        return f"{_SHORT[i]}{_SHORT[j]}s"
+    return f"{_SHORT[j]}{_SHORT[i]}o"
+
+
+def class_cards(i, j):
+    """O mână reprezentativă (întregi) pentru clasa (i, j)."""
+    if i == j:
+        return [4 * i, 4 * i + 1]
+    if i > j:
+        return [4 * i, 4 * j]          # suited
+    return [4 * j, 4 * i + 1]          # offsuit
+
+
+def class_equity(i, j, trials, seed_seq):
+    """(9, 3): win, tie, equity pentru clasa (i, j) cu 1..9 adversari."""
+    hero = class_cards(i, j)
+    unseen = np.array([c for c in range(52) if c not in hero], dtype=np.intp)
+    rng = np.random.default_rng(seed_seq)
+    h_rk, h_sk, h_bits = card_keys(hero)
+    win = np.zeros(MAX_OPPS)
+    tie = np.zeros(MAX_OPPS)
+    share = np.zeros(MAX_OPPS)
+    done = 0
+    while done < trials:
+        t = min(MC_CHUNK, trials - done)
+        deal = unseen[deal_cards(rng, t, len(unseen), 5 + 2 * MAX_OPPS)]
+        b_rk, b_sk, b_bits = card_keys(deal[:, :5])
+        me = rank_keys(b_rk + h_rk, b_sk + h_sk, b_bits + h_bits)
+        o_rk, o_sk, o_bits = card_keys(deal[:, 5:].reshape(t, MAX_OPPS, 2))
+        opp = rank_keys(b_rk[:, None] + o_rk, b_sk[:, None] + o_sk, b_bits[:, None] + o_bits)
+
+        best = np.maximum.accumulate(opp, axis=1)          # cel mai bun dintre primii k
+        ties = np.cumsum(opp == me[:, None], axis=1)       # câți dintre primii k fac egal
+        ahead = best < me[:, None]
+        level = best == me[:, None]
+        win += ahead.sum(axis=0)
+        tie += level.sum(axis=0)
+        share += ahead.sum(axis=0) + np.where(level, 1.0 / (1 + ties), 0.0).sum(axis=0)
+        done += t
+    return np.stack([win, tie, share], axis=1) / trials
+
+
+def generate(trials, seed=None, workers=None):
+    """Tabelul complet (13, 13, 9, 3); fiecare clasă are propriul flux SeedSequence."""
+    workers = max(1, int(workers or default_workers()))
+    classes = [(i, j) for i in range(13) for j in range(13)]
+    streams = np.random.SeedSequence(seed).spawn(len(classes))
+    table = np.zeros((13, 13, MAX_OPPS, 3), dtype=np.float32)
+    if workers == 1:
+        results = [class_equity(i, j, trials, ss) for (i, j), ss in zip(classes, streams)]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(class_equity, *zip(*classes),
+                                    [trials] * len(classes), streams))
+    for (i, j), res in zip(classes, results):
+        table[i, j] = res
+    return table
+
+
+def load_table(path=None):
+    """Tabelul mapat în memorie (doar citire), încărcat o dată pe proces; None dacă lipsește."""
+    global _table
+    if _table is None or path is not None:
+        p = pathlib.Path(path) if path else TABLE_PATH
+        if not p.exists():
+            return None
+        _table = np.load(p, mmap_mode="r")
+    return _table
+
+
+def preflop_equity(hole, num_opps):
+    """{"hand", "p_win", "p_tie", "equity"} pentru hole cu num_opps adversari; None fără tabel."""
+    table = load_table()
+    if table is None or not 1 <= num_opps <= MAX_OPPS:
+        return None
+    i, j = hand_class(hole)
+    win, tie, eq = (float(x) for x in table[i, j, num_opps - 1])
+    return {"hand": class_name(i, j), "p_win": win, "p_tie": tie, "equity": eq}
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="python -m pkr_engine.preflop",
+                                 description="Generează tabelul de equity preflop.")
+    ap.add_argument("--trials", type=int, default=200_000, help="runde / clasă")
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--workers", type=int, default=None)
+    ap.add_argument("--out", default=str(TABLE_PATH))
+    args = ap.parse_args(argv)
+
+    t0 = time.perf_counter()
+    table = generate(args.trials, args.seed, args.workers)
+    np.save(args.out, table)
+    print(f"{args.out}: 169 clase × {MAX_OPPS} adversari, {args.trials:,} runde / clasă, "
+          f"{time.perf_counter() - t0:.0f} s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,176 @@
+# ===== Range-uri de adversar (ponderate) =====
+# Sintaxa, separată prin virgulă; fiecare element poate avea o pondere „:w” (implicit 1):
+#   AA  AKs  AKo  AK          o clasă (AK = suited + offsuit)
+#   22+  A2s+  KTo+           perechile ≥ 22; kicker-ul urcă până sub cartea mare
+#   QQ-99  A5s-A2s            interval
+#   AsKs  A♠K♠  T9s:0.5       combo exact (culori s/h/d/c sau simboluri), pondere
+# Rezultatul e o matrice 52 × 52 de ponderi pe combo-uri (simetrică, diagonala 0).
+# Conflictele de cărți se rezolvă cu măști de 52 de biți (COMBO_MASK), iar extragerea
+# ponderată folosește tabele alias (O(1) / extragere, indiferent cât de îngust e range-ul).
+
+import re
+
+import numpy as np
+
+from .cards import RANKS, SUITS
+
+_RANK_CH = {("T" if r == "10" else r): i for i, r in enumerate(RANKS)}
+_SUIT_CH = {"c": 0, "d": 1, "h": 2, "s": 3}
+_SUIT_CH.update({s: i for i, s in enumerate(SUITS)})
+
+_CLASS_RE = re.compile(r"^([2-9TJQKA])([2-9TJQKA])([so]?)(\+?)$")
+_COMBO_RE = re.compile(r"^([2-9TJQKA])(.)([2-9TJQKA])(.)$")
+
+# masca de 52 de biți a fiecărei perechi (a, b) de cărți
+COMBO_MASK = (np.uint64(1) << np.arange(52, dtype=np.uint64))
+COMBO_MASK = COMBO_MASK[:, None] | COMBO_MASK[None, :]
+
+
+def _norm(tok):
+    """„a2S+” -> „A2s+”: rangurile cu majusculă, s / o cu literă mică."""
+    t = tok.strip().replace("10", "T")
+    return t[:2].upper() + t[2:].lower()
+
+
+def _class_combos(hi, lo, kind):
+    """Combo-urile (a, b) ale clasei: kind = "s", "o" sau "" (ambele)."""
+    out = []
+    for s1 in range(4):
+        for s2 in range(4):
+            if hi == lo and s1 >= s2:
+                continue
+            if hi != lo and (kind == "s" and s1 != s2 or kind == "o" and s1 == s2):
+                continue
+            out.append((4 * hi + s1, 4 * lo + s2))
+    return out
+
+
+def _combo_match(tok):
+    """Match pentru un combo exact („AsKs”, „A♠K♠”, „10h9h”), altfel None."""
+    raw = tok.strip().replace("10", "T")
+    if len(raw) != 4:
+        return None
+    m = _COMBO_RE.match(raw[0].upper() + raw[1].lower() + raw[2].upper() + raw[3].lower())
+    if m and m.group(2) in _SUIT_CH and m.group(4) in _SUIT_CH:
+        return m
+    return None
+
+
+def _expand(tok):
+    """Un element din range -> lista de combo-uri. ValueError dacă nu se poate citi."""
+    if "-" in tok:
+        a, b = (_norm(x) for x in tok.split("-", 1))
+        ma, mb = _CLASS_RE.match(a), _CLASS_RE.match(b)
+        if not (ma and mb) or ma.group(4) or mb.group(4) or ma.group(3) != mb.group(3):
+            raise ValueError(f"interval invalid: {tok}")
+        h1, l1, h2, l2 = (_RANK_CH[ma.group(1)], _RANK_CH[ma.group(2)],
+                          _RANK_CH[mb.group(1)], _RANK_CH[mb.group(2)])
+        kind = ma.group(3)
+        if h1 == l1 and h2 == l2:                        # QQ-99
+            return [c for r in range(min(h1, h2), max(h1, h2) + 1)
+                    for c in _class_combos(r, r, "")]
+        if h1 == h2:                                      # A5s-A2s
+            return [c for r in range(min(l1, l2), max(l1, l2) + 1)
+                    for c in _class_combos(h1, r, kind)]
+        raise ValueError(f"interval invalid: {tok}")
+
+    m = _combo_match(tok)
+    if m:
+        a = 4 * _RANK_CH[m.group(1)] + _SUIT_CH[m.group(2)]
+        b = 4 * _RANK_CH[m.group(3)] + _SUIT_CH[m.group(4)]
+        if a == b:
+            raise ValueError(f"combo invalid: {tok}")
+        return [(a, b)]
+
+    m = _CLASS_RE.match(_norm(tok))
+    if not m:
+        raise ValueError(f"element necunoscut în range: {tok}")
+    hi, lo = _RANK_CH[m.group(1)], _RANK_CH[m.group(2)]
+    hi, lo = max(hi, lo), min(hi, lo)
+    kind, plus = m.group(3), m.group(4)
+    if hi == lo:
+        if kind:
+            raise ValueError(f"perechile nu au s/o: {tok}")
+        ranks = range(hi, 13) if plus else [hi]
+        return [c for r in ranks for c in _class_combos(r, r, "")]
+    kickers = range(lo, hi) if plus else [lo]
+    return [c for k in kickers for c in _class_combos(hi, k, kind)]
+
+
+def parse_range(text):
+    """Textul range-ului -> matrice (52, 52) float de ponderi; None pentru „orice mână”."""
+    if text is None or not text.strip() or text.strip().lower() in ("random", "any", "orice"):
+        return None
+    weights = np.zeros((52, 52))
+    for part in text.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        tok, _, w = part.partition(":")
+        try:
+            weight = float(w) if w else 1.0
+        except ValueError:
+            raise ValueError(f"pondere invalidă: {part}")
+        if weight < 0:
+            raise ValueError(f"pondere negativă: {part}")
+        for a, b in _expand(tok):
+            weights[a, b] = weights[b, a] = weight
+    return weights
+
+
+def parse_combo(text):
+    """O mână exactă („AsKd”, „A♠K♦”) -> (a, b) ca întregi. ValueError dacă nu e un combo."""
+    m = _combo_match(text or "")
+    if not m:
+        raise ValueError(f"nu e o mână exactă (ex. AsKd): {text}")
+    return _expand(text.strip())[0]
+
+
+def is_suit_symmetric(text):
+    """True dacă range-ul nu conține combo-uri exacte (deci nu depinde de culori concrete)."""
+    if parse_range(text) is None:
+        return True
+    return not any(_combo_match(t.partition(":")[0]) for t in text.split(","))
+
+
+def pair_weights(weights, cards):
+    """Ponderile perechilor din `cards`, în ordinea pair_indices(len(cards))."""
+    cards = np.asarray(cards, dtype=np.intp)
+    ia, ib = np.triu_indices(len(cards), 1)
+    if weights is None:
+        return np.ones(len(ia))
+    return weights[cards[ia], cards[ib]]
+
+
+def pair_masks(cards):
+    """Măștile de 52 de biți ale perechilor din `cards` (ordinea pair_indices)."""
+    cards = np.asarray(cards, dtype=np.intp)
+    ia, ib = np.triu_indices(len(cards), 1)
+    return COMBO_MASK[cards[ia], cards[ib]]
+
+
+# ===== Tabel alias (Vose) =====
+def build_alias(weights):
+    """(prob, alias) pentru extragerea indicelui i cu probabilitatea weights[i] / sum."""
+    w = np.asarray(weights, dtype=float)
+    n = len(w)
+    total = w.sum()
+    if n == 0 or total <= 0:
+        raise ValueError("range-ul nu are nicio combinație disponibilă")
+    scaled = w * n / total
+    prob = np.ones(n)
+    alias = np.arange(n)
+    small = [i for i in range(n) if scaled[i] < 1.0]
+    large = [i for i in range(n) if scaled[i] >= 1.0]
+    while small and large:
+        s, l = small.pop(), large.pop()
+        prob[s] = scaled[s]
+        alias[s] = l
+        scaled[l] -= 1.0 - scaled[s]
+        (small if scaled[l] < 1.0 else large).append(l)
+    return prob, alias
+
+
+def alias_draw(rng, prob, alias, size):
+    i = rng.integers(0, len(prob), size=size)
+    return np.where(rng.random(size) < prob[i], i, alias[i])
@@ -0,0 +1,88 @@
+# ===== Evaluator de referință (5 cărți, tuple) =====
+# Evaluatorul original al aplicației, păstrat ca referință: evaluator.py trebuie să
+# dea exact aceeași ordine (score_tuple(rank_cards(c)) == evaluate_5(c) pe 5 cărți).
+# Nu se folosește în calcule; îl folosesc verificările și benchmark-urile.
+
+from itertools import combinations
+
+from .cards import RANK_VAL, SUITS
+
+
+def card_vals(cards):
+    return sorted([RANK_VAL[c[:-1]] for c in cards], reverse=True)
+
+
+def is_flush(cards):
+    suits = [c[-1] for c in cards]
+    for s in SUITS:
+        if suits.count(s) == 5:
+            return True, s
+    return False, None
+
+
+def is_straight(vals):
+    u = sorted(set(vals), reverse=True)
+    if 14 in u:
+        u.append(1)  # wheel
+    for i in range(len(u) - 4):
+        seq = u[i:i+5]
+        if seq[0] - seq[4] == 4:
+            return True, seq[0]
+    return False, 0
+
+
+# 8=SF,7=Four,6=Full,5=Flush,4=Straight,3=Trips,2=TwoPair,1=Pair,0=High
+def evaluate_5(cards):
+    vals = card_vals(cards)
+    freq = {}
+    for v in vals:
+        freq[v] = freq.get(v, 0) + 1
+    groups = sorted(freq.items(), key=lambda x: (x[1], x[0]), reverse=True)
+    counts = [g[1] for g in groups]
+
+    flush, flush_suit = is_flush(cards)
+    straight, top_st = is_straight(vals)
+
+    if flush:
+        flush_vals = card_vals([c for c in cards if c[-1] == flush_suit])
+        sf, sf_top = is_straight(flush_vals)
+        if sf:
+            return (8, sf_top)
+
+    if 4 in counts:
+        four = groups[0][0]
+        kicker = max([v for v in vals if v != four]) if any(v != four for v in vals) else 0
+        return (7, four, kicker)
+
+    if 3 in counts and 2 in counts:
+        trips = [v for v, c in groups if c == 3][0]
+        pair  = [v for v, c in groups if c == 2][0]
+        return (6, trips, pair)
+
+    if flush:
+        return (5, sorted(vals, reverse=True))
+    if straight:
+        return (4, top_st)
+
+    if 3 in counts:
+        trips = [v for v, c in groups if c == 3][0]
+        kickers = [v for v in vals if v != trips][:2]
+        return (3, trips, kickers)
+
+    pairs = [v for v, c in groups if c == 2]
+    if len(pairs) >= 2:
+        top2 = pairs[:2]
+        kicker = [v for v in vals if v not in top2][0]
+        return (2, top2, kicker)
+
+    if 2 in counts:
+        pair = [v for v, c in groups if c == 2][0]
+        kickers = [v for v in vals if v != pair][:3]
+        return (1, pair, kickers)
+
+    return (0, vals)
+
+
+def best_of_seven(cards7):
+    """Cel mai bun tuple evaluate_5 din cele 21 de combinații de 5 cărți (text)."""
+    return max(evaluate_5(list(c)) for c in combinations(cards7, 5))
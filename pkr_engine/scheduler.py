@@ -0,0 +1,280 @@
+# ===== Planificator comun pentru calculele grele (toate sesiunile) =====
+# Un singur pool de procese pe server, cu:
+#   - coadă mărginită (max_queue): peste limită submit() aruncă SchedulerBusy
+#     (back-pressure: utilizatorul vede „server ocupat”, serverul nu se îneacă);
+#   - limită pe sesiune (per_session): o sesiune nu poate ocupa toată coada;
+#   - unificarea cererilor identice: aceeași cheie cât timp e în coadă / rulează
+#     întoarce același job, deci un calcul popular se face o singură dată;
+#   - poziția în coadă pentru fiecare job, pentru afișare;
+#   - job-uri speculative (precalculul de la împărțire) cu prioritate mică: stau într-o
+#     coadă separată, pornesc doar când nu așteaptă niciun job cerut de utilizator, nu intră
+#     în limita pe sesiune și nici în max_queue, iar peste max_speculative se refuză.
+#     Un clic pe același calcul ridică job-ul speculativ în coada normală.
+# Job-urile intră în pool doar când un proces e liber, deci ordinea e FIFO și poziția
+# din coadă e reală (coada internă a ProcessPoolExecutor rămâne goală).
+# Un pool stricat (un proces mort -> BrokenProcessPool) se înlocuiește cu unul nou: job-urile
+# care rulau atunci eșuează, cele următoare pornesc normal.
+# Din procese se întorc în proces-ul serverului:
+#   - măsurătorile (metrics.export -> metrics.merge), ca panoul Performance să vadă etapele
+#     rulate în pool (enumerare, exact, Monte Carlo, equity);
+#   - progresul intermediar (progress(...) al funcției, ex. Monte Carlo adaptiv), printr-o
+#     coadă multiprocessing dată proceselor la pornire; run() îl predă lui on_progress.
+
+import multiprocessing as mp
+import threading
+from collections import Counter, deque
+from concurrent.futures import CancelledError, Future, ProcessPoolExecutor, TimeoutError
+from concurrent.futures.process import BrokenProcessPool
+
+from . import metrics
+from .parallel import default_workers, spawn_safe
+
+MAX_QUEUE = 32
+PER_SESSION = 2
+MAX_SPECULATIVE = 8
+
+
+class SchedulerBusy(RuntimeError):
+    pass
+
+
+_progress_q = None  # în procesele din pool: coada spre server (setată de _init_worker)
+
+
+def _init_worker(q):
+    global _progress_q
+    _progress_q = q
+
+
+def _send_progress(job_id):
+    return lambda *args: _progress_q.put((job_id, args))
+
+
+def _call(job_id, fn, args, kwargs, progress, with_metrics):
+    """Rulează în procesul din pool -> (rezultat, măsurătorile job-ului sau None).
+    Un proces rulează un singur job o dată, deci reset() face din export() o diferență."""
+    metrics.enable(with_metrics)
+    metrics.reset()
+    if progress:
+        kwargs = dict(kwargs, progress=_send_progress(job_id))
+    result = fn(*args, **kwargs)
+    return result, metrics.export() if with_metrics else None
+
+
+class Job:
+    __slots__ = ("id", "key", "session", "fn", "args", "kwargs", "future", "state", "waiters",
+                 "progress", "last", "speculative")
+
+    def __init__(self, job_id, key, session, fn, args, kwargs, progress, speculative=False):
+        self.id = job_id
+        self.key, self.session, self.fn, self.args, self.kwargs = key, session, fn, args, kwargs
+        self.future = Future()
+        self.state = "queued"
+        self.waiters = 1
+        self.progress = progress  # funcția primește progress= (trimis înapoi prin coadă)
+        self.last = None          # ultimele argumente primite de progress
+        self.speculative = speculative  # nu se numără în limita sesiunii
+
+
+class Scheduler:
+    def __init__(self, workers=None, max_queue=MAX_QUEUE, per_session=PER_SESSION,
+                 max_speculative=MAX_SPECULATIVE):
+        self.workers = max(1, int(workers or default_workers()))
+        self.max_queue = max_queue
+        self.per_session = per_session
+        self.max_speculative = max_speculative
+        ctx = mp.get_context("spawn")
+        self._progress_q = ctx.Queue()
+        self._pool = self._new_pool()
+        self._lock = threading.Lock()
+        self._pending = deque()
+        self._spec = deque()  # job-uri speculative în așteptare (pornesc după _pending)
+        self._inflight = {}
+        self._by_id = {}
+        self._next_id = 0
+        self._sessions = Counter()
+        self._running = 0
+        threading.Thread(target=self._listen, name="pkr-scheduler-progress", daemon=True).start()
+
+    def _new_pool(self):
+        # "spawn", ca în parallel.py: nu facem fork dintr-un server cu fire active
+        return ProcessPoolExecutor(max_workers=self.workers, mp_context=mp.get_context("spawn"),
+                                   initializer=_init_worker, initargs=(self._progress_q,))
+
+    def _listen(self):
+        # progresul vine din procese; îl ține job-ul, run() îl citește la fiecare `poll`
+        while True:
+            job_id, args = self._progress_q.get()
+            with self._lock:
+                job = self._by_id.get(job_id)
+                if job is not None:
+                    job.last = args
+
+    def _replace_pool(self, broken):
+        # apelat cu _lock ținut; doar primul care vede pool-ul stricat îl înlocuiește
+        if self._pool is broken:
+            metrics.count("pool_restarts")
+            self._pool = self._new_pool()
+            broken.shutdown(wait=False, cancel_futures=True)
+
+    def submit(self, session, key, fn, *args, progress=False, speculative=False, **kwargs):
+        """Pune fn(*args, **kwargs) în coadă (sau se alătură unui job identic) -> Job.
+        progress=True: fn primește progress=..., iar apelurile ajung în Job.last.
+        speculative=True: prioritate mică (vezi sus); SchedulerBusy dacă sunt deja prea multe."""
+        with self._lock:
+            job = self._inflight.get(key)
+            if job is not None:
+                job.waiters += 1
+                if progress and job.state == "queued":
+                    job.progress = True
+                if not speculative and job in self._spec:
+                    self._spec.remove(job)
+                    self._pending.append(job)
+                metrics.count("jobs_coalesced")
+                return job
+            if speculative:
+                if len(self._pending) + len(self._spec) >= self.max_speculative:
+                    metrics.count("jobs_speculative_skipped")
+                    raise SchedulerBusy("serverul e ocupat; precalculul se sare")
+                job = Job(self._next_id, key, session, fn, args, kwargs, progress, True)
+                self._next_id += 1
+                self._inflight[key] = job
+                self._by_id[job.id] = job
+                self._spec.append(job)
+                metrics.count("jobs_speculative")
+            else:
+                if self._sessions[session] >= self.per_session:
+                    metrics.count("jobs_rejected")
+                    raise SchedulerBusy("ai deja calcule în lucru; așteaptă să se termine")
+                if len(self._pending) >= self.max_queue:
+                    metrics.count("jobs_rejected")
+                    raise SchedulerBusy("serverul e ocupat; încearcă din nou în câteva secunde")
+                job = Job(self._next_id, key, session, fn, args, kwargs, progress)
+                self._next_id += 1
+                self._inflight[key] = job
+                self._by_id[job.id] = job
+                self._sessions[session] += 1
+                self._pending.append(job)
+                metrics.count("jobs_submitted")
+            started = self._dispatch()
+        self._watch(started)
+        return job
+
+    def _dispatch(self):
+        """Trimite în pool job-urile care au loc -> [(job, future din pool, pool)].
+        Apelat cu _lock ținut; callback-urile se pun după eliberarea lui (_watch)."""
+        started = []
+        while (self._pending or self._spec) and self._running < self.workers:
+            job = (self._pending or self._spec).popleft()
+            job.state = "running"
+            self._running += 1
+            try:
+                try:
+                    pool = self._pool
+                    f = self._start(pool, job)
+                except BrokenProcessPool:
+                    self._replace_pool(pool)
+                    pool = self._pool
+                    f = self._start(pool, job)
+            except Exception as e:  # pool închis: job-ul eșuează, nu coada
+                self._release(job)
+                job.future.set_exception(e)
+                continue
+            started.append((job, f, pool))
+        return started
+
+    def _start(self, pool, job):
+        with spawn_safe():
+            return pool.submit(_call, job.id, job.fn, job.args, job.kwargs, job.progress,
+                               metrics.enabled())
+
+    def _watch(self, started):
+        # fără _lock: un future deja terminat apelează callback-ul imediat, în acest fir,
+        # iar _finish ia _lock
+        for job, f, pool in started:
+            f.add_done_callback(lambda f, job=job, pool=pool: self._finish(job, f, pool))
+
+    def _release(self, job):
+        if job.state == "running":
+            self._running -= 1
+        job.state = "done"
+        self._inflight.pop(job.key, None)
+        self._by_id.pop(job.id, None)
+        if job.speculative:
+            return
+        self._sessions[job.session] -= 1
+        if self._sessions[job.session] <= 0:
+            del self._sessions[job.session]
+
+    def _finish(self, job, f, pool):
+        exc = CancelledError() if f.cancelled() else f.exception()
+        with self._lock:
+            if isinstance(exc, BrokenProcessPool):
+                self._replace_pool(pool)
+            self._release(job)
+            started = self._dispatch()
+        self._watch(started)
+        if exc is not None:
+            job.future.set_exception(exc)
+        else:
+            result, delta = f.result()
+            metrics.merge(delta)
+            job.future.set_result(result)
+
+    def position(self, job):
+        """1 = următorul care pornește; 0 = rulează sau s-a terminat."""
+        with self._lock:
+            if job.state != "queued":
+                return 0
+            if job in self._pending:
+                return self._pending.index(job) + 1
+            if job in self._spec:
+                return len(self._pending) + self._spec.index(job) + 1
+            return 0
+
+    def leave(self, job):
+        """Un apelant renunță la job; dacă nu mai așteaptă nimeni și e încă în coadă, se scoate."""
+        with self._lock:
+            job.waiters -= 1
+            if job.waiters > 0 or job.state != "queued":
+                return False
+            (self._spec if job in self._spec else self._pending).remove(job)
+            self._release(job)
+        job.future.cancel()
+        return True
+
+    def run(self, session, key, fn, *args, on_status=None, on_progress=None, cancel=None, poll=0.1,
+            speculative=False, **kwargs):
+        """submit + așteptare; on_status(poziție) la fiecare `poll` secunde cât timp așteaptă.
+        on_progress(*args) primește progresul nou al funcției (care trebuie să accepte progress=).
+        cancel (threading.Event) scoate job-ul din coadă și aruncă CancelledError."""
+        job = self.submit(session, key, fn, *args, progress=on_progress is not None,
+                          speculative=speculative, **kwargs)
+        seen = None
+        with metrics.timer("scheduler_wait"):
+            while True:
+                if cancel is not None and cancel.is_set():
+                    self.leave(job)
+                    raise CancelledError
+                try:
+                    result = job.future.result(timeout=poll)
+                    break
+                except TimeoutError:
+                    if on_status is not None:
+                        on_status(self.position(job))
+                    last = job.last
+                    if on_progress is not None and last is not None and last is not seen:
+                        seen = last
+                        on_progress(*last)
+        with self._lock:
+            job.waiters -= 1
+        return result
+
+    def stats(self):
+        with self._lock:
+            return {"queued": len(self._pending), "speculative": len(self._spec),
+                    "running": self._running, "workers": self.workers,
+                    "sessions": len(self._sessions)}
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
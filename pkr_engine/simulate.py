@@ -0,0 +1,248 @@
+# ===== Simulator de mâini complete, fără interfață =====
+# python -m pkr_engine.simulate --hands 1000000 --players 6 --out hands.csv --summary summary.csv
+#
+# Joacă mâini complete (până la showdown) cu dealerul care se rotește la fiecare mână,
+# pe toate nucleele. Mâinile se împart în bucăți; bucata i folosește fluxul
+# SeedSequence(seed).spawn(nr_bucăți)[i], deci rezultatul depinde doar de
+# (seed, hands, chunk), nu de numărul de procese. Bucățile se scriu pe măsură ce
+# sosesc (CSV sau Parquet, câte un row group pe bucată), în ordinea mâinilor.
+#   --shuffle uniform: permutare uniformă a pachetului (implicit, vectorizat)
+#   --shuffle riffle : aceeași amestecare riffle ca în aplicație (mai lent)
+
+import argparse
+import csv
+import random
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .cards import CARD_STRS
+from .batch import rank_holes_batch
+from .evaluator import CAT_SHIFT, HAND_NAMES
+from .dealing import riffle_decks, shuffled_decks
+from .parallel import default_workers
+
+DEFAULT_CHUNK = 50_000
+
+
+def deal_chunk(decks, dealers, num_players):
+    """Pachete (H, 52) + dealerii (H,) -> cărțile din mână (H, n, 2) și board-ul (H, 5),
+    în aceeași ordine de împărțire ca dealing.deal_hole_cards / deal_board."""
+    n = num_players
+    seats = np.arange(n)
+    # locul p primește a ((p - dealer - 1) mod n)-a carte din fiecare tură
+    pos = (seats[None, :] - dealers[:, None] - 1) % n
+    holes = np.stack([np.take_along_axis(decks, pos, axis=1),
+                      np.take_along_axis(decks, n + pos, axis=1)], axis=2)
+    b = 2 * n
+    board = decks[:, [b + 1, b + 2, b + 3, b + 5, b + 7]]
+    return holes, board
+
+
+def play_chunk(start, count, num_players, seed_seq, shuffle="uniform", with_hands=True):
+    """Joacă mâinile start .. start+count-1; întoarce agregatele și (opțional) rândurile."""
+    n = num_players
+    if shuffle == "riffle":
+        decks = riffle_decks(count, random.Random(int(seed_seq.generate_state(1)[0])))
+    else:
+        decks = shuffled_decks(count, np.random.default_rng(seed_seq))
+    dealers = (start + np.arange(count)) % n
+    holes, board = deal_chunk(decks, dealers, n)
+
+    scores = rank_holes_batch(board, holes)
+    best = scores.max(axis=1)
+    win = scores == best[:, None]
+    n_win = win.sum(axis=1)
+    share = win / n_win[:, None]
+    cat = best >> CAT_SHIFT
+    split = n_win > 1
+    # poziția față de dealer: 0 = dealer, 1 = small blind, 2 = big blind, ...
+    rel = (np.arange(n)[None, :] - dealers[:, None]) % n
+
+    agg = {
+        "hands": count,
+        "seat_wins": (win & ~split[:, None]).sum(axis=0),
+        "seat_splits": (win & split[:, None]).sum(axis=0),
+        "seat_share": share.sum(axis=0),
+        "pos_wins": np.bincount(rel[win & ~split[:, None]], minlength=n),
+        "pos_splits": np.bincount(rel[win & split[:, None]], minlength=n),
+        "pos_share": np.bincount(rel.ravel(), weights=share.ravel(), minlength=n),
+        "cat": np.bincount(cat, minlength=9),
+        "cat_split": np.bincount(cat[split], minlength=9),
+        "splits": int(split.sum()),
+    }
+
+    columns = None
+    if with_hands:
+        cs = CARD_STRS
+        columns = {"hand": (start + np.arange(count) + 1).tolist(),
+                   "dealer": (dealers + 1).tolist()}
+        for p in range(n):
+            columns[f"seat{p + 1}"] = [f"{cs[a]} {cs[b]}" for a, b in holes[:, p].tolist()]
+        columns["board"] = [" ".join(cs[c] for c in row) for row in board.tolist()]
+        columns["winners"] = [" ".join(str(p + 1) for p in np.flatnonzero(w)) for w in win]
+        columns["category"] = cat.tolist()
+        columns["split"] = split.astype(int).tolist()
+    return agg, columns
+
+
+class _CsvSink:
+    def __init__(self, path):
+        self.f = open(path, "w", newline="", encoding="utf-8")
+        self.w = csv.writer(self.f)
+        self.header = False
+
+    def write(self, columns):
+        if not self.header:
+            self.w.writerow(columns.keys())
+            self.header = True
+        self.w.writerows(zip(*columns.values()))
+
+    def close(self):
+        self.f.close()
+
+
+class _ParquetSink:
+    def __init__(self, path):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise SystemExit("Parquet necesită pyarrow (pip install pyarrow); folosește --format csv.")
+        self.pa, self.pq, self.path = pa, pq, path
+        self.writer = None
+
+    def write(self, columns):
+        table = self.pa.table(columns)
+        if self.writer is None:
+            self.writer = self.pq.ParquetWriter(self.path, table.schema)
+        self.writer.write_table(table)
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+
+def _sink(path, fmt):
+    if fmt == "parquet" or (fmt is None and str(path).endswith(".parquet")):
+        return _ParquetSink(path)
+    return _CsvSink(path)
+
+
+def _merge(total, agg):
+    if total is None:
+        return {k: (v.copy() if isinstance(v, np.ndarray) else v) for k, v in agg.items()}
+    for k, v in agg.items():
+        total[k] = total[k] + v
+    return total
+
+
+def summary_rows(total, num_players):
+    """Agregatele ca rânduri (grup, cheie, mâini, câștiguri, split-uri, pot_share, rată)."""
+    H = total["hands"]
+    rows = []
+    names = ["dealer", "small blind", "big blind"] + [f"dealer+{i}" for i in range(3, num_players)]
+    for p in range(num_players):
+        rows.append(("seat", str(p + 1), H, int(total["seat_wins"][p]),
+                     int(total["seat_splits"][p]), float(total["seat_share"][p]),
+                     float(total["seat_share"][p]) / H))
+    for p in range(num_players):
+        rows.append(("position", names[p], H, int(total["pos_wins"][p]),
+                     int(total["pos_splits"][p]), float(total["pos_share"][p]),
+                     float(total["pos_share"][p]) / H))
+    for c in range(8, -1, -1):
+        n = int(total["cat"][c])
+        rows.append(("category", HAND_NAMES[c], H, n, int(total["cat_split"][c]), float(n), n / H))
+    rows.append(("split", "split pot", H, total["splits"], total["splits"],
+                 float(total["splits"]), total["splits"] / H))
+    return rows
+
+
+SUMMARY_COLUMNS = ["group", "key", "hands", "wins", "split_wins", "pot_share", "rate"]
+
+
+def simulate(hands, num_players, seed=None, workers=None, chunk=DEFAULT_CHUNK,
+             shuffle="uniform", on_chunk=None):
+    """Rulează `hands` mâini și întoarce agregatele totale.
+    on_chunk(columns) primește rândurile fiecărei bucăți, în ordine (None = fără rânduri).
+    ValueError dacă hands sau chunk e < 1."""
+    if hands < 1 or chunk < 1:
+        raise ValueError(f"hands și chunk trebuie să fie ≥ 1 (hands={hands}, chunk={chunk})")
+    workers = max(1, int(workers or default_workers()))
+    sizes = [min(chunk, hands - s) for s in range(0, hands, chunk)]
+    starts = [i * chunk for i in range(len(sizes))]
+    streams = np.random.SeedSequence(seed).spawn(len(sizes))
+    with_hands = on_chunk is not None
+    total = None
+
+    def consume(agg, columns):
+        nonlocal total
+        total = _merge(total, agg)
+        if with_hands:
+            on_chunk(columns)
+
+    if workers == 1:
+        for s0, sz, ss in zip(starts, sizes, streams):
+            consume(*play_chunk(s0, sz, num_players, ss, shuffle, with_hands))
+        return total
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for s0, sz, ss in zip(starts, sizes, streams):
+            pending.append(pool.submit(play_chunk, s0, sz, num_players, ss, shuffle, with_hands))
+            # cel mult 2 bucăți / proces în zbor: memoria rămâne mărginită
+            if len(pending) >= 2 * workers:
+                consume(*pending.popleft().result())
+        while pending:
+            consume(*pending.popleft().result())
+    return total
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="python -m pkr_engine.simulate",
+                                 description="Simulează mâini complete de Texas Hold'em.")
+    ap.add_argument("--hands", type=int, default=1_000_000)
+    ap.add_argument("--players", type=int, default=6)
+    ap.add_argument("--seed", type=int, default=None)
+    ap.add_argument("--workers", type=int, default=None, help="implicit: toate nucleele")
+    ap.add_argument("--chunk", type=int, default=DEFAULT_CHUNK)
+    ap.add_argument("--shuffle", choices=["uniform", "riffle"], default="uniform")
+    ap.add_argument("--out", default=None, help="rezultatele pe mâini (.csv sau .parquet)")
+    ap.add_argument("--summary", default=None, help="statisticile agregate (.csv sau .parquet)")
+    ap.add_argument("--format", choices=["csv", "parquet"], default=None)
+    args = ap.parse_args(argv)
+    if not 2 <= args.players <= 10:
+        ap.error("--players trebuie să fie între 2 și 10")
+    if args.hands < 1:
+        ap.error("--hands trebuie să fie cel puțin 1")
+    if args.chunk < 1:
+        ap.error("--chunk trebuie să fie cel puțin 1")
+
+    sink = _sink(args.out, args.format) if args.out else None
+    t0 = time.perf_counter()
+    try:
+        total = simulate(args.hands, args.players, args.seed, args.workers, args.chunk,
+                         args.shuffle, sink.write if sink else None)
+    finally:
+        if sink:
+            sink.close()
+    dt = time.perf_counter() - t0
+
+    rows = summary_rows(total, args.players)
+    if args.summary:
+        out = _sink(args.summary, args.format)
+        out.write({c: [r[i] for r in rows] for i, c in enumerate(SUMMARY_COLUMNS)})
+        out.close()
+
+    print(f"{total['hands']:,} mâini, {args.players} jucători, {dt:.1f} s "
+          f"({total['hands'] / max(dt, 1e-9):,.0f} mâini/s)")
+    for group, key, H, wins, splits, share, rate in rows:
+        print(f"  {group:<9} {key:<42} {rate * 100:7.3f}%  (câștiguri {wins:,}, split {splits:,})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
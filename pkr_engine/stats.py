@@ -0,0 +1,176 @@
+# ===== Statistici pe River (vectorizat) =====
+# Toate cele C(45, 2) mâini de adversar se evaluează o singură dată (rank_with_pairs);
+# Monte Carlo nu mai evaluează nimic: fiecare adversar citește rezultatul perechii lui
+# dintr-o matrice 45×45 (0 = pierde, 1 = egal, 2 = bate eroul).
+# Cu un range de adversar (ranges.py) perechile au ponderi: un adversar e exact
+# (medie ponderată), mai mulți trec pe Monte Carlo ponderat (mc_counts_range).
+# Fără range, cu ≥ 2 adversari, numărarea exactă (exact_multiway) rulează doar când nu s-a
+# cerut Monte Carlo și încape în bugetul EXACT_STATES; altfel se face Monte Carlo.
+
+from math import sqrt
+
+import numpy as np
+
+from . import metrics
+from .cards import CARD_STRS, cards_to_ints
+from .evaluator import CAT_SHIFT, rank_cards, score_tuple
+from .batch import pair_indices, rank_with_pairs
+from .montecarlo import LOSE, TIE, BEAT, mc_adaptive, mc_counts_range, mc_stratified, wilson_ci
+from .ranges import parse_range, pair_weights, pair_masks, build_alias
+from .parallel import mc_counts_parallel
+from .exact import EXACT_STATES, exact_multiway
+
+RANGE_TRIALS = 20_000  # runde implicite când Monte Carlo înlocuiește calculul exact și mc_trials lipsește
+
+
+def river_outcomes(hero_hole, board5):
+    """Evaluează eroul și toate perechile adversarului pe board-ul complet."""
+    board_i = cards_to_ints(board5)
+    hero_rank = rank_cards(cards_to_ints(hero_hole) + board_i)
+    used = set(board_i) | set(cards_to_ints(hero_hole))
+    remaining = np.array([c for c in range(52) if c not in used], dtype=np.intp)
+    ranks = rank_with_pairs(board_i, remaining)
+    outcome = np.where(ranks > hero_rank, BEAT, np.where(ranks == hero_rank, TIE, LOSE)).astype(np.int8)
+    return hero_rank, remaining, ranks, outcome
+
+
+def _wins_by_class(remaining, ranks, beats):
+    """cls -> coduri a * 52 + b (a < b) ale perechilor care bat eroul, în ordinea perechilor."""
+    ia, ib = pair_indices(len(remaining))
+    beat = np.flatnonzero(beats)
+    codes = (remaining[ia[beat]] * 52 + remaining[ib[beat]]).astype(np.uint16)
+    cats = ranks[beat] >> CAT_SHIFT
+    return {int(c): codes[cats == c] for c in np.unique(cats)}
+
+
+def beating_pairs(hero_hole, board5, opp_range=None):
+    """Doar wins_by_class din river_stats (fără probabilități, fără Monte Carlo), pentru
+    afișarea la cerere: o evaluare a celor 990 de perechi."""
+    hero_rank, remaining, ranks, outcome = river_outcomes(hero_hole, board5)
+    in_range = pair_weights(parse_range(opp_range), remaining) > 0
+    return _wins_by_class(remaining, ranks, in_range & (outcome == BEAT))
+
+
+def decode_pairs(codes, start=0, stop=None):
+    """Codurile a * 52 + b din wins_by_class (felia start:stop) -> [(carte_a, carte_b)]."""
+    return [(CARD_STRS[int(c) // 52], CARD_STRS[int(c) % 52]) for c in codes[start:stop]]
+
+
+def outcome_matrix(outcome, n):
+    """Rezultatul pe perechi -> matrice simetrică n × n (diagonala nu se folosește)."""
+    ia, ib = pair_indices(n)
+    mat = np.zeros((n, n), dtype=np.int8)
+    mat[ia, ib] = outcome
+    mat[ib, ia] = outcome
+    return mat
+
+
+def river_stats(hero_hole, board5, total_players, mc_trials, use_mc, seed=None, workers=1,
+                mc_target=None, mc_time=2.0, progress=None, opp_range=None, mc_method="plain"):
+    """Calculul din butonul „Calculează statistici”; întoarce dicționarul din river_stats.
+
+    Cu un adversar probabilitățile exacte sunt simple numărători și se dau mereu. Cu mai
+    mulți, fără use_mc, se numără exact (exact_multiway) cât timp încape în EXACT_STATES;
+    peste buget și cu use_mc, p_exact_* sunt None și rezultatul vine din Monte Carlo,
+    reproductibil pentru aceeași pereche (seed, workers).
+    Cu mc_target (semi-lățimea IC 95%, ex. 0.005) Monte Carlo rulează adaptiv, într-un
+    singur proces, până atinge precizia sau mc_time secunde; mc_trials e ignorat.
+
+    opp_range (text, vezi ranges.parse_range) restrânge mâinile adversarilor; M / W / T și
+    wins_by_class numără atunci doar combo-urile din range. Cu ≥ 2 adversari nu există
+    variantă exactă ponderată: p_exact_* sunt None și Monte Carlo rulează oricum.
+
+    mc_method="stratified" folosește montecarlo.mc_stratified (stratificat + condiționat,
+    într-un proces; fără range). mc_se / mc_var_ratio raportează eroarea standard a lui
+    p_mc_beats și câștigul de varianță față de MC simplu (1.0 pentru MC simplu)."""
+    with metrics.timer("river_outcomes") as t:
+        hero_rank, remaining, ranks, outcome = river_outcomes(hero_hole, board5)
+        t.units = len(outcome)
+    hero_score = score_tuple(hero_rank)
+    weights = parse_range(opp_range)
+    w = pair_weights(weights, remaining)
+    in_range = w > 0
+    M = int(np.count_nonzero(in_range))
+    W = int(np.count_nonzero(in_range & (outcome == BEAT)))
+    T = int(np.count_nonzero(in_range & (outcome == TIE)))
+
+    wins_by_class = _wins_by_class(remaining, ranks, in_range & (outcome == BEAT))
+
+    k_opps = max(0, int(total_players) - 1)
+    mat = outcome_matrix(outcome, len(remaining))
+    counts = None
+    p_exact_beats = p_exact_tieonly = None
+    if M == 0 or k_opps == 0:
+        p_exact_beats, p_exact_tieonly = 0.0, 0.0
+    elif k_opps == 1:
+        p_exact_beats = float(w[outcome == BEAT].sum() / w.sum())
+        p_exact_tieonly = float(w[outcome == TIE].sum() / w.sum())
+    elif weights is None and not use_mc:
+        with metrics.timer("exact_multiway"):
+            exact = exact_multiway(mat, k_opps, max_states=EXACT_STATES)
+        if exact is None:
+            metrics.count("exact_over_budget")
+            mc_method = "plain"
+        else:
+            p_exact_beats, p_exact_tieonly = exact
+    if p_exact_beats is None:
+        if not use_mc:
+            use_mc, mc_target = True, None
+        mc_trials = mc_trials or RANGE_TRIALS
+    if weights is not None and M > 0 and k_opps > 0:
+        # cu range, Monte Carlo (și verificarea opțională cu un adversar) extrage ponderat;
+        # matricea uniformă `mat` ar ignora range-ul
+        masks = pair_masks(remaining)
+        prob, alias = build_alias(w)
+        counts = lambda t, r: mc_counts_range(outcome, masks, prob, alias, k_opps, t, r)
+
+    p_red = p_exact_beats
+    p_mc_beats = None
+    p_mc_tieonly = None
+    p_mc_ci = None
+    mc_n = 0
+    mc_se = mc_var_ratio = None
+
+    if mc_method == "stratified" and weights is None and k_opps == 1:
+        use_mc = False  # un adversar: straturile sunt chiar rezultatul exact (p_exact_*)
+
+    if use_mc and k_opps > 0 and M > 0 and (mc_trials or mc_target):
+        with metrics.timer("monte_carlo") as t:
+            if mc_method == "stratified" and weights is None:
+                res = mc_stratified(mat, k_opps, mc_trials, np.random.default_rng(seed),
+                                    mc_target, mc_time, progress)
+                if res["n"]:  # n = 0: toate perechile bat eroul, rezultatul e exact
+                    mc_n, p_mc_ci, mc_se, mc_var_ratio = res["n"], res["ci"], res["se"], res["var_ratio"]
+                    p_mc_beats, p_mc_tieonly = res["p_beats"], res["p_tieonly"]
+            else:
+                if mc_target:
+                    hits, ties_mc, mc_n = mc_adaptive(mat, k_opps, np.random.default_rng(seed),
+                                                      mc_target, mc_time, progress, counts=counts)
+                elif counts is not None:
+                    mc_n = int(mc_trials)
+                    hits, ties_mc = counts(mc_n, np.random.default_rng(seed))
+                else:
+                    mc_n = int(mc_trials)
+                    hits, ties_mc = mc_counts_parallel(mat, k_opps, mc_n, seed, workers)
+                p_mc_beats = hits / mc_n
+                p_mc_tieonly = ties_mc / mc_n
+                p_mc_ci = wilson_ci(hits, mc_n)
+                mc_se, mc_var_ratio = sqrt(p_mc_beats * (1 - p_mc_beats) / mc_n), 1.0
+            if p_mc_beats is not None:
+                p_red = p_mc_beats
+            t.units = mc_n
+
+    return {
+        "M": M, "W": W, "T": T,
+        "hero_score": hero_score,
+        "p_exact_beats": p_exact_beats,
+        "p_exact_tieonly": p_exact_tieonly,
+        "p_mc_beats": p_mc_beats,
+        "p_mc_tieonly": p_mc_tieonly,
+        "p_mc_ci": p_mc_ci,
+        "mc_n": mc_n,
+        "mc_se": mc_se,
+        "mc_var_ratio": mc_var_ratio,
+        "p_red": p_red,
+        "wins_by_class": wins_by_class,
+    }
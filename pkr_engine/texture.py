@@ -0,0 +1,87 @@
+# ===== Textura board-ului pe River (fără evaluarea celor 1081 de perechi) =====
+# Ce categorii poate avea cea mai bună mână board + 2 cărți din mână?
+# Culoarea contează doar pentru suita f cu ≥ 3 cărți pe board (cel mult una), așa că
+# o carte din mână e descrisă complet de (rang, e_în_f). Pentru fiecare pereche de
+# ranguri (91 de clase) și fiecare variantă de culoare posibilă:
+#   - fără flush: scorul vine din multiplicitățile rangurilor (RANK_TABLE)
+#   - cu flush:   scorul vine din masca de ranguri a suitei f (FLUSH_TABLE,
+#                 care acoperă și ferestrele de chintă de culoare / roială)
+# Id-urile categoriilor sunt cele din legenda aplicației (1 = roială ... 10 = carte mare).
+
+from collections import defaultdict
+
+from .cards import RANKS, SUITS, cards_to_ints
+from .evaluator import RANK_TABLE, FLUSH_TABLE, CAT_SHIFT
+
+ROYAL, STRAIGHT_FLUSH = 1, 2
+
+
+def legend_id(score: int) -> int:
+    """Scor întreg -> id-ul din legendă (chinta roială e separată de chinta de culoare)."""
+    cat = score >> CAT_SHIFT
+    if cat == 8:
+        return ROYAL if (score >> 16) & 15 == 14 else STRAIGHT_FLUSH
+    return 10 - cat
+
+
+def board_texture(board5):
+    """Pentru fiecare id din legendă, modelele de mână care îl ating ca mână finală.
+
+    Un model e (x, x_f, y, y_f): rangurile 0..12 (x ≥ y) și dacă fiecare carte e din
+    suita de flush. Întoarce (dict id -> listă de modele, suita de flush sau None)."""
+    board = cards_to_ints(board5)
+    counts = [0] * 13
+    suit_counts = [0] * 4
+    for c in board:
+        counts[c >> 2] += 1
+        suit_counts[c & 3] += 1
+    flush = next((s for s in range(4) if suit_counts[s] >= 3), None)
+    on_board = set(board)
+    rk_board = sum(1 << (3 * (c >> 2)) for c in board)
+
+    if flush is None:
+        in_f = [False] * 13
+        others = [4 - n for n in counts]
+        need_f = 6  # niciun flush posibil
+        mask_f = 0
+    else:
+        in_f = [4 * r + flush not in on_board for r in range(13)]
+        # cărți de rang r în afara suitei f, încă în pachet
+        others = [3 - sum(1 for s in range(4) if s != flush and 4 * r + s in on_board)
+                  for r in range(13)]
+        need_f = 5 - suit_counts[flush]
+        mask_f = sum(1 << (c >> 2) for c in board if c & 3 == flush)
+
+    found = defaultdict(list)
+    for x in range(12, -1, -1):
+        for y in range(x, -1, -1):
+            if x == y:
+                variants = [(False, False)] if others[x] >= 2 else []
+                if in_f[x] and others[x] >= 1:
+                    variants.append((True, False))
+            else:
+                xs = [v for v, ok in ((False, others[x] > 0), (True, in_f[x])) if ok]
+                ys = [v for v, ok in ((False, others[y] > 0), (True, in_f[y])) if ok]
+                variants = [(a, b) for a in xs for b in ys]
+            if not variants:
+                continue
+            rank_score = RANK_TABLE[rk_board + (1 << (3 * x)) + (1 << (3 * y))]
+            for xf, yf in variants:
+                if xf + yf >= need_f:
+                    score = FLUSH_TABLE[mask_f | (xf << x) | (yf << y)]
+                else:
+                    score = rank_score
+                found[legend_id(score)].append((x, xf, y, yf))
+    return dict(found), flush
+
+
+def reachable_categories(board5):
+    """Id-urile din legendă pe care le poate atinge cel puțin o mână (sortate)."""
+    return sorted(board_texture(board5)[0])
+
+
+def pattern_str(pattern, flush):
+    """(x, x_f, y, y_f) -> text, ex. „A♠ K”: suita apare doar pentru cărțile din suita f."""
+    x, xf, y, yf = pattern
+    fs = SUITS[flush] if flush is not None else ""
+    return f"{RANKS[x]}{fs if xf else ''} {RANKS[y]}{fs if yf else ''}"
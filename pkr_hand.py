@@ -0,0 +1,96 @@
+# ===== Mâna curentă refăcută din seed (cache-uri comune procesului) =====
+# În sesiune stă doar {"seed", "n", "dealer", "stage"} (+ "recorded"). Cărțile, showdown-ul,
+# legenda, perechile care te bat și outs-urile se refac determinist din seed / cărți prin
+# funcțiile memorate de aici. Stau într-un modul importat (ca pkr_html.py): Streamlit
+# re-execută pkr-tab-stat.py la fiecare rerun, dar modulele rămân în sys.modules, deci
+# cache-urile trec de la un rerun la altul, sunt comune tuturor sesiunilor și le poate
+# umple și firul de precalcul.
+
+import random
+from functools import lru_cache
+
+from pkr_engine import (
+    VAL_RANK, HAND_NAMES, deal_hand, showdown, score_tuple, board_texture, pattern_str,
+    beating_pairs, outs_table, metrics,
+)
+
+
+# ===== Text pentru scoruri =====
+def rank_ro(v: int) -> str:
+    return VAL_RANK[v]
+
+def straight_str(topv):
+    return "5–A" if topv == 5 else "–".join(rank_ro(topv - i) for i in range(5))
+
+def describe_score(score):
+    t = score[0]
+    if t == 8:
+        return f"{HAND_NAMES[t]} – {straight_str(score[1])}"
+    if t == 7:
+        return f"{HAND_NAMES[t]} – {rank_ro(score[1])} cu kicker {rank_ro(score[2])}"
+    if t == 6:
+        return f"{HAND_NAMES[t]} – {rank_ro(score[1])} peste {rank_ro(score[2])}"
+    if t == 5:
+        return f"{HAND_NAMES[t]} – " + " ".join(rank_ro(v) for v in score[1][:5])
+    if t == 4:
+        return f"{HAND_NAMES[t]} – {straight_str(score[1])}"
+    if t == 3:
+        return f"{HAND_NAMES[t]} – {rank_ro(score[1])}"
+    if t == 2:
+        p1, p2 = rank_ro(score[1][0]), rank_ro(score[1][1])
+        return f"{HAND_NAMES[t]} – {p1} și {p2}, kicker {rank_ro(score[2])}"
+    if t == 1:
+        return f"{HAND_NAMES[t]} – {rank_ro(score[1])}"
+    return f"{HAND_NAMES[0]} – " + " ".join(rank_ro(v) for v in score[1][:5])
+
+
+# ===== Showdown & legendă =====
+def winner_details_with_combos(hands, board5):
+    """(câștigători, descrieri, combo-uri, scorurile tuturor locurilor); o singură evaluare
+    pe mână, refolosită la afișare și în istoric."""
+    with metrics.timer("showdown", units=len(hands)):
+        winners, scores, winner_combos = showdown(hands, board5)
+        desc = [describe_score(score_tuple(scores[i])) for i in winners]
+    return winners, desc, winner_combos, scores
+
+def legend_possibles_on_river(board5):
+    """Id-urile din legendă atinse pe board-ul complet + modelele de mână pentru fiecare
+    (analiza de textură din pkr_engine.texture, fără evaluarea perechilor)."""
+    with metrics.timer("legend"):
+        found, flush = board_texture(board5)
+        patterns = {i: [pattern_str(p, flush) for p in pats] for i, pats in found.items()}
+    return sorted(found), patterns
+
+
+# ===== Cache-uri pe mână =====
+@lru_cache(maxsize=1024)
+def dealt(seed, num_players, dealer):
+    """(hands, flop, turn, river) ca tuple; dealer e 1-based, ca în stare."""
+    hands, flop, turn, river = deal_hand(random.Random(seed), num_players, dealer - 1)
+    return tuple(map(tuple, hands)), tuple(flop), turn, river
+
+def hand_cards(s):
+    return dealt(s["seed"], s["n"], s["dealer"])
+
+@lru_cache(maxsize=1024)
+def resolved(seed, num_players, dealer):
+    """Showdown-ul mâinii: (câștigători, descrieri, combo-uri, scoruri), ca tuple."""
+    hands, flop, turn, river = dealt(seed, num_players, dealer)
+    winners, desc, combos, scores = winner_details_with_combos(
+        [list(h) for h in hands], list(flop) + [turn, river])
+    return tuple(winners), tuple(desc), tuple(map(tuple, combos)), tuple(scores)
+
+@lru_cache(maxsize=1024)
+def river_legend(board5):
+    """legend_possibles_on_river pe un board (tuple), memorat."""
+    return legend_possibles_on_river(list(board5))
+
+@lru_cache(maxsize=256)
+def beating(hero_hole, board5, opp_range):
+    """wins_by_class pentru panoul de jos, refăcut la cerere (fără Monte Carlo)."""
+    return beating_pairs(list(hero_hole), list(board5), opp_range)
+
+@lru_cache(maxsize=256)
+def outs(hero_hole, board, opp_hole):
+    """outs_table pe flop / turn (evaluator incremental, ~1 ms), memorat pe (mână, board)."""
+    return outs_table(list(hero_hole), list(board), list(opp_hole) if opp_hole else None)
@@ -0,0 +1,164 @@
+# ===== UI helpers (HTML pentru cărți, masă și listele de perechi) =====
+# Fragmentele HTML sunt funcții pure de (carte, highlight, scară) / starea mâinii și se
+# memorează cu lru_cache. Stau într-un modul importat, nu în pkr-tab-stat.py: Streamlit
+# re-execută scriptul la fiecare rerun (funcțiile de acolo, cu cache-urile lor, se
+# recreează), pe când modulele importate rămân în sys.modules, deci cache-urile de aici
+# trec de la un rerun la altul și sunt comune tuturor sesiunilor din proces.
+
+import math
+import textwrap
+from functools import lru_cache
+
+from pkr_engine import RED_SUITS, decode_pairs
+
+CARD_SCALE_PLAYERS = 2.5
+CARD_SCALE_BOARD   = 2.0
+
+
+@lru_cache(maxsize=None)
+def card_html(card, big=False, highlight=False, border=False, scale=1.0):
+    rank, suit = card[:-1], card[-1]
+    color = "#d00" if suit in RED_SUITS else "#111"
+    bg = "#f4f71e" if highlight else "#fff"
+    # mărimi de bază
+    base_pad = (8, 10) if big else (4, 8)
+    base_font = 26 if big else 16
+    base_margin = 2
+    # aplică factorul
+    pad = f"{int(base_pad[0]*scale)}px {int(base_pad[1]*scale)}px"
+    font_size = int(base_font * scale)
+    margin = int(base_margin * scale)
+    border_css = "2px solid #2e7d32" if border else "1px solid #bbb"
+    return (
+        f"<span style='display:inline-block;margin:{margin}px;"
+        f"padding:{pad};background:{bg};color:{color};"
+        f"border:{border_css};border-radius:{int(6*scale)}px;"
+        f"font-size:{font_size}px;line-height:1.0;font-weight:700'>{rank}{suit}</span>"
+    )
+
+@lru_cache(maxsize=None)
+def hidden_html(big=False, scale=1.0):
+    base_pad = (8, 10) if big else (4, 8)
+    base_font = 26 if big else 16
+    base_margin = 2
+    pad = f"{int(base_pad[0]*scale)}px {int(base_pad[1]*scale)}px"
+    font_size = int(base_font * scale)
+    margin = int(base_margin * scale)
+    return (
+        f"<span style='display:inline-block;margin:{margin}px;"
+        f"padding:{pad};background:#fff;color:#111;"
+        f"border:1px solid #bbb;border-radius:{int(6*scale)}px;"
+        f"font-size:{font_size}px;line-height:1.0;font-weight:700'>🂠</span>"
+    )
+
+@lru_cache(maxsize=None)
+def pretty_html(card: str) -> str:
+    """Întoarce rank+simbol cu roșu pentru ♥ și ♦, pentru afișare în markdown HTML."""
+    rank = card[:-1]
+    suit = card[-1]
+
+    # culoare: roșu pentru inimă / romb, altfel culoarea textului principal
+    if suit in ("♥", "♦"):
+        color = "#ff4b5c"  # roșu frumos, poți schimba dacă vrei
+    else:
+        color = "#e0e0e0"  # deschis, potrivit cu tema ta dark
+
+    return f"<span style='color:{color}; font-weight:700'>{rank}{suit}</span>"
+
+@lru_cache(maxsize=None)
+def seat_geometry(num_players, seat):
+    """(x, y) în % pentru locul `seat` (0-based) + poziția chip-ului de dealer spre centru."""
+    # 0° sus, sens orar; offset -90° ca jos să fie ~270°
+    angle = (360 * seat / num_players)
+    radius = 46
+    x = 50 + radius * math.cos(math.radians(angle - 90))
+    y = 50 + radius * math.sin(math.radians(angle - 90))
+    alpha = 0.70  # 0.78..0.90 — mai mare = mai aproape de scaun; mai mic = mai aproape de centru
+    chip_x = 50 * (1 - alpha) + alpha * x
+    chip_y = 50 * (1 - alpha) + alpha * y
+    return x, y, chip_x, chip_y
+
+
+@lru_cache(maxsize=64)
+def table_html(hands, flop, turn, river, stage, dealer, hero, winners, winner_combos):
+    """HTML-ul complet al mesei (board + locuri + chip dealer); argumentele sunt tuple,
+    ca aceeași stare a mâinii să vină din cache la un rerun."""
+    show = stage == "show"
+    winners_set = set(winners)
+
+    # === Board (cu highlight pe cărțile din combo câștigătoare) ===
+    all_board = flop + (turn, river)
+    board_highlight_set = {c for combo in winner_combos for c in combo if c in all_board} if show else set()
+
+    parts = [card_html(c, big=True, highlight=c in board_highlight_set,
+                       border=c in board_highlight_set, scale=CARD_SCALE_BOARD) for c in flop]
+    parts.append(
+        card_html(turn, big=True, highlight=turn in board_highlight_set,
+                  border=turn in board_highlight_set, scale=CARD_SCALE_BOARD)
+        if stage in ("turn", "river", "show") else hidden_html(big=True, scale=CARD_SCALE_BOARD)
+    )
+    parts.append(
+        card_html(river, big=True, highlight=river in board_highlight_set,
+                  border=river in board_highlight_set, scale=CARD_SCALE_BOARD)
+        if stage in ("river", "show") else hidden_html(big=True, scale=CARD_SCALE_BOARD)
+    )
+
+    # === Jucători în jurul mesei ===
+    player_seats = []
+    dealer_chips = []  # chip-urile dealer-ului (plasate pe masă, nu în badge)
+    for i in range(len(hands)):
+        x, y, chip_x, chip_y = seat_geometry(len(hands), i)
+        is_hero = (i + 1) == hero
+        is_winner = show and (i in winners_set)
+
+        # set pt highlight cărți câștigătoare
+        combo_set = set(winner_combos[winners.index(i)]) if is_winner and winner_combos else set()
+
+        label = "TU" if is_hero else f"Jucător {i+1}"
+        if (i + 1) == dealer:
+            label += " (D)"
+        if is_winner:
+            label += " 🏆"
+        cls = "player-badge hero" if is_hero else "player-badge"
+
+        # cărți vizibile: TU mereu; ceilalți la showdown
+        if is_hero or show:
+            cards_html = " ".join(
+                card_html(c, highlight=(is_winner and (c in combo_set)), scale=CARD_SCALE_PLAYERS)
+                for c in hands[i]
+            )
+        else:
+            cards_html = " ".join(hidden_html(scale=CARD_SCALE_PLAYERS) for _ in range(2))
+
+        # seat container
+        player_seats.append(
+            f"<div class='player-seat' style='left:{x}%;top:{y}%'>"
+            f"<div class='{cls}'>{label}</div>"
+            f"<div class='player-cards'>{cards_html}</div>"
+            f"</div>"
+        )
+        # === Dealer chip: spre interiorul mesei (interpolare către centru) ===
+        if (i + 1) == dealer:
+            dealer_chips.append(
+                f"<div class='dealer-chip' style='left:{chip_x}%;top:{chip_y}%'>D</div>"
+            )
+
+    return textwrap.dedent(f"""
+    <div class="table-wrap">
+      <div class="poker-table">
+        <div class="table-logo">Texas Hold'em</div>
+        <div class="board-cards">{' '.join(parts)}</div>
+        {''.join(player_seats)}
+        {''.join(dealer_chips)}
+      </div>
+    </div>
+    """).strip()
+
+
+WINS_PER_PAGE = 60
+
+@lru_cache(maxsize=256)
+def wins_page_html(codes, page, per_page=WINS_PER_PAGE):
+    """O pagină din perechile unei clase (codes = tuple de coduri a * 52 + b), ♥ / ♦ în roșu."""
+    pairs = decode_pairs(codes, page * per_page, (page + 1) * per_page)
+    return ", ".join(f"{pretty_html(a)} {pretty_html(b)}" for a, b in pairs)